@@ -0,0 +1,123 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import chess
+
+from engine.evaluation import vectorized
+from engine.evaluation.context import EvalContext
+from engine.evaluation_engine import (
+    EVAL_TERMS,
+    blend_terms,
+    eval_terms,
+    evaluate_board,
+    terminal_score,
+)
+
+
+def read_epd(path):
+    """Đọc file EPD/FEN từng dòng, trả về FEN (bỏ dòng trống và dòng bắt đầu bằng #)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                board = chess.Board(line)
+            except ValueError:
+                board, _ = chess.Board.from_epd(line)  # EPD: 4 trường + opcode
+            yield board.fen()
+
+
+def evaluate_one(fen, terms=False):
+    """
+    Điểm evaluate_board của 1 FEN.
+    terms=True → {"score", "phase", "terms": {tên: (mg, eg)}}.
+    """
+    board = chess.Board(fen)
+    if not terms:
+        return evaluate_board(board)
+    # Điểm blend từ chính các thành phần vừa tính, không gọi evaluate_board lần nữa
+    phase, values = eval_terms(board)
+    score = terminal_score(board)
+    if score is None:
+        score = blend_terms(phase, values)
+    return {"score": score, "phase": phase, "terms": values}
+
+
+def _evaluate_chunk(fens, terms):
+    """
+    Đánh giá 1 chunk. Có numpy thì material, psqt, imbalance và phase tính
+    chung cả chunk (engine.evaluation.vectorized), các thành phần còn lại
+    tính từng thế cờ; kết quả giống hệt evaluate_one.
+    """
+    if vectorized.np is None:
+        return [evaluate_one(fen, terms) for fen in fens]
+
+    boards = [chess.Board(fen) for fen in fens]
+    phases, vector_terms = vectorized.evaluate_terms(boards)
+    results = []
+    for index, board in enumerate(boards):
+        phase = int(phases[index])
+        ctx = EvalContext(board)
+        values = {}
+        for name, term in EVAL_TERMS:
+            if name in vector_terms:
+                mg, eg = vector_terms[name]
+                values[name] = (int(mg[index]), int(eg[index]))
+            else:
+                values[name] = term(board, None, ctx)
+        score = terminal_score(board)
+        if score is None:
+            score = blend_terms(phase, values)
+        if terms:
+            results.append({"score": score, "phase": phase, "terms": values})
+        else:
+            results.append(score)
+    return results
+
+
+def _chunks(positions, chunk_size):
+    fens = (p.fen() if isinstance(p, chess.Board) else p for p in positions)
+    while True:
+        chunk = list(islice(fens, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_batch(positions, workers=None, chunk_size=256, terms=False):
+    """
+    Đánh giá hàng loạt, trả về generator điểm theo đúng thứ tự đầu vào.
+    - positions: iterable FEN hoặc chess.Board (đọc dần, không giữ hết trong bộ nhớ)
+    - workers: số tiến trình (mặc định = số CPU), 1 → chạy ngay trong tiến trình này
+    - chunk_size: số thế cờ mỗi lần gửi cho tiến trình phụ; tối đa 2 chunk
+      đang chờ cho mỗi tiến trình
+    - terms: True → mỗi phần tử là dict như evaluate_one(fen, terms=True)
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunks = _chunks(positions, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _evaluate_chunk(chunk, terms)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk, chunk, terms))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+if __name__ == "__main__":
+    # python -m engine.batch positions.epd [workers] → "fen ; điểm" mỗi dòng
+    path = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    fens = list(read_epd(path))
+    for fen, score in zip(fens, evaluate_batch(fens, workers)):
+        print(f"{fen} ; {score}")
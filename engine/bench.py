@@ -0,0 +1,230 @@
+import sys
+import time
+
+import chess
+
+from engine.eval_cache import EvalCache
+from engine.evaluation import threat
+from engine.evaluation.context import EvalContext
+from engine.evaluation.pawn_hash import PAWN_TABLE
+from engine.evaluation_engine import evaluate_board, eval_terms, set_profiler
+from engine.minimax import search
+from engine.profiling import SearchProfile
+from engine.see import attackers, least_valuable_attacker, see
+from engine.transposition import TranspositionTable
+
+# Bộ thế cờ cố định cho bench: khai cuộc, trung cuộc chiến thuật, tàn cuộc.
+# Không sửa/đổi thứ tự danh sách này, nếu không chữ ký số nút sẽ đổi theo.
+BENCH_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 11",
+    "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19",
+    "rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14",
+    "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14",
+    "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15",
+    "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13",
+    "r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16",
+    "4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17",
+    "2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11",
+    "r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16",
+    "3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22",
+    "r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18",
+    "4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22",
+    "3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26",
+    "6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/3N4 b - - 0 1",
+    "3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1",
+    "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1",
+    "8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1",
+    "7k/3p2pp/4q3/8/4Q3/5Kp1/P6b/8 w - - 0 1",
+    "8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1",
+    "8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1",
+    "8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1",
+    "8/3p4/p1bk3p/Pp6/1Kp1PpPp/2P2P1P/2P5/5B2 b - - 0 1",
+    "5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1",
+    "6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1",
+    "1r3k2/4q3/2Pp3b/3Bp3/2Q2p2/1p1P2P1/1P2KP2/3N4 w - - 0 1",
+    "6k1/4pp1p/3p2p1/P1pPb3/R7/1r2P1PP/3B1P2/6K1 w - - 0 1",
+    "8/3p3B/5p2/5P2/p7/PP5b/k7/6K1 w - - 0 1",
+    "5rk1/q6p/2p3bR/1pPp1rP1/1P1Pp3/P3B1Q1/1K3P2/R7 w - - 93 90",
+    "4rrk1/1p1nq3/p7/2p1P1pp/3P2bp/3Q1Bn1/PPPB4/1K2R1NR w - - 40 21",
+    "r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16",
+    "3Qb1k1/1r2ppb1/pN1n2q1/Pp1Pp1Pr/4P2p/4BP2/4B1R1/1R5K b - - 11 40",
+    "4k3/3q1r2/1N2r1b1/3ppN2/2nPP3/1B1R2n1/2R1Q3/3K4 w - - 5 1",
+    "8/8/8/8/5kp1/P7/8/1K1N4 w - - 0 1",
+    "8/8/8/5N2/8/p7/8/2NK3k w - - 0 1",
+    "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1",
+    "8/8/1P6/5pr1/8/4R3/7k/2K5 w - - 0 1",
+    "8/2p4P/8/kr6/6R1/8/8/1K6 w - - 0 1",
+    "8/8/3P3k/8/1p6/8/1P6/1K3n2 b - - 0 1",
+    "8/R7/2q5/8/6k1/8/1P5p/K6R w - - 0 124",
+    "6k1/3b3r/1p1p4/p1n2p2/1PPNpP1q/P3Q1p1/1R1RB1P1/5K2 b - - 0 1",
+    "r2r1n2/pp2bk2/2p1p2p/3q4/3PN1QP/2P3R1/P4PP1/5RK1 w - - 0 1",
+    "8/8/8/8/5k2/8/6p1/4K3 w - - 0 1",
+    "1r3k2/8/5K2/4R3/8/8/8/8 w - - 0 1",
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+    "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5",
+    "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "rnbqkb1r/ppp1pppp/5n2/3p4/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 1 3",
+]
+
+BENCH_DEPTH = 3
+
+
+def bench(
+    depth=BENCH_DEPTH, fens=BENCH_FENS, tt_size_mb=16, out=None, use_ordering=True
+):
+    """
+    Tìm mỗi thế cờ tới độ sâu cố định, không giới hạn thời gian.
+    Mỗi thế cờ bắt đầu với TT, EvalCache và bảng băm tốt trống nên tổng số nút
+    là chữ ký tất định: đổi thuật toán tìm kiếm/đánh giá thì nó đổi theo.
+    out: file để in từng dòng kết quả (None = không in).
+    use_ordering: False → không sắp xếp nước đi (so số nút có/không ordering).
+    Trả về {"positions", "depth", "nodes", "time", "nps"}.
+    """
+    tt = TranspositionTable(size_mb=tt_size_mb)
+    eval_cache = EvalCache(size_mb=tt_size_mb)
+    nodes = 0
+    start = time.perf_counter()
+    for index, fen in enumerate(fens, 1):
+        tt.clear()
+        eval_cache.clear()
+        PAWN_TABLE.clear()
+        result = search(
+            chess.Board(fen),
+            depth=depth,
+            tt=tt,
+            eval_cache=eval_cache,
+            use_ordering=use_ordering,
+        )
+        nodes += result.nodes
+        if out is not None:
+            move = result.best_move.uci() if result.best_move else "0000"
+            print(
+                f"{index:>3}/{len(fens)}  nodes {result.nodes:>8}  "
+                f"score {result.score:>6}  bestmove {move}",
+                file=out,
+            )
+    elapsed = time.perf_counter() - start
+    return {
+        "positions": len(fens),
+        "depth": depth,
+        "nodes": nodes,
+        "time": elapsed,
+        "nps": nodes / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def eval_bench(fens=BENCH_FENS, repeat=20):
+    """
+    Micro-benchmark đánh giá tĩnh: mỗi thế cờ được đánh giá `repeat` lần.
+    - evaluate_us: thời gian trung bình của 1 lần evaluate_board (µs)
+    - terms: thời gian trung bình của từng thành phần trong eval_terms (µs),
+      đo bằng SearchProfile.time_term ở một lượt riêng
+    Bảng băm tốt được xoá trước mỗi lượt nên "pawns" gồm cả lần tính đầu tiên.
+    """
+    boards = [chess.Board(fen) for fen in fens]
+    calls = len(boards) * repeat
+
+    PAWN_TABLE.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for board in boards:
+            evaluate_board(board)
+    evaluate_us = (time.perf_counter() - start) / calls * 1e6
+
+    PAWN_TABLE.clear()
+    profile = SearchProfile()
+    set_profiler(profile)
+    try:
+        for _ in range(repeat):
+            for board in boards:
+                eval_terms(board)
+    finally:
+        set_profiler(None)
+    terms = {
+        name: seconds / count * 1e6
+        for name, (count, seconds) in profile.eval_terms.items()
+    }
+    return {"positions": len(boards), "evaluate_us": evaluate_us, "terms": terms}
+
+
+def see_bench(fens=BENCH_FENS, repeat=20):
+    """
+    So SEE với cách đếm số lần tấn công / bảo vệ của threat.hanging trên mọi quân
+    đối phương đang bị bên đi tấn công (ăn bằng quân rẻ nhất):
+    - see_us / count_us: thời gian trung bình mỗi ô (µs); count_us là thời gian
+      dựng mặt nạ hanging của cả thế cờ (EvalContext có sẵn) chia cho số ô
+    - disagree: số ô mà "treo" theo threat.hanging khác với SEE > 0
+    """
+    targets = []
+    contexts = []
+    for fen in fens:
+        board = chess.Board(fen)
+        color = board.turn
+        ctx = EvalContext(board)
+        contexts.append((ctx, color))
+        hanging = threat.hanging(ctx, color)
+        for square in chess.scan_forward(board.occupied_co[not color] & ~board.kings):
+            mask = attackers(board, square, board.occupied) & board.occupied_co[color]
+            if mask:
+                _, from_square = least_valuable_attacker(board, mask)
+                move = chess.Move(from_square, square)
+                targets.append((board, move, bool(hanging & chess.BB_SQUARES[square])))
+
+    def run_see():
+        return [see(board, move) > 0 for board, move, _ in targets]
+
+    def run_count():
+        return [threat.hanging(ctx, color) for ctx, color in contexts]
+
+    timings = {}
+    for name, func in (("see_us", run_see), ("count_us", run_count)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        timings[name] = (time.perf_counter() - start) / (repeat * len(targets)) * 1e6
+    counted = [is_hanging for _, _, is_hanging in targets]
+    disagree = sum(a != b for a, b in zip(run_see(), counted))
+    return {"targets": len(targets), "disagree": disagree, **timings}
+
+
+def main(argv=None):
+    # python -m engine.bench [depth] | eval [repeat] | see | ordering [depth]
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "ordering":
+        depth = int(argv[1]) if len(argv) > 1 else BENCH_DEPTH
+        ordered = bench(depth)
+        unordered = bench(depth, use_ordering=False)
+        print(f"ordering       nodes {ordered['nodes']:>9}  {ordered['time']:>7.1f} s")
+        print(
+            f"no ordering    nodes {unordered['nodes']:>9}  {unordered['time']:>7.1f} s"
+        )
+        print(f"node ratio     {unordered['nodes'] / ordered['nodes']:.2f}x")
+        return
+    if argv and argv[0] == "see":
+        stats = see_bench()
+        print(f"targets        {stats['targets']}")
+        print(f"see            {stats['see_us']:>9.1f} us")
+        print(f"hanging mask   {stats['count_us']:>9.1f} us")
+        print(f"disagree       {stats['disagree']}")
+        return
+    if argv and argv[0] == "eval":
+        repeat = int(argv[1]) if len(argv) > 1 else 20
+        stats = eval_bench(repeat=repeat)
+        print(f"positions      {stats['positions']}")
+        for name, us in stats["terms"].items():
+            print(f"{name:<14} {us:>9.1f} us")
+        print(f"{'evaluate':<14} {stats['evaluate_us']:>9.1f} us")
+        return
+
+    depth = int(argv[0]) if argv else BENCH_DEPTH
+    stats = bench(depth, out=sys.stdout)
+    print("=" * 40)
+    print(f"Total time (ms) : {stats['time'] * 1000:.0f}")
+    print(f"Nodes searched  : {stats['nodes']}")
+    print(f"Nodes/second    : {stats['nps']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import mmap
+import random
+import struct
+
+import chess
+import chess.polyglot
+
+# Mỗi entry Polyglot: khoá 64 bit, nước đi 16 bit, trọng số 16 bit, learn 32 bit
+# (big-endian), file đã sắp xếp tăng dần theo khoá.
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+
+# Mặc định chỉ dùng sách trong 20 ply đầu của ván
+BOOK_MAX_PLY = 20
+
+
+def decode_move(board, raw):
+    """Nước đi 16 bit của Polyglot → chess.Move (nhập thành ghi là vua ăn xe)."""
+    to_square = raw & 0x3F
+    from_square = (raw >> 6) & 0x3F
+    promotion = (raw >> 12) & 0x7
+    move = chess.Move(
+        from_square, to_square, promotion + 1 if promotion else None
+    )
+    if board.kings & chess.BB_SQUARES[from_square]:
+        # e1h1 → e1g1, e1a1 → e1c1 (và tương tự cho đen)
+        castling = {
+            (chess.E1, chess.H1): chess.G1,
+            (chess.E1, chess.A1): chess.C1,
+            (chess.E8, chess.H8): chess.G8,
+            (chess.E8, chess.A8): chess.C8,
+        }.get((from_square, to_square))
+        if castling is not None and board.rooks & chess.BB_SQUARES[to_square]:
+            move = chess.Move(from_square, castling)
+    return move
+
+
+class PolyglotBook:
+    """
+    Sách khai cuộc Polyglot (.bin) đọc qua mmap, không nạp cả file vào bộ nhớ.
+    Tìm các entry của thế cờ bằng tìm kiếm nhị phân theo khoá Zobrist.
+    - max_ply: quá số ply này của ván thì không tra sách nữa
+    - rng: random.Random để chọn nước theo trọng số (mặc định module random)
+    """
+
+    def __init__(self, path, max_ply=BOOK_MAX_PLY, rng=None):
+        self.path = path
+        self.max_ply = max_ply
+        self.rng = rng or random
+        self.file = open(path, "rb")
+        size = self.file.seek(0, 2)
+        self.count = size // ENTRY.size
+        # mmap không nhận file rỗng
+        self.data = (
+            mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.count
+            else b""
+        )
+
+    def _key_at(self, index):
+        return KEY.unpack_from(self.data, index * ENTRY.size)[0]
+
+    def _lower_bound(self, key):
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def entries(self, board):
+        """Danh sách (move, weight) hợp lệ của thế cờ trong sách."""
+        key = chess.polyglot.zobrist_hash(board)
+        result = []
+        index = self._lower_bound(key)
+        while index < self.count:
+            entry_key, raw, weight, _ = ENTRY.unpack_from(self.data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            move = decode_move(board, raw)
+            if board.is_legal(move):
+                result.append((move, weight))
+            index += 1
+        return result
+
+    def choose(self, board):
+        """Nước đi chọn ngẫu nhiên theo trọng số, None nếu ngoài sách."""
+        if board.ply() >= self.max_ply:
+            return None
+        entries = [(move, weight) for move, weight in self.entries(board) if weight]
+        if not entries:
+            return None
+        moves, weights = zip(*entries)
+        return self.rng.choices(moves, weights)[0]
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
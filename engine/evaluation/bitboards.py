@@ -0,0 +1,82 @@
+import chess
+
+# Bảng bitboard hình học dựng 1 lần khi import, đánh chỉ số theo ô
+# (và theo màu với các bảng có hướng: TABLE[color][square]) để các hàm đánh giá
+# chỉ cần AND / popcount thay vì duyệt từng ô.
+
+
+def _ranks_above(rank):
+    return chess.BB_ALL & ~((1 << (8 * (rank + 1))) - 1)
+
+
+def _ranks_below(rank):
+    return (1 << (8 * rank)) - 1
+
+
+def _adjacent_files(file):
+    mask = 0
+    if file > 0:
+        mask |= chess.BB_FILES[file - 1]
+    if file < 7:
+        mask |= chess.BB_FILES[file + 1]
+    return mask
+
+
+# Các cột kề bên (không gồm cột của ô)
+ADJACENT_FILES = [_adjacent_files(chess.square_file(sq)) for sq in chess.SQUARES]
+
+# Các hàng phía trước ô theo hướng tiến của bên `color` (không gồm hàng của ô)
+FORWARD_RANKS = [
+    [_ranks_below(chess.square_rank(sq)) for sq in chess.SQUARES],
+    [_ranks_above(chess.square_rank(sq)) for sq in chess.SQUARES],
+]
+
+# Các ô phía trước trên cùng cột
+FORWARD_FILE = [
+    [
+        FORWARD_RANKS[color][sq] & chess.BB_FILES[chess.square_file(sq)]
+        for sq in chess.SQUARES
+    ]
+    for color in (chess.BLACK, chess.WHITE)
+]
+
+# Các ô tốt ở `square` có thể tấn công khi tiến lên
+PAWN_ATTACK_SPAN = [
+    [FORWARD_RANKS[color][sq] & ADJACENT_FILES[sq] for sq in chess.SQUARES]
+    for color in (chess.BLACK, chess.WHITE)
+]
+
+# Tốt ở `square` là tốt thông nếu không có tốt địch trong vùng này
+PASSED_PAWN_SPAN = [
+    [FORWARD_FILE[color][sq] | PAWN_ATTACK_SPAN[color][sq] for sq in chess.SQUARES]
+    for color in (chess.BLACK, chess.WHITE)
+]
+
+# Ô vua + 8 ô xung quanh
+KING_RING = [chess.BB_KING_ATTACKS[sq] | chess.BB_SQUARES[sq] for sq in chess.SQUARES]
+
+# Cánh vua: cột của ô và 2 cột kề bên
+KING_FLANK = [
+    ADJACENT_FILES[sq] | chess.BB_FILES[chess.square_file(sq)] for sq in chess.SQUARES
+]
+
+# Hàng outpost: trắng hàng 4-6, đen hàng 3-5
+OUTPOST_RANKS = [
+    chess.BB_RANK_3 | chess.BB_RANK_4 | chess.BB_RANK_5,
+    chess.BB_RANK_4 | chess.BB_RANK_5 | chess.BB_RANK_6,
+]
+
+# Nửa bàn (cột a-d hoặc e-h) chứa ô
+QUEENSIDE = chess.BB_FILE_A | chess.BB_FILE_B | chess.BB_FILE_C | chess.BB_FILE_D
+BOARD_HALF = [
+    QUEENSIDE if chess.square_file(sq) < 4 else chess.BB_ALL & ~QUEENSIDE
+    for sq in chess.SQUARES
+]
+
+# Các ô cùng màu với ô
+SQUARE_COLOR = [
+    chess.BB_LIGHT_SQUARES
+    if chess.BB_SQUARES[sq] & chess.BB_LIGHT_SQUARES
+    else chess.BB_DARK_SQUARES
+    for sq in chess.SQUARES
+]
@@ -0,0 +1,77 @@
+import chess
+
+
+class EvalContext:
+    """
+    Dữ liệu dùng chung của một thế cờ, tính 1 lần cho mọi thành phần đánh giá
+    (mọi mảng đều đánh chỉ số theo màu: ctx.x[chess.WHITE], ctx.x[chess.BLACK]):
+    - piece_map: {ô: quân}
+    - pawns: bitboard tốt của mỗi bên
+    - attacks: {ô: bitboard ô bị quân ở ô đó tấn công}
+    - attacks_by[color][piece_type], attacks_all[color]: hợp các ô bị tấn công
+    - attacks_2[color]: các ô bị ít nhất 2 quân của bên đó tấn công
+    - king_sq, king_ring (ô vua + 8 ô xung quanh)
+    - king_checkers: bitboard quân địch chiếu vua, king_attackers: số quân đó
+    - pinned[color]: bitboard quân bị ghim, pin_rays {ô: đường ghim}
+    - checkers: bitboard quân đang chiếu bên đang đi
+    - pawn: PawnEntry từ bảng băm tốt (None nếu chưa tra)
+    """
+
+    def __init__(self, board, pawn=None):
+        self.board = board
+        self.pawn = pawn
+        self.in_check = board.is_check()
+        self.checkers = board.checkers_mask()
+        self.occupied = board.occupied
+        self.occupied_co = board.occupied_co
+        self.piece_map = board.piece_map()
+        self.pawns = [
+            board.pawns & board.occupied_co[chess.BLACK],
+            board.pawns & board.occupied_co[chess.WHITE],
+        ]
+
+        self.attacks = {}
+        self.attacks_by = [[0] * 7, [0] * 7]
+        self.attacks_all = [0, 0]
+        self.attacks_2 = [0, 0]
+        for square, piece in self.piece_map.items():
+            mask = board.attacks_mask(square)
+            self.attacks[square] = mask
+            self.attacks_by[piece.color][piece.piece_type] |= mask
+            self.attacks_2[piece.color] |= self.attacks_all[piece.color] & mask
+            self.attacks_all[piece.color] |= mask
+
+        self.king_sq = [board.king(chess.BLACK), board.king(chess.WHITE)]
+        self.king_ring = [0, 0]
+        self.king_checkers = [0, 0]
+        self.king_attackers = [0, 0]
+        self.pinned = [0, 0]
+        self.pin_rays = {}
+        for color in (chess.WHITE, chess.BLACK):
+            king = self.king_sq[color]
+            if king is None:
+                continue
+            self.king_ring[color] = chess.BB_KING_ATTACKS[king] | chess.BB_SQUARES[king]
+            self.king_checkers[color] = board.attackers_mask(not color, king)
+            self.king_attackers[color] = chess.popcount(self.king_checkers[color])
+            self._find_pins(color, king)
+
+    def _find_pins(self, color, king):
+        """Quân bên `color` đứng một mình giữa vua và quân trượt của địch."""
+        board = self.board
+        rooks_queens = board.rooks | board.queens
+        bishops_queens = board.bishops | board.queens
+        snipers = (
+            (chess.BB_RANK_ATTACKS[king][0] & rooks_queens)
+            | (chess.BB_FILE_ATTACKS[king][0] & rooks_queens)
+            | (chess.BB_DIAG_ATTACKS[king][0] & bishops_queens)
+        ) & self.occupied_co[not color]
+        for sniper in chess.scan_reversed(snipers):
+            blockers = chess.between(king, sniper) & self.occupied
+            if blockers and chess.popcount(blockers) == 1:
+                if blockers & self.occupied_co[color]:
+                    self.pinned[color] |= blockers
+                    self.pin_rays[chess.lsb(blockers)] = chess.ray(king, sniper)
+
+    def attacked_by(self, color, square) -> bool:
+        return bool(self.attacks_all[color] & chess.BB_SQUARES[square])
@@ -12,8 +12,6 @@ def eval_imbalance(board):
     """
     Đánh giá sự mất cân bằng giữa các loại quân trên bàn cờ.
     """
-    score = 0
-
     white = {
         chess.PAWN: len(board.pieces(chess.PAWN, chess.WHITE)),
         chess.KNIGHT: len(board.pieces(chess.KNIGHT, chess.WHITE)),
@@ -30,6 +28,16 @@ def eval_imbalance(board):
         chess.QUEEN: len(board.pieces(chess.QUEEN, chess.BLACK)),
     }
 
+    return imbalance_from_counts(white, black)
+
+
+def imbalance_from_counts(white, black):
+    """
+    Như eval_imbalance nhưng nhận sẵn số lượng quân mỗi loại của hai bên
+    (dict hoặc list đánh chỉ số theo piece_type).
+    """
+    score = 0
+
     ### 1. Bishop pair bonus
     if white[chess.BISHOP] >= 2:
         score += IMBALANCE_BISHOP_PAIR
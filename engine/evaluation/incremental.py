@@ -0,0 +1,206 @@
+import chess
+import chess.polyglot
+
+from engine.evaluation.imbalance import imbalance_from_counts
+from engine.evaluation.material import PIECE_VALUES_EG, PIECE_VALUES_MG
+from engine.evaluation.pawn_hash import PAWN_ZOBRIST
+from engine.evaluation.psqt import PSQT, psqt_index
+from engine.evaluation_engine import NON_PAWN_VALUES, phase_from_npm
+
+
+def _build_square_values():
+    """
+    Bảng giá trị (có dấu) của 1 quân trên 1 ô: [color][piece_type][square].
+    Gồm 4 phần: material mg, material eg, psqt mg, psqt eg.
+    Dương cho trắng, âm cho đen, giống eval_material / eval_psqt.
+    """
+    table = [[None] * 7 for _ in range(2)]
+    for color in (chess.WHITE, chess.BLACK):
+        sign = 1 if color == chess.WHITE else -1
+        for piece_type in chess.PIECE_TYPES:
+            values = []
+            for square in chess.SQUARES:
+                index = psqt_index(color, piece_type, square)
+                values.append(
+                    (
+                        sign * PIECE_VALUES_MG[piece_type],
+                        sign * PIECE_VALUES_EG[piece_type],
+                        PSQT[index],
+                        PSQT[index + 1],
+                    )
+                )
+            table[color][piece_type] = values
+    return table
+
+
+SQUARE_VALUES = _build_square_values()
+
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_CASTLING_CORNERS = (chess.BB_H1, chess.BB_A1, chess.BB_H8, chess.BB_A8)
+
+# Khoá Zobrist Polyglot của 1 quân trên 1 ô: [color][piece_type][square]
+PIECE_ZOBRIST = [
+    [None]
+    + [
+        [
+            _RANDOM[64 * (2 * (piece_type - 1) + int(color)) + square]
+            for square in chess.SQUARES
+        ]
+        for piece_type in chess.PIECE_TYPES
+    ]
+    for color in (chess.BLACK, chess.WHITE)
+]
+
+
+class IncrementalEval:
+    """
+    Các thành phần đánh giá cộng dồn được, cập nhật O(1) theo từng nước đi
+    thay vì quét 64 ô ở mỗi nút lá:
+    - material mg/eg, psqt mg/eg (dương cho trắng)
+    - số quân mỗi loại của từng bên (cho eval_imbalance)
+    - non-pawn material (cho find_phase)
+    - pawn_key: khoá Zobrist chỉ gồm tốt (cho bảng băm tốt)
+    - board_key: phần quân/ô của khoá Zobrist, key(board) ra khoá đầy đủ
+    Dùng push(board, move) / pop(board) thay cho board.push / board.pop.
+    """
+
+    def __init__(self, board=None):
+        self.reset(board if board is not None else chess.Board())
+
+    def reset(self, board):
+        self.material_mg = 0
+        self.material_eg = 0
+        self.psqt_mg = 0
+        self.psqt_eg = 0
+        self.npm = 0
+        self.pawn_key = 0
+        self.board_key = 0
+        self.counts = [[0] * 7 for _ in range(2)]
+        self.stack = []
+        for square, piece in board.piece_map().items():
+            self._add(piece.color, piece.piece_type, square)
+
+    def _add(self, color, piece_type, square):
+        mat_mg, mat_eg, pst_mg, pst_eg = SQUARE_VALUES[color][piece_type][square]
+        self.material_mg += mat_mg
+        self.material_eg += mat_eg
+        self.psqt_mg += pst_mg
+        self.psqt_eg += pst_eg
+        self.counts[color][piece_type] += 1
+        self.npm += NON_PAWN_VALUES.get(piece_type, 0)
+        self.board_key ^= PIECE_ZOBRIST[color][piece_type][square]
+        if piece_type == chess.PAWN:
+            self.pawn_key ^= PAWN_ZOBRIST[color][square]
+
+    def _remove(self, color, piece_type, square):
+        mat_mg, mat_eg, pst_mg, pst_eg = SQUARE_VALUES[color][piece_type][square]
+        self.material_mg -= mat_mg
+        self.material_eg -= mat_eg
+        self.psqt_mg -= pst_mg
+        self.psqt_eg -= pst_eg
+        self.counts[color][piece_type] -= 1
+        self.npm -= NON_PAWN_VALUES.get(piece_type, 0)
+        self.board_key ^= PIECE_ZOBRIST[color][piece_type][square]
+        if piece_type == chess.PAWN:
+            self.pawn_key ^= PAWN_ZOBRIST[color][square]
+
+    def push(self, board, move):
+        """Cập nhật theo nước đi rồi mới board.push(move)."""
+        self.stack.append(
+            (
+                self.material_mg,
+                self.material_eg,
+                self.psqt_mg,
+                self.psqt_eg,
+                self.npm,
+                self.pawn_key,
+                self.board_key,
+                [row[:] for row in self.counts],
+            )
+        )
+        if move:
+            us = board.turn
+            piece_type = board.piece_type_at(move.from_square)
+
+            # Quân bị ăn (kể cả bắt tốt qua đường)
+            if board.is_en_passant(move):
+                captured_square = move.to_square + (-8 if us == chess.WHITE else 8)
+                self._remove(not us, chess.PAWN, captured_square)
+            elif board.is_castling(move):
+                # Xe nhảy qua vua: h→f (cánh vua) hoặc a→d (cánh hậu)
+                rank = chess.square_rank(move.from_square)
+                if board.is_kingside_castling(move):
+                    rook_from, rook_to = chess.square(7, rank), chess.square(5, rank)
+                    king_to = chess.square(6, rank)
+                else:
+                    rook_from, rook_to = chess.square(0, rank), chess.square(3, rank)
+                    king_to = chess.square(2, rank)
+                self._remove(us, chess.ROOK, rook_from)
+                self._add(us, chess.ROOK, rook_to)
+                self._remove(us, chess.KING, move.from_square)
+                self._add(us, chess.KING, king_to)
+                board.push(move)
+                return
+            else:
+                captured = board.piece_type_at(move.to_square)
+                if captured:
+                    self._remove(not us, captured, move.to_square)
+
+            self._remove(us, piece_type, move.from_square)
+            self._add(us, move.promotion or piece_type, move.to_square)
+        board.push(move)
+
+    def pop(self, board):
+        board.pop()
+        (
+            self.material_mg,
+            self.material_eg,
+            self.psqt_mg,
+            self.psqt_eg,
+            self.npm,
+            self.pawn_key,
+            self.board_key,
+            self.counts,
+        ) = self.stack.pop()
+
+    def key(self, board):
+        """
+        Khoá Zobrist đầy đủ, bằng chess.polyglot.zobrist_hash(board) nhưng
+        không quét bàn cờ: chỉ cộng thêm quyền nhập thành, en passant và lượt đi.
+        """
+        key = self.board_key
+        castling = board.clean_castling_rights()
+        if castling:
+            for i, corner in enumerate(_CASTLING_CORNERS):
+                if castling & corner:
+                    key ^= _RANDOM[768 + i]
+        if board.ep_square is not None:
+            # Chỉ tính khi có tốt sẵn sàng bắt qua đường (như Polyglot)
+            ep_mask = chess.BB_SQUARES[board.ep_square]
+            if board.turn == chess.WHITE:
+                ep_mask = chess.shift_down(ep_mask)
+            else:
+                ep_mask = chess.shift_up(ep_mask)
+            ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+            if ep_mask & board.pawns & board.occupied_co[board.turn]:
+                key ^= _RANDOM[772 + chess.square_file(board.ep_square)]
+        if board.turn == chess.WHITE:
+            key ^= _RANDOM[780]
+        return key
+
+    # === Các thành phần đánh giá, cùng kết quả với bản quét bàn cờ ===
+
+    def material(self, phase):
+        return self.material_mg if phase == "mg" else self.material_eg
+
+    def psqt(self, phase):
+        return self.psqt_mg if phase == "mg" else self.psqt_eg
+
+    def imbalance(self):
+        return imbalance_from_counts(
+            self.counts[chess.WHITE], self.counts[chess.BLACK]
+        )
+
+    def phase(self):
+        # find_phase cộng non_pawn_material của bàn cờ và bản lật → gấp đôi
+        return phase_from_npm(2 * self.npm)
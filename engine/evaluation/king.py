@@ -1,5 +1,8 @@
 import chess
 
+from engine.evaluation.bitboards import FORWARD_RANKS, KING_FLANK
+from engine.evaluation.context import EvalContext
+
 # --- Các hàm thành phần (giữ nguyên style của bạn) ---
 
 
@@ -10,22 +13,17 @@ def shelter_strength(board, square):
     """
     color = board.piece_at(square).color
     dir_ = 1 if color == chess.WHITE else -1
-    file = chess.square_file(square)
     rank = chess.square_rank(square)
+    pawns = board.pawns & board.occupied_co[color]
+    enemy_pawns = board.pawns & board.occupied_co[not color]
     bonus = 0
 
-    for df in (-1, 0, +1):
-        f = file + df
-        if 0 <= f <= 7:
-            for dr in (1, 2, 3):
-                r = rank + dir_ * dr
-                if 0 <= r <= 7:
-                    sq = chess.square(f, r)
-                    p = board.piece_at(sq)
-                    if p and p.piece_type == chess.PAWN and p.color == color:
-                        bonus += (4 - dr) * 5
-                    elif p and p.piece_type == chess.PAWN and p.color != color:
-                        bonus -= (4 - dr) * 3
+    for dr in (1, 2, 3):
+        r = rank + dir_ * dr
+        if 0 <= r <= 7:
+            row = KING_FLANK[square] & chess.BB_RANKS[r]
+            bonus += (4 - dr) * 5 * chess.popcount(pawns & row)
+            bonus -= (4 - dr) * 3 * chess.popcount(enemy_pawns & row)
     return bonus
 
 
@@ -42,15 +40,7 @@ def pawnless_flank(board, square):
     Trả 1 nếu xung quanh cánh vua (3 file) không có tốt đồng minh, 0 nếu có.
     """
     color = board.piece_at(square).color
-    king_file = chess.square_file(square)
-    for df in (-1, 0, +1):
-        f = king_file + df
-        if 0 <= f <= 7:
-            for r in range(8):
-                p = board.piece_at(chess.square(f, r))
-                if p and p.piece_type == chess.PAWN and p.color == color:
-                    return 0
-    return 1
+    return 0 if board.pawns & board.occupied_co[color] & KING_FLANK[square] else 1
 
 
 def king_danger(board, square):
@@ -65,80 +55,42 @@ def king_danger(board, square):
 
 
 def eval_king_safety_mg(board):
-    total = 0
-    for color in (chess.WHITE, chess.BLACK):
-        sign = 1 if color == chess.WHITE else -1
-        king_sq = board.king(color)
-        if king_sq is None:
-            continue
+    return eval_king_safety_pair(board)[0]
 
-        rank = chess.square_rank(king_sq)
-        file = chess.square_file(king_sq)
-
-        # Điểm cộng nếu có tốt gần vua
-        shield_bonus = 0
-        direction = 1 if color == chess.WHITE else -1
-        for df in [-1, 0, 1]:
-            f = file + df
-            r = rank + direction
-            if 0 <= f <= 7 and 0 <= r <= 7:
-                sq = chess.square(f, r)
-                piece = board.piece_at(sq)
-                if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                    shield_bonus += 15  # Có tốt che
-
-        # Điểm trừ nếu bị tấn công gần vua
-        attackers_penalty = len(board.attackers(not color, king_sq)) * 20
-
-        # Có tốt ở cánh vua không?
-        pawnless = 1
-        for df in [-1, 0, 1]:
-            f = file + df
-            if 0 <= f <= 7:
-                for r in range(1, 7):
-                    sq = chess.square(f, r)
-                    p = board.piece_at(sq)
-                    if p and p.piece_type == chess.PAWN and p.color == color:
-                        pawnless = 0
-                        break
-
-        total += sign * (shield_bonus - attackers_penalty + pawnless * 20)
-    return total
 
+def eval_king_safety_eg(board):
+    return eval_king_safety_pair(board)[1]
 
 
-def eval_king_safety_eg(board):
-    total = 0
+def eval_king_safety_pair(board, ctx=None):
+    """
+    King safety MG và EG trong một lượt: số quân địch tấn công vua và
+    cánh không tốt chỉ tính 1 lần cho mỗi bên. Trả về (mg, eg).
+    """
+    ctx = EvalContext(board) if ctx is None else ctx
+    mg = 0
+    eg = 0
     for color in (chess.WHITE, chess.BLACK):
         sign = 1 if color == chess.WHITE else -1
-        king_sq = board.king(color)
-        opp_king_sq = board.king(not color)
-        if king_sq is None or opp_king_sq is None:
+        king_sq = ctx.king_sq[color]
+        if king_sq is None:
             continue
 
-        # Khoảng cách giữa 2 vua → càng gần càng tốt
-        dist = chess.square_distance(king_sq, opp_king_sq)
-
-        # Điểm trừ nếu vua cách xa đối thủ
-        dist_penalty = dist * 8  # hệ số nhẹ để tránh mất tempo
+        own_pawns = ctx.pawns[color]
+        attackers = ctx.king_attackers[color]
 
-        # Điểm trừ nếu bị tấn công
-        danger_penalty = len(board.attackers(not color, king_sq)) * 10
+        # Tốt che ngay phía trước vua (3 ô vua tấn công ở hàng trước)
+        shield = chess.BB_KING_ATTACKS[king_sq] & FORWARD_RANKS[color][king_sq]
+        shield_bonus = 15 * chess.popcount(own_pawns & shield)
 
-        # Phạt nếu thiếu tốt ở cánh quanh vua
-        file = chess.square_file(king_sq)
-        pawnless = 1
-        for df in [-1, 0, 1]:
-            f = file + df
-            if 0 <= f <= 7:
-                for r in range(1, 7):
-                    sq = chess.square(f, r)
-                    p = board.piece_at(sq)
-                    if p and p.piece_type == chess.PAWN and p.color == color:
-                        pawnless = 0
-                        break
-
-        total += sign * (-dist_penalty - danger_penalty + pawnless * 30)
-    return total
+        # Có tốt ở cánh vua không? (tốt chỉ đứng được ở hàng 2–7)
+        pawnless = 0 if own_pawns & KING_FLANK[king_sq] else 1
 
+        mg += sign * (shield_bonus - attackers * 20 + pawnless * 20)
 
+        opp_king_sq = ctx.king_sq[not color]
+        if opp_king_sq is None:
+            continue
+        dist = chess.square_distance(king_sq, opp_king_sq)
+        eg += sign * (-dist * 8 - attackers * 10 + pawnless * 30)
+    return mg, eg
@@ -1,5 +1,7 @@
 import chess
 
+from engine.evaluation.context import EvalContext
+
 # === 1. Bảng bonus mobility (Middle Game & Endgame) ===
 MOBILITY_BONUS = {
     "MG": {
@@ -91,20 +93,34 @@ MOBILITY_BONUS = {
 }
 
 
-def _mobility_count(board: chess.Board, square: chess.Square) -> int:
-    pseudo = board.copy()
-    piece = board.piece_at(square)
-    pseudo.turn = piece.color
-    cnt = 0
-    for mv in pseudo.legal_moves:
-        if mv.from_square != square:
-            continue
-        dest = board.piece_at(mv.to_square)
-        # Skip ăn hậu đối phương
-        if dest and dest.piece_type == chess.QUEEN and dest.color != piece.color:
-            continue
-        cnt += 1
-    return cnt
+def _mobility_area(ctx: EvalContext, color: chess.Color) -> int:
+    """
+    Các ô quân bên `color` được tính là nước đi (như sinh nước hợp lệ khi
+    đến lượt `color`): không phải ô quân mình, không ăn hậu đối phương;
+    vua đang bị chiếu thì chỉ còn ô chặn / ăn quân chiếu (chiếu đôi → 0).
+    """
+    area = ~ctx.occupied_co[color] & chess.BB_ALL
+    area &= ~(ctx.board.queens & ctx.occupied_co[not color])
+    checkers = ctx.king_checkers[color]
+    if checkers:
+        if checkers & (checkers - 1):
+            return 0
+        area &= checkers | chess.between(ctx.king_sq[color], chess.lsb(checkers))
+    return area
+
+
+def _mobility_count(
+    board: chess.Board, square: chess.Square, ctx: EvalContext = None, area: int = None
+) -> int:
+    ctx = EvalContext(board) if ctx is None else ctx
+    if area is None:
+        area = _mobility_area(ctx, board.color_at(square))
+    mask = ctx.attacks[square] & area
+    # Quân bị ghim chỉ đi được trên đường ghim
+    ray = ctx.pin_rays.get(square)
+    if ray is not None:
+        mask &= ray
+    return chess.popcount(mask)
 
 def _mobility_bonus(count: int, table: list[int]) -> int:
     idx = min(count, len(table) - 1)
@@ -114,16 +130,39 @@ def _mobility_bonus(count: int, table: list[int]) -> int:
 def _eval_mobility(
     board: chess.Board, bonus_table: dict[chess.PieceType, list[int]]
 ) -> int:
+    ctx = EvalContext(board)
     total = 0
     for color in (chess.WHITE, chess.BLACK):
         sign = 1 if color == chess.WHITE else -1
+        area = _mobility_area(ctx, color)
         for piece_type, table in bonus_table.items():
             for sq in board.pieces(piece_type, color):
-                cnt = _mobility_count(board, sq)
+                cnt = _mobility_count(board, sq, ctx, area)
                 bonus = _mobility_bonus(cnt, table)
                 total += sign * bonus
     return total
 
+
+def eval_mobility_pair(board: chess.Board, ctx: EvalContext = None) -> tuple[int, int]:
+    """
+    Mobility cho cả MG và EG: mỗi quân chỉ đếm số nước đi 1 lần
+    (từ bitboard tấn công trong ctx) rồi tra cả hai bảng bonus. Trả về (mg, eg).
+    """
+    ctx = EvalContext(board) if ctx is None else ctx
+    mg = 0
+    eg = 0
+    for color in (chess.WHITE, chess.BLACK):
+        sign = 1 if color == chess.WHITE else -1
+        area = _mobility_area(ctx, color)
+        for piece_type in MOBILITY_BONUS["MG"]:
+            mg_table = MOBILITY_BONUS["MG"][piece_type]
+            eg_table = MOBILITY_BONUS["EG"][piece_type]
+            for sq in board.pieces(piece_type, color):
+                cnt = _mobility_count(board, sq, ctx, area)
+                mg += sign * _mobility_bonus(cnt, mg_table)
+                eg += sign * _mobility_bonus(cnt, eg_table)
+    return mg, eg
+
 # === Phase-specific wrappers ===
 def eval_mobility_mg(board: chess.Board) -> int:
     return _eval_mobility(board, MOBILITY_BONUS["MG"])
@@ -0,0 +1,125 @@
+from collections import namedtuple
+
+import chess
+import chess.polyglot
+
+from engine.evaluation.bitboards import (
+    OUTPOST_RANKS,
+    PASSED_PAWN_SPAN,
+    PAWN_ATTACK_SPAN,
+)
+from engine.evaluation.pawns import pawns_eg, pawns_mg
+
+# Khoá Zobrist chỉ gồm tốt: [color][square], lấy từ bảng ngẫu nhiên Polyglot
+# (tốt đen = 0, tốt trắng = 1) để khớp với khoá của TT
+PAWN_ZOBRIST = [
+    [chess.polyglot.POLYGLOT_RANDOM_ARRAY[64 * int(color) + sq] for sq in chess.SQUARES]
+    for color in (chess.BLACK, chess.WHITE)
+]
+
+# Dữ liệu cấu trúc tốt, mọi bitboard đánh chỉ số theo màu:
+# - mg, eg: điểm eval_pawns
+# - attacks: ô bị tốt tấn công; attack_span: ô tốt có thể tấn công khi tiến lên
+# - passed: tốt thông; semi_open: các cột không có tốt của bên đó
+# - open_files: các cột không có tốt nào
+# - outposts: ô outpost hợp lệ (như outpost_square trong pieces.py)
+PawnEntry = namedtuple(
+    "PawnEntry",
+    "key mg eg attacks attack_span passed semi_open open_files outposts",
+)
+
+
+def pawn_key(board: chess.Board) -> int:
+    key = 0
+    for color in (chess.WHITE, chess.BLACK):
+        for sq in chess.scan_reversed(board.pawns & board.occupied_co[color]):
+            key ^= PAWN_ZOBRIST[color][sq]
+    return key
+
+
+def compute_pawn_entry(board: chess.Board, key: int) -> PawnEntry:
+    pawns = [
+        board.pawns & board.occupied_co[chess.BLACK],
+        board.pawns & board.occupied_co[chess.WHITE],
+    ]
+    attacks = [0, 0]
+    attack_span = [0, 0]
+    passed = [0, 0]
+    semi_open = [0, 0]
+    for color in (chess.WHITE, chess.BLACK):
+        semi_open[color] = chess.BB_ALL
+        for sq in chess.scan_reversed(pawns[color]):
+            attacks[color] |= chess.BB_PAWN_ATTACKS[color][sq]
+            attack_span[color] |= PAWN_ATTACK_SPAN[color][sq]
+            if not PASSED_PAWN_SPAN[color][sq] & pawns[not color]:
+                passed[color] |= chess.BB_SQUARES[sq]
+            semi_open[color] &= ~chess.BB_FILES[chess.square_file(sq)]
+    open_files = semi_open[chess.WHITE] & semi_open[chess.BLACK]
+
+    # Outpost giữ đúng luật của outpost_square: trắng xét hàng 4-6, chỉ tốt
+    # đen ở hàng 6 trở xuống mới đe doạ; đen xét hàng 3-5, tốt trắng từ hàng 2
+    # (ô bị chặn = các ô có tốt địch trong PAWN_ATTACK_SPAN của ô đó)
+    blocked = [0, 0]
+    for sq in chess.scan_reversed(pawns[chess.BLACK] & ~chess.BB_RANK_7):
+        blocked[chess.WHITE] |= PAWN_ATTACK_SPAN[chess.BLACK][sq]
+    for sq in chess.scan_reversed(pawns[chess.WHITE]):
+        blocked[chess.BLACK] |= PAWN_ATTACK_SPAN[chess.WHITE][sq]
+    outposts = [
+        OUTPOST_RANKS[color] & attacks[color] & ~blocked[color]
+        for color in (chess.BLACK, chess.WHITE)
+    ]
+
+    return PawnEntry(
+        key,
+        pawns_mg(board),
+        pawns_eg(board),
+        attacks,
+        attack_span,
+        passed,
+        semi_open,
+        open_files,
+        outposts,
+    )
+
+
+class PawnHashTable:
+    """
+    Bảng băm cấu trúc tốt: khoá Zobrist chỉ gồm tốt → PawnEntry.
+    Cấu trúc tốt hiếm khi đổi giữa các nút anh em nên tỉ lệ trúng rất cao.
+    Kích thước cố định (luỹ thừa của 2), entry mới luôn ghi đè entry cũ.
+    """
+
+    def __init__(self, entries=16384):
+        self.num_entries = 1 << (max(1, entries).bit_length() - 1)
+        self.mask = self.num_entries - 1
+        self.clear()
+
+    def clear(self):
+        self.table = [None] * self.num_entries
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, board, key=None) -> PawnEntry:
+        """Trả về PawnEntry của thế cờ, tính và lưu lại nếu chưa có."""
+        key = pawn_key(board) if key is None else key
+        index = key & self.mask
+        entry = self.table[index]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = compute_pawn_entry(board, key)
+        self.table[index] = entry
+        return entry
+
+    def stats(self) -> dict:
+        probes = self.hits + self.misses
+        return {
+            "entries": self.num_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
+
+
+PAWN_TABLE = PawnHashTable()
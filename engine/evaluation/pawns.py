@@ -1,5 +1,7 @@
 import chess
 
+from engine.evaluation.bitboards import ADJACENT_FILES, FORWARD_FILE
+
 
 def eval_pawns(board, phase):
     if phase == "mg":
@@ -153,26 +155,9 @@ def isolated(board, color, file, rank):
     """
     Kiểm tra xem Tốt ở ô square có bị isolated (cô lập) không.
     """
-    # Kiểm tra toàn bộ file bên trái và bên phải
-    for rank in range(8):
-        if file > 0:
-            left_square = chess.square(file - 1, rank)
-            if (
-                board.piece_at(left_square)
-                and (board.piece_at(left_square).piece_type == chess.PAWN)
-                and (board.piece_at(left_square).color == color)
-            ):
-                return 0
-        if file < 7:
-            right_square = chess.square(file + 1, rank)
-            if (
-                board.piece_at(right_square)
-                and board.piece_at(right_square).piece_type == chess.PAWN
-                and board.piece_at(right_square).color == color
-            ):
-                return 0
-
-    return 1
+    # Có tốt đồng minh ở toàn bộ file bên trái hoặc bên phải không
+    pawns = board.pawns & board.occupied_co[color]
+    return 0 if pawns & ADJACENT_FILES[chess.square(file, rank)] else 1
 
 
 def backward(board, color, sign, file, rank):
@@ -359,19 +344,10 @@ def opposed(board, color, sign, file, rank):
     """
     Kiểm tra xem Tốt ở ô square có bị opposed (bị đối đầu trực tiếp bởi Tốt đối phương) hay không.
     """
-    enemy_color = not color
-    start = rank + sign
-    end = 8 if sign == 1 else -1
-
     # Trắng tiến lên => kiểm tra các ô phía trước
     # Đen tiến xuống => kiểm tra các ô phía sau
-    for r in range(start, end, sign):
-        front_sq = chess.square(file, r)
-        enemy = board.piece_at(front_sq)
-        if enemy and enemy.piece_type == chess.PAWN and enemy.color == enemy_color:
-            return 1
-
-    return 0
+    forward = FORWARD_FILE[sign == 1][chess.square(file, rank)]
+    return 1 if board.pawns & board.occupied_co[not color] & forward else 0
 
 
 def connected_bonus(board, color, sign, file, rank):
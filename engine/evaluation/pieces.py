@@ -1,5 +1,14 @@
 import chess
 
+from engine.evaluation.bitboards import (
+    BOARD_HALF,
+    KING_RING,
+    OUTPOST_RANKS,
+    PAWN_ATTACK_SPAN,
+    SQUARE_COLOR,
+)
+from engine.evaluation.context import EvalContext
+
 
 def eval_pieces(board, phase):
     return eval_pieces_mg(board) if phase == "mg" else eval_pieces_eg(board)
@@ -10,58 +19,7 @@ def eval_pieces_mg(board):
     Đánh giá đặc trưng của quân NBRQ trong giai đoạn middle game.
     Trả về tổng điểm cho cả hai bên: trắng dương, đen âm.
     """
-    total = 0
-    for square, piece in board.piece_map().items():
-        if piece.piece_type not in (
-            chess.KNIGHT,
-            chess.BISHOP,
-            chess.ROOK,
-            chess.QUEEN,
-        ):
-            continue
-        rank = chess.square_rank(square)
-        file = chess.square_file(square)
-        color = piece.color
-        sign = 1 if color == chess.WHITE else -1
-
-        v = 0
-        v += (
-            sign
-            * [0, 25, -5, 24, 45][outpost_total(board, piece, color, sign, rank, file)]
-        )
-        v += sign * 14 * minor_behind_pawn(board, piece, color, sign, rank, file)
-        v -= sign * 2 * bishop_pawns(board, piece, color, sign, rank, file)
-        v -= sign * 3 * bishop_xray_pawns(board, piece, color, rank, file)
-        v += sign * 4 * rook_on_queen_file(board, piece, file)
-        v += sign * 12 * rook_on_king_ring(board, piece, color, rank, file)
-        v += sign * 19 * bishop_on_king_ring(board, piece, color, rank, file)
-        v += sign * [0, 15, 38][rook_on_file(board, piece, color, file)]
-        v -= (
-            sign
-            * trapped_rook(board, piece, color, rank, file)
-            * 44
-            * (
-                1
-                if (
-                    board.has_castling_rights(chess.WHITE)
-                    or board.has_castling_rights(chess.BLACK)
-                )
-                else 2
-            )
-        )
-        v -= sign * 45 * weak_queen(board, piece, color, rank, file)
-        v -= sign * 1 * queen_infiltration(board, piece, color, sign, rank, file)
-
-        if piece.piece_type == chess.KNIGHT:
-            v -= sign * 6 * king_protector(board, piece, color, rank, file)
-        else:
-            v -= sign * 4 * king_protector(board, piece, color, rank, file)
-
-        v += sign * 36 * long_diagonal_bishop(board, piece, rank, file)
-
-        total += v
-
-    return total
+    return eval_pieces_pair(board)[0]
 
 
 def eval_pieces_eg(board):
@@ -69,8 +27,27 @@ def eval_pieces_eg(board):
     Đánh giá đặc trưng của quân NBRQ trong giai đoạn endgame.
     Trả về tổng điểm cho cả hai bên: trắng dương, đen âm.
     """
-    total = 0
-    for square, piece in board.piece_map().items():
+    return eval_pieces_pair(board)[1]
+
+
+def eval_pieces_pair(board, ctx=None):
+    """
+    Đánh giá quân NBRQ cho cả middle game và endgame trong một lượt duyệt:
+    mỗi hàm thành phần chỉ tính 1 lần, rồi nhân với hệ số MG và EG.
+    Trả về (mg, eg): trắng dương, đen âm.
+    """
+    ctx = EvalContext(board) if ctx is None else ctx
+    castling = (
+        1
+        if (
+            board.has_castling_rights(chess.WHITE)
+            or board.has_castling_rights(chess.BLACK)
+        )
+        else 2
+    )
+    mg = 0
+    eg = 0
+    for square, piece in ctx.piece_map.items():
         if piece.piece_type not in (
             chess.KNIGHT,
             chess.BISHOP,
@@ -78,55 +55,55 @@ def eval_pieces_eg(board):
             chess.QUEEN,
         ):
             continue
-
         rank = chess.square_rank(square)
         file = chess.square_file(square)
         color = piece.color
         sign = 1 if color == chess.WHITE else -1
 
-        v = 0
-        # Outpost (EG)
-        v += (
-            sign
-            * [0, 17, 29, 18, 29][outpost_total(board, piece, color, sign, rank, file)]
-        )
-        # Minor behind pawn
-        v += sign * 2 * minor_behind_pawn(board, piece, color, sign, rank, file)
-        # Bishop pawns
-        v -= sign * 5 * bishop_pawns(board, piece, color, sign, rank, file)
-        # Bishop xray pawns
-        v -= sign * 4 * bishop_xray_pawns(board, piece, color, rank, file)
-        # Rook on queen file
-        v += sign * 8 * rook_on_queen_file(board, piece, file)
-        # Rook on file (EG)
-        v += sign * [0, 5, 23][rook_on_file(board, piece, color, file)]
-        # Trapped rook
-        v -= (
-            sign
-            * trapped_rook(board, piece, color, rank, file)
-            * 10
-            * (
-                1
-                if (
-                    board.has_castling_rights(chess.WHITE)
-                    or board.has_castling_rights(chess.BLACK)
-                )
-                else 2
-            )
-        )
-        # Weak queen
-        v -= sign * 12 * weak_queen(board, piece, color, rank, file)
-        # Queen infiltration
-        v += sign * 11 * queen_infiltration(board, piece, color, sign, rank, file)
-        # King protector
-        v -= sign * 7 * king_protector(board, piece, color, rank, file)
-
-        total += v
-
-    return total
+        outpost = outpost_total(board, piece, color, sign, rank, file, ctx)
+        behind_pawn = minor_behind_pawn(board, piece, color, sign, rank, file)
+        pawns = bishop_pawns(board, piece, color, sign, rank, file)
+        xray_pawns = bishop_xray_pawns(board, piece, color, rank, file)
+        queen_file = rook_on_queen_file(board, piece, file)
+        on_file = rook_on_file(board, piece, color, file, ctx)
+        trapped = trapped_rook(board, piece, color, rank, file, ctx)
+        weak = weak_queen(board, piece, color, rank, file)
+        infiltration = queen_infiltration(board, piece, color, sign, rank, file)
+        protector = king_protector(board, piece, color, rank, file)
 
+        v = 0
+        v += [0, 25, -5, 24, 45][outpost]
+        v += 14 * behind_pawn
+        v -= 2 * pawns
+        v -= 3 * xray_pawns
+        v += 4 * queen_file
+        v += 12 * rook_on_king_ring(board, piece, color, rank, file, ctx)
+        v += 19 * bishop_on_king_ring(board, piece, color, rank, file, ctx)
+        v += [0, 15, 38][on_file]
+        v -= trapped * 44 * castling
+        v -= 45 * weak
+        v -= 1 * infiltration
+        v -= (6 if piece.piece_type == chess.KNIGHT else 4) * protector
+        v += 36 * long_diagonal_bishop(board, piece, rank, file)
+        mg += sign * v
 
-def outpost_total(board, piece, color, sign, rank, file):
+        v = 0
+        v += [0, 17, 29, 18, 29][outpost]
+        v += 2 * behind_pawn
+        v -= 5 * pawns
+        v -= 4 * xray_pawns
+        v += 8 * queen_file
+        v += [0, 5, 23][on_file]
+        v -= trapped * 10 * castling
+        v -= 12 * weak
+        v += 11 * infiltration
+        v -= 7 * protector
+        eg += sign * v
+
+    return mg, eg
+
+
+def outpost_total(board, piece, color, sign, rank, file, ctx=None):
     """
     Điểm thưởng trong giai đoạn trung cuộc và tàn cuộc cho các vị trí outpost của mã và tượng,
     đặc biệt cao hơn nếu quân outpost được tốt đồng minh bảo vệ.
@@ -143,36 +120,24 @@ def outpost_total(board, piece, color, sign, rank, file):
 
     is_knight = piece.piece_type == chess.KNIGHT
 
-    if not outpost(board, piece, color, sign, rank, file):
+    if not outpost(board, piece, color, sign, rank, file, ctx):
         if not is_knight:
             return 0
-        return reachable_outpost(board, piece, color, sign, rank, file)
+        return reachable_outpost(board, piece, color, sign, rank, file, ctx)
 
     if is_knight and (file < 2 or file > 5):
-        enemy_threatens = False
-        enemy_count = 0
-
-        for x in range(8):
-            for y in range(8):
-                sq = chess.square(x, y)
-                enemy_piece = board.piece_at(sq)
-                if enemy_piece and enemy_piece.color != color:
-                    # Check if enemy piece can attack knight's position
-                    if (abs(file - x) == 2 and abs(rank - y) == 1) or (
-                        abs(file - x) == 1 and abs(rank - y) == 2
-                    ):
-                        enemy_threatens = True
-                    # Count enemies in the same half of the board
-                    if (x < 4 and file < 4) or (x >= 4 and file >= 4):
-                        enemy_count += 1
-
+        square = chess.square(file, rank)
+        enemies = board.occupied_co[not color]
+        # Quân địch đứng ở ô cách một nước mã, và số quân địch cùng nửa bàn
+        enemy_threatens = enemies & chess.BB_KNIGHT_ATTACKS[square]
+        enemy_count = chess.popcount(enemies & BOARD_HALF[square])
         if not enemy_threatens and enemy_count <= 1:
             return 2
 
     return 4 if is_knight else 3
 
 
-def reachable_outpost(board, piece, color, sign, rank, file):
+def reachable_outpost(board, piece, color, sign, rank, file, ctx=None):
     """
     Kiểm tra xem quân mã có thể nhảy đến một ô outpost hợp lệ hay không.
     Không xét bảo vệ, chỉ quan tâm có nước nhảy đến ô được tính là outpost.
@@ -184,93 +149,52 @@ def reachable_outpost(board, piece, color, sign, rank, file):
     if piece.piece_type != chess.KNIGHT:
         return 0
 
-    knight_moves = [
-        (2, 1),
-        (1, 2),
-        (-1, 2),
-        (-2, 1),
-        (-2, -1),
-        (-1, -2),
-        (1, -2),
-        (2, -1),
-    ]
-
-    for dx, dy in knight_moves:
-        tx, ty = file + dx, rank + dy
-        if 0 <= tx <= 7 and 0 <= ty <= 7:
-            target_square = chess.square(tx, ty)
-
-            # Chỉ cần trống và là ô outpost hợp lệ
-            target_piece = board.piece_at(target_square)
-            if target_piece and target_piece.color == color:
-                continue  # quân mình cản
-            if outpost_square(board, color, sign, tx, ty):
-                return 1
-
+    # Chỉ cần ô không có quân mình và là ô outpost hợp lệ
+    square = chess.square(file, rank)
+    targets = chess.BB_KNIGHT_ATTACKS[square] & ~board.occupied_co[color]
+    if ctx is not None and ctx.pawn is not None:
+        return int(bool(targets & ctx.pawn.outposts[color]))
+    for target in chess.scan_forward(targets):
+        if outpost_square(
+            board, color, sign, chess.square_file(target), chess.square_rank(target)
+        ):
+            return 1
     return 0
 
 
-def outpost(board, piece, color, sign, rank, file):
+def outpost(board, piece, color, sign, rank, file, ctx=None):
     """
     Đánh giá tổng số quân cờ có thể tạo thành outpost tại ô square.
     """
     if piece.piece_type not in (chess.KNIGHT, chess.BISHOP):
         return 0
-    if not outpost_square(board, color, sign, file, rank):
+    if not outpost_square(board, color, sign, file, rank, ctx):
         return 0
     return 1
 
 
-def outpost_square(board, color, sign, file, rank):
+def outpost_square(board, color, sign, file, rank, ctx=None):
     """
     Kiển tra 2 ô chéo liền sau có tốt đồng minh bảo kê không
     và 2 cột 2 bên có tốt địch không.
     Nếu có bảo kê và cột nào không có tốt địch thì trả về True.
+    ctx.pawn (PawnEntry) có sẵn bitboard outpost → tra 1 bit.
     """
+    square = chess.square(file, rank)
+    if ctx is not None and ctx.pawn is not None:
+        return int(bool(ctx.pawn.outposts[color] & chess.BB_SQUARES[square]))
+    if not OUTPOST_RANKS[color] & chess.BB_SQUARES[square]:
+        return 0
+    pawns = board.pawns & board.occupied_co[color]
+    enemy_pawns = board.pawns & board.occupied_co[not color]
     if color == chess.WHITE:
-        if rank < 3 or rank > 5:
-            return 0
-    else:
-        if rank < 2 or rank > 4:
-            return 0
-    enemy_color = not color
-    for r in range(rank + sign, 3 + sign * 3, sign):
-        if file > 0:
-            left_square = chess.square(file - 1, r)
-            if (
-                board.piece_at(left_square)
-                and (board.piece_at(left_square).piece_type == chess.PAWN)
-                and (board.piece_at(left_square).color == enemy_color)
-            ):
-                return 0
-        if file < 7:
-            right_square = chess.square(file + 1, r)
-            if (
-                board.piece_at(right_square)
-                and board.piece_at(right_square).piece_type == chess.PAWN
-                and board.piece_at(right_square).color == enemy_color
-            ):
-                return 0
-
-    # kiểm tra có tốt đồng minh ở ô chéo liền sau bảo kê không
+        # Như bảng outpost của pawn_hash: tốt đen ở hàng 7 không được tính
+        enemy_pawns &= ~chess.BB_RANK_7
+    if enemy_pawns & PAWN_ATTACK_SPAN[color][square]:
+        return 0
 
-    if file > 0:
-        left_square = chess.square(file - 1, rank - sign)
-        if (
-            board.piece_at(left_square)
-            and (board.piece_at(left_square).piece_type == chess.PAWN)
-            and (board.piece_at(left_square).color == color)
-        ):
-            return 1
-    if file < 7:
-        right_square = chess.square(file + 1, rank - sign)
-        if (
-            board.piece_at(right_square)
-            and board.piece_at(right_square).piece_type == chess.PAWN
-            and board.piece_at(right_square).color == color
-        ):
-            return 1
-    return 0
+    # Có tốt đồng minh ở ô chéo liền sau bảo kê không
+    return int(bool(pawns & chess.BB_PAWN_ATTACKS[not color][square]))
 
 
 def minor_behind_pawn(board, piece, color, sign, rank, file):
@@ -301,43 +225,24 @@ def bishop_pawns(board, piece, color, sign, rank, file):
     if not piece or piece.piece_type != chess.BISHOP:
         return 0
 
-    # tính v và blocked
-    c = (file + rank) % 2
-    v = 0
-    blocked = 0
-    for x in range(8):
-        for y in range(8):
-            sq = chess.square(x, y)
-            p = board.piece_at(sq)
-            if not p or p.piece_type != chess.PAWN or p.color != color:
-                continue
-
-            if (x + y) % 2 == c:
-                v += 1
-
-            if 1 <= x <= 6:
-                ahead_rank = y + sign
-                if 0 <= ahead_rank <= 7:
-                    ahead_sq = chess.square(x, ahead_rank)
-                    if board.piece_at(ahead_sq):
-                        blocked += 1
-
-    # kiểm tra support
-    support = False
-    back_rank = rank - sign
-    for df in (-1, +1):
-        f = file + df
-        if 0 <= f < 8 and 0 <= back_rank < 8:
-            sq = chess.square(f, back_rank)
-            p = board.piece_at(sq)
-            if p and p.piece_type == chess.PAWN and p.color == color:
-                support = True
-                break
+    square = chess.square(file, rank)
+    pawns = board.pawns & board.occupied_co[color]
+
+    # v: tốt cùng màu ô với tượng; blocked: tốt cột b–g có quân chắn ngay trước
+    v = chess.popcount(pawns & SQUARE_COLOR[square])
+    inner = pawns & ~(chess.BB_FILE_A | chess.BB_FILE_H)
+    if color == chess.WHITE:
+        blocked = chess.popcount(inner & chess.shift_down(board.occupied))
+    else:
+        blocked = chess.popcount(inner & chess.shift_up(board.occupied))
+
+    # support: có tốt đồng minh ở ô chéo liền sau
+    support = pawns & chess.BB_PAWN_ATTACKS[not color][square]
 
     return v * (blocked + (0 if support else 1))
 
 
-def rook_on_file(board, piece, color, file):
+def rook_on_file(board, piece, color, file, ctx=None):
     """
     Đánh giá cột xe đang đứng:
     - 2: cột hoàn toàn mở (không có pawn nào ở cột đó)
@@ -348,6 +253,12 @@ def rook_on_file(board, piece, color, file):
     if not piece or piece.piece_type != chess.ROOK or piece.color != color:
         return 0
 
+    if ctx is not None and ctx.pawn is not None:
+        file_mask = chess.BB_FILES[file]
+        if not ctx.pawn.semi_open[color] & file_mask:
+            return 0
+        return 2 if ctx.pawn.open_files & file_mask else 1
+
     open_file = 1
     for y in range(8):
         sq = chess.square(file, y)
@@ -363,7 +274,7 @@ def rook_on_file(board, piece, color, file):
     return open_file + 1
 
 
-def trapped_rook(board, piece, color, rank, file):
+def trapped_rook(board, piece, color, rank, file, ctx=None):
     """
     Trả về 1 nếu Rook của bên `color` trên ô (file, rank) đang bị giam:
     - Không đứng trên cột semi-open/open (rook_on_file == 0)
@@ -376,10 +287,36 @@ def trapped_rook(board, piece, color, rank, file):
         return 0
 
     # 2) Nếu đang trên cột semi-open/open → không trapped
-    if rook_on_file(board, piece, color, file) > 0:
+    if rook_on_file(board, piece, color, file, ctx) > 0:
         return 0
 
     # 3) Đếm số nước đi hợp lệ của xe
+    if ctx is not None:
+        square = chess.square(file, rank)
+        mobility_count = chess.popcount(ctx.attacks[square] & ~ctx.occupied_co[color])
+    else:
+        mobility_count = _rook_ray_count(board, color, rank, file)
+
+    if mobility_count > 3:
+        return 0
+
+    # 4) Lấy file của vua cùng màu
+    king_sq = board.king(color)
+    if king_sq is None:
+        return 0
+    king_file = chess.square_file(king_sq)
+
+    # 5) Nếu Rook và Vua ở hai nửa bàn khác nhau → không trapped
+    #    (cột 0–3 là nửa trái, 4–7 là nửa phải)
+    if (king_file < 4) != (file < king_file):
+        return 0
+
+    # 6) Thỏa các điều kiện → Rook bị giam
+    return 1
+
+
+def _rook_ray_count(board, color, rank, file):
+    """Số ô xe đi tới được theo 4 hướng (ô trống hoặc quân địch đầu tiên)."""
     mobility_count = 0
     directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # up, down, right, left
 
@@ -400,23 +337,7 @@ def trapped_rook(board, piece, color, rank, file):
                 if piece_at.color != color:
                     mobility_count += 1
                 break
-
-    if mobility_count > 3:
-        return 0
-
-    # 4) Lấy file của vua cùng màu
-    king_sq = board.king(color)
-    if king_sq is None:
-        return 0
-    king_file = chess.square_file(king_sq)
-
-    # 5) Nếu Rook và Vua ở hai nửa bàn khác nhau → không trapped
-    #    (cột 0–3 là nửa trái, 4–7 là nửa phải)
-    if (king_file < 4) != (file < king_file):
-        return 0
-
-    # 6) Thỏa các điều kiện → Rook bị giam
-    return 1
+    return mobility_count
 
 
 def weak_queen(board, piece, color, rank, file):
@@ -539,7 +460,7 @@ def bishop_xray_pawns(board, piece, color, rank, file):
     return count
 
 
-def rook_on_king_ring(board, piece, color, rank, file):
+def rook_on_king_ring(board, piece, color, rank, file, ctx=None):
     """
     Trả về 1 nếu quân xe đang đứng cùng cột với một ô thuộc King Ring của vua địch,
     không chiếu vua, và có một quân cản (không phải R, Q, K) nằm giữa xe và vua,
@@ -552,7 +473,7 @@ def rook_on_king_ring(board, piece, color, rank, file):
     enemy_color = not color
 
     # 1) Nếu xe đang chiếu vua địch → không tính điểm
-    if board.is_check():
+    if ctx.in_check if ctx is not None else board.is_check():
         return 0
 
     # 2) Lấy vị trí vua địch
@@ -586,7 +507,7 @@ def rook_on_king_ring(board, piece, color, rank, file):
     return 0
 
 
-def bishop_on_king_ring(board, piece, color, rank, file):
+def bishop_on_king_ring(board, piece, color, rank, file, ctx=None):
     if not piece or piece.piece_type != chess.BISHOP or piece.color != color:
         return 0
 
@@ -595,8 +516,7 @@ def bishop_on_king_ring(board, piece, color, rank, file):
     if king_sq is None:
         return 0
 
-    king_file = chess.square_file(king_sq)
-    king_rank = chess.square_rank(king_sq)
+    ring = KING_RING[king_sq]
 
     directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
     for dx, dy in directions:
@@ -606,7 +526,7 @@ def bishop_on_king_ring(board, piece, color, rank, file):
         while 0 <= x <= 7 and 0 <= y <= 7:
             sq = chess.square(x, y)
 
-            if abs(x - king_file) <= 1 and abs(y - king_rank) <= 1:
+            if ring & chess.BB_SQUARES[sq]:
                 if blocker_found:
                     return 1
                 else:
@@ -620,7 +540,11 @@ def bishop_on_king_ring(board, piece, color, rank, file):
                 if piece_at.piece_type in (chess.QUEEN, chess.PAWN):
                     break
 
-                if board.is_attacked_by(enemy_color, sq):
+                if (
+                    ctx.attacked_by(enemy_color, sq)
+                    if ctx is not None
+                    else board.is_attacked_by(enemy_color, sq)
+                ):
                     break
 
                 blocker_found = True
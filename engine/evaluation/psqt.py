@@ -1,64 +1,123 @@
+import os
+from array import array
+
 import chess
 
-## Bảng pst
-from engine.evaluation.evaluation_tables import (
-    PAWN_PST_MG,
-    KNIGHT_PST_MG,
-    BISHOP_PST_MG,
-    ROOK_PST_MG,
-    QUEEN_PST_MG,
-    KING_PST_MG,
-    PAWN_PST_EG,
-    KNIGHT_PST_EG,
-    BISHOP_PST_EG,
-    ROOK_PST_EG,
-    QUEEN_PST_EG,
-    KING_PST_EG,
-)
-
-PST_MG = {
-    chess.PAWN: PAWN_PST_MG,
-    chess.KNIGHT: KNIGHT_PST_MG,
-    chess.BISHOP: BISHOP_PST_MG,
-    chess.ROOK: ROOK_PST_MG,
-    chess.QUEEN: QUEEN_PST_MG,
-    chess.KING: KING_PST_MG,
-}
-
-PST_EG = {
-    chess.PAWN: PAWN_PST_EG,
-    chess.KNIGHT: KNIGHT_PST_EG,
-    chess.BISHOP: BISHOP_PST_EG,
-    chess.ROOK: ROOK_PST_EG,
-    chess.QUEEN: QUEEN_PST_EG,
-    chess.KING: KING_PST_EG,
-}
+from engine.evaluation.psqt_data import PSQT_DATA
 
+# File dữ liệu sinh sẵn từ evaluation_tables (xem write_psqt_data)
+DATA_PATH = os.path.join(os.path.dirname(__file__), "psqt_data.py")
 
-def eval_psqt(board, phase):
+
+def _pack_tables():
     """
-    Đánh giá Piece-Square Table (PSQT) cho bàn cờ hiện tại, theo phase middle game (mg) hoặc end game (eg).
+    Gộp 12 bảng thành 1 mảng liền PSQT, chỉ số psqt_index(color, piece_type, square)
+    trỏ tới điểm mg, ô kế tiếp là điểm eg. Quân đen đã lật ô và đổi dấu
+    nên điểm của 1 quân chỉ là 1 lần tra rồi cộng.
+    Chỉ chạy khi sinh lại psqt_data.py; lúc import dùng PSQT_DATA có sẵn.
     """
-    score = 0
-    pst_table = PST_MG if phase == "mg" else PST_EG
+    from engine.evaluation.evaluation_tables import (
+        PAWN_PST_MG,
+        KNIGHT_PST_MG,
+        BISHOP_PST_MG,
+        ROOK_PST_MG,
+        QUEEN_PST_MG,
+        KING_PST_MG,
+        PAWN_PST_EG,
+        KNIGHT_PST_EG,
+        BISHOP_PST_EG,
+        ROOK_PST_EG,
+        QUEEN_PST_EG,
+        KING_PST_EG,
+    )
+
+    pst_mg = {
+        chess.PAWN: PAWN_PST_MG,
+        chess.KNIGHT: KNIGHT_PST_MG,
+        chess.BISHOP: BISHOP_PST_MG,
+        chess.ROOK: ROOK_PST_MG,
+        chess.QUEEN: QUEEN_PST_MG,
+        chess.KING: KING_PST_MG,
+    }
+    pst_eg = {
+        chess.PAWN: PAWN_PST_EG,
+        chess.KNIGHT: KNIGHT_PST_EG,
+        chess.BISHOP: BISHOP_PST_EG,
+        chess.ROOK: ROOK_PST_EG,
+        chess.QUEEN: QUEEN_PST_EG,
+        chess.KING: KING_PST_EG,
+    }
+    table = array("i", bytes(4 * 2 * 7 * 64 * 2))
+    for color in (chess.WHITE, chess.BLACK):
+        sign = 1 if color == chess.WHITE else -1
+        for piece_type in chess.PIECE_TYPES:
+            for square in chess.SQUARES:
+                flip = square if color == chess.WHITE else chess.square_mirror(square)
+                index = psqt_index(color, piece_type, square)
+                table[index] = sign * pst_mg[piece_type][flip]
+                table[index + 1] = sign * pst_eg[piece_type][flip]
+    return table
+
+
+def write_psqt_data(path=DATA_PATH):
+    """Sinh lại psqt_data.py sau khi sửa evaluation_tables."""
+    table = _pack_tables()
+    lines = [
+        "# File sinh tự động: python -m engine.evaluation.psqt",
+        "# Bảng PSQT đã gộp (xem psqt._pack_tables), không sửa tay.",
+        "",
+        "# fmt: off",
+        "PSQT_DATA = (",
+    ]
+    for color in (chess.BLACK, chess.WHITE):
+        for piece_type in range(7):
+            name = chess.PIECE_NAMES[piece_type] or "(trống)"
+            lines.append(f"    # {chess.COLOR_NAMES[color]} {name}")
+            for square in range(0, 64, 8):
+                index = psqt_index(color, piece_type, square)
+                row = table[index : index + 16]
+                lines.append("    " + " ".join(f"{value}," for value in row))
+    lines += [")", "# fmt: on", ""]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
 
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece is None:
-            continue
+def psqt_index(color, piece_type, square) -> int:
+    return ((color * 7 + piece_type) * 64 + square) * 2
 
-        piece_type = piece.piece_type
-        color = piece.color
 
-        # Lật ô nếu quân đen
-        flip_square = square if color == chess.WHITE else chess.square_mirror(square)
+PSQT = array("i", PSQT_DATA)
 
-        bonus = pst_table[piece_type][flip_square]
 
-        # Cộng điểm cho trắng, trừ điểm cho đen
-        if color == chess.WHITE:
-            score += bonus
-        else:
-            score -= bonus
+def eval_psqt_pair(board):
+    """(mg, eg) của Piece-Square Table trong 1 lượt duyệt các quân."""
+    mg = 0
+    eg = 0
+    for color in (chess.WHITE, chess.BLACK):
+        occupied = board.occupied_co[color]
+        for piece_type, mask in (
+            (chess.PAWN, board.pawns),
+            (chess.KNIGHT, board.knights),
+            (chess.BISHOP, board.bishops),
+            (chess.ROOK, board.rooks),
+            (chess.QUEEN, board.queens),
+            (chess.KING, board.kings),
+        ):
+            base = psqt_index(color, piece_type, 0)
+            for square in chess.scan_forward(mask & occupied):
+                index = base + 2 * square
+                mg += PSQT[index]
+                eg += PSQT[index + 1]
+    return mg, eg
+
+
+def eval_psqt(board, phase):
+    """
+    Đánh giá Piece-Square Table (PSQT) cho bàn cờ hiện tại, theo phase middle game (mg) hoặc end game (eg).
+    """
+    mg, eg = eval_psqt_pair(board)
+    return mg if phase == "mg" else eg
+
 
-    return score
+if __name__ == "__main__":
+    write_psqt_data()
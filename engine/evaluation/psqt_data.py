@@ -0,0 +1,133 @@
+# File sinh tự động: python -m engine.evaluation.psqt
+# Bảng PSQT đã gộp (xem psqt._pack_tables), không sửa tay.
+
+# fmt: off
+PSQT_DATA = (
+    # black (trống)
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    # black pawn
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    -2, 8, -2, 4, -8, -8, -15, 0, -12, -11, -15, -5, -5, 4, 4, 15,
+    7, 8, 12, 8, -8, 8, -12, -3, -25, -3, -17, -2, -4, 4, 17, 3,
+    3, -4, 18, 1, -4, 6, -16, 3, -32, 10, -13, 9, -3, 8, 6, 7,
+    -10, -8, 0, -4, 10, -3, 0, 4, -8, 4, 1, 4, 10, -11, -4, -7,
+    -4, -22, 9, -16, 5, -16, -17, -22, 6, -24, 4, -5, 12, -4, 6, -10,
+    5, 0, -5, 8, 2, -9, 10, -16, -4, -20, 12, -15, -8, -3, 6, -5,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    # black knight
+    141, 80, 74, 70, 59, 45, 58, 13, 58, 13, 59, 45, 74, 70, 141, 80,
+    62, 55, 33, 40, 21, 41, 12, -9, 12, -9, 21, 41, 33, 40, 62, 55,
+    49, 41, 13, 35, -4, 12, -9, -13, -9, -13, -4, 12, 13, 35, 49, 41,
+    28, 36, -6, 12, -32, -7, -39, -31, -39, -31, -32, -7, -6, 12, 28, 36,
+    27, 28, -10, 1, -35, -10, -41, -22, -41, -22, -35, -10, -10, 1, 27, 28,
+    7, 32, -17, 21, -46, 6, -42, -23, -42, -23, -46, 6, -17, 21, 7, 32,
+    54, 54, 21, 43, -3, 14, -29, -6, -29, -6, -3, 14, 21, 43, 54, 54,
+    162, 77, 66, 52, 45, 39, 20, 16, 20, 16, 45, 39, 66, 52, 162, 77,
+    # black bishop
+    42, 37, 4, 33, 6, 29, 18, 19, 18, 19, 6, 29, 4, 33, 42, 37,
+    12, 25, -6, 16, -15, 0, -3, 0, -3, 0, -15, 0, -6, 16, 12, 25,
+    5, 24, -16, -4, 4, -3, -13, -4, -13, -4, 4, -3, -16, -4, 5, 24,
+    4, 13, -8, 0, -20, 11, -31, -12, -31, -12, -20, 11, -8, 0, 4, 13,
+    9, 16, -23, 4, -17, 0, -25, -13, -25, -13, -17, 0, -23, 4, 9, 16,
+    12, 12, -4, 0, 0, 1, -8, -8, -8, -8, 0, 1, -4, 0, 12, 12,
+    13, 29, 11, 10, -4, 13, 0, 0, 0, 0, -4, 13, 11, 10, 13, 29,
+    38, 45, 0, 24, 11, 29, 18, 9, 18, 9, 11, 29, 0, 24, 38, 45,
+    # black rook
+    25, -14, 16, 0, 11, -15, 4, -10, 4, -10, 11, -15, 16, 0, 25, -14,
+    16, -3, 10, -4, 6, -16, -4, 4, -4, 4, 6, -16, 10, -4, 16, -3,
+    20, -4, 8, 0, 0, 5, -2, -8, -2, -8, 0, 5, 8, 0, 20, -4,
+    10, 4, 4, -6, 3, -5, 4, 4, 4, 4, 3, -5, 4, -6, 10, 4,
+    21, 4, 12, 0, 3, 7, -2, -5, -2, -5, 3, 7, 12, 0, 21, 4,
+    17, -4, 1, 6, -4, 1, -9, 4, -9, 4, -4, 1, 1, 6, 17, -4,
+    1, 9, -9, 7, -12, 0, -14, 1, -14, 1, -12, 0, -9, 7, 1, 9,
+    13, 7, 15, 10, 0, 8, -7, 7, -7, 7, 0, 8, 15, 10, 13, 7,
+    # black queen
+    -2, 60, 4, 41, 4, 34, -3, 29, -3, 29, 4, 34, 4, 41, -2, 60,
+    2, 40, -4, 21, -6, 19, -9, 6, -9, 6, -6, 19, -4, 21, 2, 40,
+    2, 30, -4, 14, -10, 9, -5, 0, -5, 0, -10, 9, -4, 14, 2, 30,
+    -3, 23, -4, 4, -7, -7, -6, -16, -6, -16, -7, -7, -4, 4, -3, 23,
+    0, 18, -11, 2, -9, -10, -4, -19, -4, -19, -9, -10, -11, 2, 0, 18,
+    3, 31, -8, 14, -4, 7, -6, -2, -6, -2, -4, 7, -8, 14, 3, 31,
+    4, 44, -4, 25, -8, 17, -6, 3, -6, 3, -8, 17, -4, 25, 4, 44,
+    1, 55, 1, 45, 0, 37, 1, 20, 1, 20, 0, 37, 1, 45, 1, 55,
+    # black king
+    -218, -8, -263, -47, -218, -58, -159, -62, -159, -62, -218, -58, -263, -47, -218, -8,
+    -224, -37, -244, -97, -188, -93, -144, -105, -144, -105, -188, -93, -244, -97, -224, -37,
+    -157, -74, -208, -138, -136, -148, -96, -154, -96, -154, -136, -148, -208, -138, -157, -74,
+    -132, -77, -153, -133, -111, -160, -79, -160, -79, -160, -111, -160, -153, -133, -132, -77,
+    -124, -83, -144, -125, -84, -138, -56, -138, -56, -138, -84, -138, -144, -125, -124, -83,
+    -99, -70, -116, -104, -65, -136, -25, -141, -25, -141, -65, -136, -116, -104, -99, -70,
+    -70, -42, -96, -80, -52, -107, -26, -108, -26, -108, -52, -107, -96, -80, -70, -42,
+    -47, 0, -71, -36, -36, -68, 0, -61, 0, -61, -36, -68, -71, -36, -47, 0,
+    # white (trống)
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    # white pawn
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    -5, 0, 5, -8, -2, 9, -10, 16, 4, 20, -12, 15, 8, 3, -6, 5,
+    4, 22, -9, 16, -5, 16, 17, 22, -6, 24, -4, 5, -12, 4, -6, 10,
+    10, 8, 0, 4, -10, 3, 0, -4, 8, -4, -1, -4, -10, 11, 4, 7,
+    -3, 4, -18, -1, 4, -6, 16, -3, 32, -10, 13, -9, 3, -8, -6, -7,
+    -7, -8, -12, -8, 8, -8, 12, 3, 25, 3, 17, 2, 4, -4, -17, -3,
+    2, -8, 2, -4, 8, 8, 15, 0, 12, 11, 15, 5, 5, -4, -4, -15,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    # white knight
+    -162, -77, -66, -52, -45, -39, -20, -16, -20, -16, -45, -39, -66, -52, -162, -77,
+    -54, -54, -21, -43, 3, -14, 29, 6, 29, 6, 3, -14, -21, -43, -54, -54,
+    -7, -32, 17, -21, 46, -6, 42, 23, 42, 23, 46, -6, 17, -21, -7, -32,
+    -27, -28, 10, -1, 35, 10, 41, 22, 41, 22, 35, 10, 10, -1, -27, -28,
+    -28, -36, 6, -12, 32, 7, 39, 31, 39, 31, 32, 7, 6, -12, -28, -36,
+    -49, -41, -13, -35, 4, -12, 9, 13, 9, 13, 4, -12, -13, -35, -49, -41,
+    -62, -55, -33, -40, -21, -41, -12, 9, -12, 9, -21, -41, -33, -40, -62, -55,
+    -141, -80, -74, -70, -59, -45, -58, -13, -58, -13, -59, -45, -74, -70, -141, -80,
+    # white bishop
+    -38, -45, 0, -24, -11, -29, -18, -9, -18, -9, -11, -29, 0, -24, -38, -45,
+    -13, -29, -11, -10, 4, -13, 0, 0, 0, 0, 4, -13, -11, -10, -13, -29,
+    -12, -12, 4, 0, 0, -1, 8, 8, 8, 8, 0, -1, 4, 0, -12, -12,
+    -9, -16, 23, -4, 17, 0, 25, 13, 25, 13, 17, 0, 23, -4, -9, -16,
+    -4, -13, 8, 0, 20, -11, 31, 12, 31, 12, 20, -11, 8, 0, -4, -13,
+    -5, -24, 16, 4, -4, 3, 13, 4, 13, 4, -4, 3, 16, 4, -5, -24,
+    -12, -25, 6, -16, 15, 0, 3, 0, 3, 0, 15, 0, 6, -16, -12, -25,
+    -42, -37, -4, -33, -6, -29, -18, -19, -18, -19, -6, -29, -4, -33, -42, -37,
+    # white rook
+    -13, -7, -15, -10, 0, -8, 7, -7, 7, -7, 0, -8, -15, -10, -13, -7,
+    -1, -9, 9, -7, 12, 0, 14, -1, 14, -1, 12, 0, 9, -7, -1, -9,
+    -17, 4, -1, -6, 4, -1, 9, -4, 9, -4, 4, -1, -1, -6, -17, 4,
+    -21, -4, -12, 0, -3, -7, 2, 5, 2, 5, -3, -7, -12, 0, -21, -4,
+    -10, -4, -4, 6, -3, 5, -4, -4, -4, -4, -3, 5, -4, 6, -10, -4,
+    -20, 4, -8, 0, 0, -5, 2, 8, 2, 8, 0, -5, -8, 0, -20, 4,
+    -16, 3, -10, 4, -6, 16, 4, -4, 4, -4, -6, 16, -10, 4, -16, 3,
+    -25, 14, -16, 0, -11, 15, -4, 10, -4, 10, -11, 15, -16, 0, -25, 14,
+    # white queen
+    -1, -55, -1, -45, 0, -37, -1, -20, -1, -20, 0, -37, -1, -45, -1, -55,
+    -4, -44, 4, -25, 8, -17, 6, -3, 6, -3, 8, -17, 4, -25, -4, -44,
+    -3, -31, 8, -14, 4, -7, 6, 2, 6, 2, 4, -7, 8, -14, -3, -31,
+    0, -18, 11, -2, 9, 10, 4, 19, 4, 19, 9, 10, 11, -2, 0, -18,
+    3, -23, 4, -4, 7, 7, 6, 16, 6, 16, 7, 7, 4, -4, 3, -23,
+    -2, -30, 4, -14, 10, -9, 5, 0, 5, 0, 10, -9, 4, -14, -2, -30,
+    -2, -40, 4, -21, 6, -19, 9, -6, 9, -6, 6, -19, 4, -21, -2, -40,
+    2, -60, -4, -41, -4, -34, 3, -29, 3, -29, -4, -34, -4, -41, 2, -60,
+    # white king
+    47, 0, 71, 36, 36, 68, 0, 61, 0, 61, 36, 68, 71, 36, 47, 0,
+    70, 42, 96, 80, 52, 107, 26, 108, 26, 108, 52, 107, 96, 80, 70, 42,
+    99, 70, 116, 104, 65, 136, 25, 141, 25, 141, 65, 136, 116, 104, 99, 70,
+    124, 83, 144, 125, 84, 138, 56, 138, 56, 138, 84, 138, 144, 125, 124, 83,
+    132, 77, 153, 133, 111, 160, 79, 160, 79, 160, 111, 160, 153, 133, 132, 77,
+    157, 74, 208, 138, 136, 148, 96, 154, 96, 154, 136, 148, 208, 138, 157, 74,
+    224, 37, 244, 97, 188, 93, 144, 105, 144, 105, 188, 93, 244, 97, 224, 37,
+    218, 8, 263, 47, 218, 58, 159, 62, 159, 62, 218, 58, 263, 47, 218, 8,
+)
+# fmt: on
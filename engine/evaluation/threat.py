@@ -1,117 +1,216 @@
 import chess
 
-
-def eval_threats_mg(board):
+from engine.evaluation.context import EvalContext
+
+# Hệ số (mg, eg) theo Stockfish, chia 1.24 như các thành phần khác
+HANGING = (56, 29)  # (69, 36)
+KING_THREAT = (19, 72)  # (24, 89)
+PAWN_PUSH_THREAT = (39, 31)  # (48, 39)
+SAFE_PAWN_THREAT = (139, 76)  # (173, 94)
+SLIDER_ON_QUEEN = (48, 15)  # (60, 18)
+KNIGHT_ON_QUEEN = (12, 9)  # (16, 11)
+RESTRICTED = (6, 6)  # (7, 7)
+WEAK_QUEEN_PROTECTION = (11, 0)  # (14, 0)
+
+# Theo loại quân bị đe dọa (chỉ số piece_type)
+MINOR_THREAT = (
+    (0, 0),
+    (4, 26),  # (5, 32)
+    (46, 33),  # (57, 41)
+    (62, 45),  # (77, 56)
+    (71, 96),  # (88, 119)
+    (63, 130),  # (79, 161)
+    (0, 0),
+)
+ROOK_THREAT = (
+    (0, 0),
+    (2, 37),  # (3, 46)
+    (29, 55),  # (37, 68)
+    (33, 48),  # (42, 60)
+    (0, 31),  # (0, 38)
+    (46, 33),  # (58, 41)
+    (0, 0),
+)
+
+
+def _pawn_attacks(color, pawns):
+    """Các ô bị tập tốt `pawns` của bên `color` tấn công."""
+    if color == chess.WHITE:
+        return chess.shift_up_left(pawns) | chess.shift_up_right(pawns)
+    return chess.shift_down_left(pawns) | chess.shift_down_right(pawns)
+
+
+def strongly_protected(ctx, color):
+    """Ô được tốt bên `color` bảo vệ, hoặc bị bên đó tấn công 2 lần mà đối phương thì không."""
+    them = not color
+    return ctx.attacks_by[color][chess.PAWN] | (ctx.attacks_2[color] & ~ctx.attacks_2[them])
+
+
+def weak_enemies(ctx, color):
+    """Quân đối phương bị bên `color` tấn công và không được bảo vệ chắc chắn."""
+    them = not color
+    return (
+        ctx.occupied_co[them]
+        & ~strongly_protected(ctx, them)
+        & ctx.attacks_all[color]
+    )
+
+
+def hanging(ctx, color, weak=None):
+    """Quân yếu không được bảo vệ, hoặc là quân (không phải tốt) bị tấn công 2 lần."""
+    them = not color
+    weak = weak_enemies(ctx, color) if weak is None else weak
+    non_pawns = ctx.occupied_co[them] & ~ctx.board.pawns
+    return weak & (~ctx.attacks_all[them] | (non_pawns & ctx.attacks_2[color]))
+
+
+def king_threat(ctx, color, weak=None) -> bool:
+    """Vua bên `color` tấn công một quân yếu của đối phương."""
+    weak = weak_enemies(ctx, color) if weak is None else weak
+    return bool(weak & ctx.attacks_by[color][chess.KING])
+
+
+def restricted(ctx, color):
+    """Ô đối phương tấn công nhưng bị bên `color` tranh chấp (hạn chế nước đi của chúng)."""
+    them = not color
+    return (
+        ctx.attacks_all[them]
+        & ~strongly_protected(ctx, them)
+        & ctx.attacks_all[color]
+    )
+
+
+def mobility_area(ctx, color):
     """
-    Tổng hợp đánh giá các loại đe dọa (threats) trong giai đoạn trung cuộc (middle game).
-    Đã scale theo hệ số Stockfish và chia 1.24.
+    Vùng di động theo Stockfish: bỏ tốt mình bị chặn hoặc còn ở hàng 2-3,
+    vua và hậu mình, quân mình bị ghim và các ô tốt địch tấn công.
+    (Khác mobility._mobility_area, vốn là ô đi hợp lệ dùng cho điểm mobility.)
     """
-    v = 0
-    v += 56 * hanging(board)  # 69 / 1.24 ≈ 56
-    v += 19 if king_threat(board) > 0 else 0  # 24 / 1.24 ≈ 19
-    """v += 39 * pawn_push_threat(board)  # 48 / 1.24 ≈ 39
-    v += 139 * threat_safe_pawn(board)  # 173 / 1.24 ≈ 139
-    v += 48 * slider_on_queen(board)  # 60 / 1.24 ≈ 48
-    v += 12 * knight_on_queen(board)  # 16 / 1.24 ≈ 12
-    v += 6 * restricted(board)  # 7 / 1.24 ≈ 6
-    v += 11 * weak_queen_protection(board)  # 14 / 1.24 ≈ 11
-    for square in chess.SQUARES:
-        v += [0, 4, 46, 62, 71, 63, 0][
-            minor_threat(board, square)
-        ]  # scaled từ [0,5,57,77,88,79,0]
-        v += [0, 2, 29, 33, 0, 46, 0][
-            rook_threat(board, square)
-        ]  # scaled từ [0,3,37,42,0,58,0]"""
-    return v
-
-
-def weak_enemies(board, piece, color, rank, file):
-    # 1) Phải là quân đối phương
-    if not piece or piece.color == color:
-        return 0
-
-    enemy = piece.color
-    # 2) Kiểm tra pawn địch bảo vệ (ô chéo liền dưới)
-    down = rank - 1 if enemy == chess.WHITE else rank + 1
-    for df in (-1, 1):
-        f2 = file + df
-        if 0 <= f2 < 8 and 0 <= down < 8:
-            p = board.piece_at(chess.square(f2, down))
-            if p and p.piece_type == chess.PAWN and p.color == enemy:
-                return 0
-
-    # 3) Ta tấn công nó?
-    sq = chess.square(file, rank)
-    our = len(board.attackers(color, sq))
-    if our == 0:
-        return 0
-
-    # 4) Nếu ta chỉ tấn công 1 lần thì địch không tấn công lại >1
-    opp = len(board.attackers(enemy, sq))
-    if our <= 1 and opp > 1:
-        return 0
-
-    return 1
-
-
-def hanging(board, piece, color, rank, file):
-    # 1) Phải là weak enemy
-    if not weak_enemies(board, piece, color, rank, file):
-        return 0
-
-    sq = chess.square(file, rank)
-    enemy = piece.color
-    # 2) Ta tấn công >1 lần và không phải pawn
-    our = len(board.attackers(color, sq))
-    if piece.piece_type != chess.PAWN and our > 1:
-        return 1
-    # 3) Hoặc địch không tấn công lại
-    opp = len(board.attackers(enemy, sq))
-    if opp == 0:
-        return 1
-    return 0
-
-
-def king_attack(board, piece, color, rank, file):
+    them = not color
+    board = ctx.board
+    if color == chess.WHITE:
+        low_ranks = chess.BB_RANK_2 | chess.BB_RANK_3
+        blocked = chess.shift_down(ctx.occupied)
+    else:
+        low_ranks = chess.BB_RANK_7 | chess.BB_RANK_6
+        blocked = chess.shift_up(ctx.occupied)
+    excluded = ctx.pawns[color] & (blocked | low_ranks)
+    excluded |= (board.kings | board.queens) & ctx.occupied_co[color]
+    excluded |= ctx.pinned[color] | ctx.attacks_by[them][chess.PAWN]
+    return chess.BB_ALL & ~excluded
+
+
+def _safe(ctx, color):
+    # Ô đối phương không tấn công, hoặc ta cũng tấn công
+    return ~ctx.attacks_all[not color] | ctx.attacks_all[color]
+
+
+def threat_safe_pawn(ctx, color):
+    """Quân (không phải tốt) đối phương bị tốt an toàn của bên `color` tấn công."""
+    them = not color
+    non_pawns = ctx.occupied_co[them] & ~ctx.board.pawns
+    return _pawn_attacks(color, ctx.pawns[color] & _safe(ctx, color)) & non_pawns
+
+
+def pawn_push_threat(ctx, color):
+    """Quân đối phương sẽ bị tấn công nếu tốt bên `color` tiến lên một ô an toàn."""
+    them = not color
+    empty = ~ctx.occupied & chess.BB_ALL
+    if color == chess.WHITE:
+        pushes = chess.shift_up(ctx.pawns[color]) & empty
+        pushes |= chess.shift_up(pushes & chess.BB_RANK_3) & empty
+    else:
+        pushes = chess.shift_down(ctx.pawns[color]) & empty
+        pushes |= chess.shift_down(pushes & chess.BB_RANK_6) & empty
+    pushes &= ~ctx.attacks_by[them][chess.PAWN] & _safe(ctx, color)
+    non_pawns = ctx.occupied_co[them] & ~ctx.board.pawns
+    return _pawn_attacks(color, pushes) & non_pawns
+
+
+def queen_threats(ctx, color):
     """
-    1 nếu vua bên 'color' nằm sát cạnh ô (file,rank) (8 ô xung quanh), ngược lại 0.
+    (knight_on_queen, slider_on_queen): số ô an toàn mà mã / tượng, xe bên `color`
+    có thể tới để tấn công hậu duy nhất của đối phương ở nước sau
+    (nhân đôi khi chỉ còn đúng 1 hậu trên bàn).
     """
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            x = file + dx
-            y = rank + dy
-            if 0 <= x < 8 and 0 <= y < 8:
-                p = board.piece_at(chess.square(x, y))
-                if p and p.piece_type == chess.KING and p.color == color:
-                    return 1
-    return 0
-
-
-def king_threat(board, piece, color, rank, file):
+    them = not color
+    board = ctx.board
+    queens = board.queens & ctx.occupied_co[them]
+    if not queens or queens & (queens - 1):
+        return 0, 0
+    square = chess.lsb(queens)
+    imbalance = 2 if board.queens == queens else 1
+    # Như Stockfish: vùng di động, bỏ ô tốt mình và ô đối phương bảo vệ chắc chắn
+    safe = mobility_area(ctx, color) & ~ctx.pawns[color]
+    safe &= ~strongly_protected(ctx, them)
+
+    knight = ctx.attacks_by[color][chess.KNIGHT] & chess.BB_KNIGHT_ATTACKS[square]
+    occupied = ctx.occupied
+    diagonal = chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+    straight = (
+        chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+        | chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]
+    )
+    slider = (ctx.attacks_by[color][chess.BISHOP] & diagonal) | (
+        ctx.attacks_by[color][chess.ROOK] & straight
+    )
+    return (
+        chess.popcount(knight & safe) * imbalance,
+        chess.popcount(slider & safe & ctx.attacks_2[color]) * imbalance,
+    )
+
+
+def threats_side(ctx, color):
+    """(mg, eg) các đe dọa của bên `color` lên quân đối phương, chưa đổi dấu."""
+    them = not color
+    board = ctx.board
+    mg = 0
+    eg = 0
+
+    def add(weight, count=1):
+        nonlocal mg, eg
+        mg += weight[0] * count
+        eg += weight[1] * count
+
+    non_pawns = ctx.occupied_co[them] & ~board.pawns
+    defended = non_pawns & strongly_protected(ctx, them)
+    weak = weak_enemies(ctx, color)
+    if defended | weak:
+        minors = ctx.attacks_by[color][chess.KNIGHT] | ctx.attacks_by[color][chess.BISHOP]
+        for square in chess.scan_forward((defended | weak) & minors):
+            add(MINOR_THREAT[board.piece_type_at(square)])
+        for square in chess.scan_forward(weak & ctx.attacks_by[color][chess.ROOK]):
+            add(ROOK_THREAT[board.piece_type_at(square)])
+        if king_threat(ctx, color, weak):
+            add(KING_THREAT)
+        add(HANGING, chess.popcount(hanging(ctx, color, weak)))
+        # Quân yếu chỉ còn hậu bảo vệ
+        add(WEAK_QUEEN_PROTECTION, chess.popcount(weak & ctx.attacks_by[them][chess.QUEEN]))
+
+    add(RESTRICTED, chess.popcount(restricted(ctx, color)))
+    add(SAFE_PAWN_THREAT, chess.popcount(threat_safe_pawn(ctx, color)))
+    add(PAWN_PUSH_THREAT, chess.popcount(pawn_push_threat(ctx, color)))
+    knight_on_queen, slider_on_queen = queen_threats(ctx, color)
+    add(KNIGHT_ON_QUEEN, knight_on_queen)
+    add(SLIDER_ON_QUEEN, slider_on_queen)
+    return mg, eg
+
+
+def eval_threats_pair(board, ctx=None):
     """
-    1 nếu quân địch ở (file,rank):
-    - Là pawn/knight/bishop/rook/queen
-    - weak_enemies == 1
-    - và king_attack == 1
-    Ngược lại 0.
+    Đánh giá đe dọa (hanging, king threat, pawn push, safe pawn, slider/knight
+    on queen, restricted, minor/rook threat) từ bitboard tấn công của EvalContext,
+    một lượt cho cả hai bên. Trả về (mg, eg): trắng dương, đen âm.
     """
-    # 1) Chỉ xét đối phương và lọc loại
-    if (
-        not piece
-        or piece.color == color
-        or piece.piece_type
-        not in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
-    ):
-        return 0
-
-    # 2) Phải weak_enemies
-    if not weak_enemies(board, piece, color, rank, file):
-        return 0
-
-    # 3) Phải có king_attack
-    if not king_attack(board, piece, color, rank, file):
-        return 0
-
-    return 1
+    ctx = EvalContext(board) if ctx is None else ctx
+    white_mg, white_eg = threats_side(ctx, chess.WHITE)
+    black_mg, black_eg = threats_side(ctx, chess.BLACK)
+    return white_mg - black_mg, white_eg - black_eg
+
+
+def eval_threats_mg(board, ctx=None):
+    return eval_threats_pair(board, ctx)[0]
+
+
+def eval_threats_eg(board, ctx=None):
+    return eval_threats_pair(board, ctx)[1]
@@ -0,0 +1,171 @@
+import chess
+
+try:
+    import numpy as np
+except ImportError:  # numpy là tuỳ chọn, chỉ cần cho đánh giá hàng loạt
+    np = None
+
+from engine.evaluation.imbalance import (
+    IMBALANCE_BISHOP_PAIR,
+    IMBALANCE_KNIGHT_PAIR,
+    IMBALANCE_KNIGHT_VS_BISHOP,
+    IMBALANCE_QUEEN_VS_ROOK_PAIR,
+    IMBALANCE_ROOK_VS_MINOR,
+)
+from engine.evaluation.material import PIECE_VALUES_EG, PIECE_VALUES_MG
+from engine.evaluation.psqt import PSQT, psqt_index
+from engine.evaluation_engine import EG_LIMIT, MG_LIMIT, NON_PAWN_VALUES
+
+# Các thành phần của EVAL_TERMS được tính ở đây cho cả lô
+VECTOR_TERMS = ("material", "psqt", "imbalance")
+
+# Mã quân trong mảng (N, 64): 0 = ô trống, 1..6 quân trắng, 7..12 quân đen
+# (piece_type + 6 nếu là đen); trục 12 của (N, 12, 64) là mã - 1.
+PIECE_CODES = 13
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("engine.evaluation.vectorized cần numpy (pip install numpy)")
+
+
+def _tables():
+    # Bảng theo mã quân, lấy từ PSQT (quân đen đã lật ô và đổi dấu) → chỉ cần cộng
+    material_mg = np.zeros(PIECE_CODES, dtype=np.int64)
+    material_eg = np.zeros(PIECE_CODES, dtype=np.int64)
+    psqt_mg = np.zeros((PIECE_CODES, 64), dtype=np.int64)
+    psqt_eg = np.zeros((PIECE_CODES, 64), dtype=np.int64)
+    npm = np.zeros(PIECE_CODES, dtype=np.int64)
+    packed = np.array(PSQT, dtype=np.int64)
+
+    for piece_type in chess.PIECE_TYPES:
+        for code, sign, color in (
+            (piece_type, 1, chess.WHITE),
+            (piece_type + 6, -1, chess.BLACK),
+        ):
+            start = psqt_index(color, piece_type, 0)
+            material_mg[code] = sign * PIECE_VALUES_MG[piece_type]
+            material_eg[code] = sign * PIECE_VALUES_EG[piece_type]
+            psqt_mg[code] = packed[start : start + 128 : 2]
+            psqt_eg[code] = packed[start + 1 : start + 128 : 2]
+            npm[code] = NON_PAWN_VALUES.get(piece_type, 0)
+    return material_mg, material_eg, psqt_mg, psqt_eg, npm
+
+
+# Dựng lần đầu cần tới (numpy có thể không được cài)
+_TABLES = None
+
+
+def _get_tables():
+    global _TABLES
+    if _TABLES is None:
+        _require_numpy()
+        _TABLES = _tables()
+    return _TABLES
+
+
+def encode_planes(boards):
+    """Lô bàn cờ → mảng bool (N, 12, 64): mặt phẳng (màu, loại quân) × ô."""
+    _require_numpy()
+    masks = np.array(
+        [
+            [
+                board.pieces_mask(piece_type, color)
+                for color in (chess.WHITE, chess.BLACK)
+                for piece_type in chess.PIECE_TYPES
+            ]
+            for board in boards
+        ],
+        dtype=np.uint64,
+    ).reshape(-1, 12)
+    bits = np.unpackbits(masks.astype("<u8").view(np.uint8), bitorder="little")
+    return bits.reshape(len(masks), 12, 64).astype(bool)
+
+
+def encode_boards(boards):
+    """Lô bàn cờ → mảng int8 (N, 64) mã quân trên từng ô (xem PIECE_CODES)."""
+    planes = encode_planes(boards)
+    codes = np.arange(1, PIECE_CODES, dtype=np.int8)
+    return (planes * codes[None, :, None]).sum(axis=1, dtype=np.int8)
+
+
+def piece_counts(pieces):
+    """(N, 64) mã quân → (N, 13) số quân của từng mã."""
+    return (pieces[:, :, None] == np.arange(PIECE_CODES)).sum(axis=1)
+
+
+def material(pieces):
+    """(mg, eg) như eval_material, mỗi phần là mảng (N,)."""
+    material_mg, material_eg = _get_tables()[:2]
+    return material_mg[pieces].sum(axis=1), material_eg[pieces].sum(axis=1)
+
+
+def psqt(pieces):
+    """(mg, eg) như eval_psqt, mỗi phần là mảng (N,)."""
+    psqt_mg, psqt_eg = _get_tables()[2:4]
+    squares = np.arange(64)
+    return psqt_mg[pieces, squares].sum(axis=1), psqt_eg[pieces, squares].sum(axis=1)
+
+
+def imbalance(counts):
+    """Như imbalance_from_counts trên (N, 13) số quân, trả về mảng (N,)."""
+    white = {pt: counts[:, pt] for pt in chess.PIECE_TYPES}
+    black = {pt: counts[:, pt + 6] for pt in chess.PIECE_TYPES}
+    white_minor = white[chess.KNIGHT] + white[chess.BISHOP]
+    black_minor = black[chess.KNIGHT] + black[chess.BISHOP]
+
+    score = np.zeros(len(counts), dtype=np.int64)
+    score += IMBALANCE_BISHOP_PAIR * (white[chess.BISHOP] >= 2)
+    score -= IMBALANCE_BISHOP_PAIR * (black[chess.BISHOP] >= 2)
+    score += IMBALANCE_KNIGHT_PAIR * (white[chess.KNIGHT] >= 2)
+    score -= IMBALANCE_KNIGHT_PAIR * (black[chess.KNIGHT] >= 2)
+    score += IMBALANCE_KNIGHT_VS_BISHOP * (
+        (white[chess.KNIGHT] > black[chess.KNIGHT])
+        & (black[chess.BISHOP] > white[chess.BISHOP])
+    )
+    score -= IMBALANCE_KNIGHT_VS_BISHOP * (
+        (black[chess.KNIGHT] > white[chess.KNIGHT])
+        & (white[chess.BISHOP] > black[chess.BISHOP])
+    )
+    score += IMBALANCE_ROOK_VS_MINOR * (
+        (white[chess.ROOK] > black[chess.ROOK]) & (black_minor > white_minor)
+    )
+    score -= IMBALANCE_ROOK_VS_MINOR * (
+        (black[chess.ROOK] > white[chess.ROOK]) & (white_minor > black_minor)
+    )
+    score += IMBALANCE_QUEEN_VS_ROOK_PAIR * (
+        (white[chess.QUEEN] > black[chess.QUEEN]) & (black[chess.ROOK] >= 2)
+    )
+    score -= IMBALANCE_QUEEN_VS_ROOK_PAIR * (
+        (black[chess.QUEEN] > white[chess.QUEEN]) & (white[chess.ROOK] >= 2)
+    )
+    return score
+
+
+def phase(counts):
+    """Như find_phase trên (N, 13) số quân: 0 (endgame) → 128 (middle game)."""
+    npm = 2 * (counts * _get_tables()[4]).sum(axis=1)  # find_phase cộng cả bàn lật
+    npm = np.clip(npm, EG_LIMIT, MG_LIMIT)
+    return ((npm - EG_LIMIT) * 128) // (MG_LIMIT - EG_LIMIT)
+
+
+def blend(mg, eg, phase):
+    """(mg * phase + eg * (128 - phase)) // 128 như evaluate_board."""
+    return (mg * phase + eg * (128 - phase)) // 128
+
+
+def evaluate_terms(boards):
+    """
+    Material, psqt, imbalance và phase cho cả lô trong vài phép NumPy.
+    Trả về (phase, {tên: (mg, eg)}) như eval_terms nhưng mỗi giá trị là mảng (N,),
+    chỉ gồm các thành phần trong VECTOR_TERMS.
+    """
+    pieces = encode_boards(boards)
+    counts = piece_counts(pieces)
+    imbalance_score = imbalance(counts)
+    terms = {
+        "material": material(pieces),
+        "psqt": psqt(pieces),
+        "imbalance": (imbalance_score, imbalance_score),
+    }
+    return phase(counts), terms
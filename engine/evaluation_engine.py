@@ -1,77 +1,195 @@
 import chess
+from engine.evaluation.context import EvalContext
 from engine.evaluation.material import eval_material
-from engine.evaluation.psqt import eval_psqt
+from engine.evaluation.psqt import eval_psqt, eval_psqt_pair
 from engine.evaluation.imbalance import eval_imbalance
-from engine.evaluation.pawns import eval_pawns
-from engine.evaluation.mobility import eval_mobility
-from engine.evaluation.king import eval_king_safety_mg, eval_king_safety_eg
-from engine.evaluation.pieces import eval_pieces
+from engine.evaluation.pawn_hash import PAWN_TABLE, pawn_key
+from engine.evaluation.mobility import eval_mobility_pair
+from engine.evaluation.king import eval_king_safety_pair
+from engine.evaluation.pieces import eval_pieces_pair
+from engine.evaluation.threat import eval_threats_pair
 
 # === HÀM CHÍNH ===
 
 
-def evaluate_board(board):
+def evaluate_board(board, inc=None, terminal=True):
+    score = terminal_score(board) if terminal else insufficient_score(board)
+    if score is not None:
+        return score
+    """
+    Hàm đánh giá tổng cho bàn cờ.
+    Trả về điểm số, dương có lợi cho trắng, âm có lợi cho đen.
+    inc: IncrementalEval đang theo dõi board (trong search) → material, psqt,
+    imbalance và phase lấy O(1) thay vì quét lại bàn cờ.
+    terminal=False: nơi gọi (search) đã tự xử lý chiếu hết / hết nước đi
+    từ chính bước sinh nước của nút → không sinh nước đi lần nữa ở đây.
+    """
+    # 1. Tính phase và điểm (mg, eg) của từng thành phần trong một lượt
+    phase, terms = eval_terms(board, inc)
+
+    # 2. Cộng điểm middle game và end game riêng, blend theo phase
+    return blend_terms(phase, terms)
+
+
+def blend_terms(phase, terms):
+    """Cộng (mg, eg) của các thành phần rồi blend theo phase."""
+    mg_score = 0
+    eg_score = 0
+    for mg, eg in terms.values():
+        mg_score += mg
+        eg_score += eg
+
+    blended_score = (mg_score * phase + eg_score * (128 - phase)) // 128
+
+    return blended_score
+
+
+def terminal_score(board):
+    """Điểm của thế cờ đã kết thúc (chiếu hết, hết nước, thiếu quân), không thì None."""
     if board.is_checkmate():
         return -9999 if board.turn else 9999
-    if board.is_stalemate() or board.is_insufficient_material():
+    if board.is_stalemate():
         return 0  # Hòa cờ
+    return insufficient_score(board)
+
+
+def insufficient_score(board):
+    """0 nếu không bên nào đủ quân chiếu hết (chỉ đếm bitboard), không thì None."""
+    return 0 if board.is_insufficient_material() else None
+
+
+def eval_terms(board, inc=None, ctx=None):
     """
-    Hàm đánh giá tổng cho bàn cờ.
-    Trả về điểm số, dương có lợi cho trắng, âm có lợi cho đen.
+    Tính phase và điểm (mg, eg) của từng thành phần đánh giá.
+    - ctx: EvalContext (bản đồ tấn công, tốt, vùng vua, quân bị ghim),
+      dựng 1 lần rồi dùng chung cho mọi thành phần
+    - inc: IncrementalEval → material, psqt, imbalance, phase, khoá tốt lấy O(1)
+    - điểm tốt và dữ liệu cấu trúc tốt (ctx.pawn) lấy từ PAWN_TABLE
+    Đang bật profiler (set_profiler) thì đo thời gian từng thành phần.
+    Trả về (phase, {tên: (mg, eg)}).
     """
-    # 1. Tính phase (giai đoạn cờ)
-    phase = find_phase(board)  # 0.0 (endgame) -> 1.0 (middle game)
-
-    # 2. Tính điểm middle game và end game riêng
-    mg_score = (
-        eval_material(board, phase="mg")
-        + eval_psqt(board, phase="mg")
-        + eval_imbalance(board)
-        + eval_pawns(board, phase="mg")
-        + eval_pieces(board, phase="mg")
-        + eval_mobility(board, phase="mg")
-        ##+ eval_threats(board, phase="mg")
-        + eval_king_safety_mg(board)
-    )  # chỉ MG mới có
-
-    eg_score = (
-        eval_material(board, phase="eg")
-        + eval_psqt(board, phase="eg")
-        + eval_imbalance(board)
-        + eval_pawns(board, phase="eg")
-        + eval_pieces(board, phase="eg")
-        + eval_mobility(board, phase="eg")
-        ##+ eval_threats(board, phase="eg")
-        + eval_king_safety_eg(board)
-    )
+    profiler = _profiler
+    if profiler is not None:
+        ctx = profiler.time_term("context", _context, board, ctx)
+        phase = profiler.time_term("phase", _phase, board, inc)
+        terms = {
+            name: profiler.time_term(name, term, board, inc, ctx)
+            for name, term in EVAL_TERMS
+        }
+        return phase, terms
+
+    ctx = _context(board, ctx)
+    phase = _phase(board, inc)
+    terms = {name: term(board, inc, ctx) for name, term in EVAL_TERMS}
     # Endgame không có Space
+    return phase, terms
 
-    # 3. Blend middle game và end game theo phase
-    blended_score = int(mg_score * phase + eg_score * (1 - phase))
 
-    return blended_score
+# Bộ đo thời gian thành phần (engine.profiling.SearchProfile), None = tắt
+_profiler = None
+
+
+def set_profiler(profiler):
+    """Bật (profiler có time_term) hoặc tắt (None) việc đo thời gian eval_terms."""
+    global _profiler
+    _profiler = profiler
+
+
+def _context(board, ctx):
+    return EvalContext(board) if ctx is None else ctx
+
+
+def _phase(board, inc):
+    # 0 (endgame) -> 128 (middle game)
+    return inc.phase() if inc is not None else find_phase(board)
 
 
-def non_pawn_material(board) -> int:
-    piece_values = {
-        chess.KNIGHT: 325,
-        chess.BISHOP: 325,
-        chess.ROOK: 550,
-        chess.QUEEN: 1000,
-    }
+# === Các thành phần: (board, inc, ctx) -> (mg, eg) ===
+
+
+def _material(board, inc, ctx):
+    if inc is not None:
+        return inc.material("mg"), inc.material("eg")
+    return eval_material(board, phase="mg"), eval_material(board, phase="eg")
+
+
+def _psqt(board, inc, ctx):
+    if inc is not None:
+        return inc.psqt("mg"), inc.psqt("eg")
+    return eval_psqt_pair(board)
+
+
+def _imbalance(board, inc, ctx):
+    imbalance = inc.imbalance() if inc is not None else eval_imbalance(board)
+    return imbalance, imbalance
+
+
+def _pawns(board, inc, ctx):
+    # Tra bảng băm tốt 1 lần; ctx.pawn dùng lại cho outpost / rook_on_file
+    if ctx.pawn is None:
+        key = inc.pawn_key if inc is not None else pawn_key(board)
+        ctx.pawn = PAWN_TABLE.probe(board, key)
+    return ctx.pawn.mg, ctx.pawn.eg
+
+
+def _pieces(board, inc, ctx):
+    return eval_pieces_pair(board, ctx)
+
+
+def _mobility(board, inc, ctx):
+    return eval_mobility_pair(board, ctx)
+
+
+def _threats(board, inc, ctx):
+    return eval_threats_pair(board, ctx)
+
+
+def _king_safety(board, inc, ctx):
+    return eval_king_safety_pair(board, ctx)
+
+
+# Thứ tự có ý nghĩa: pawns điền ctx.pawn trước khi pieces dùng tới
+EVAL_TERMS = (
+    ("material", _material),
+    ("psqt", _psqt),
+    ("imbalance", _imbalance),
+    ("pawns", _pawns),
+    ("pieces", _pieces),
+    ("mobility", _mobility),
+    ("threats", _threats),
+    ("king_safety", _king_safety),
+)
+
+
+# Giá trị quân (không tính tốt) dùng để xác định phase
+NON_PAWN_VALUES = {
+    chess.KNIGHT: 325,
+    chess.BISHOP: 325,
+    chess.ROOK: 550,
+    chess.QUEEN: 1000,
+}
+MG_LIMIT = 15258
+EG_LIMIT = 3915
+
+
+def non_pawn_material(board, color=None) -> int:
+    """Tổng giá trị quân không phải tốt của bên `color` (None = cả hai bên)."""
+    occupied = board.occupied if color is None else board.occupied_co[color]
     total = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type in piece_values:
-            total += piece_values[piece.piece_type]
+    for piece_type, value in NON_PAWN_VALUES.items():
+        pieces = board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(
+            piece_type, chess.BLACK
+        )
+        total += value * chess.popcount(pieces & occupied)
     return total
 
 
 def find_phase(board) -> int:
-    MG_LIMIT = 15258
-    EG_LIMIT = 3915
-
     npm = non_pawn_material(board) + non_pawn_material(board.mirror())  # cả hai bên
+    return phase_from_npm(npm)
+
+
+def phase_from_npm(npm) -> int:
     npm = max(EG_LIMIT, min(npm, MG_LIMIT))
 
     phase128 = ((npm - EG_LIMIT) * 128) // (MG_LIMIT - EG_LIMIT)
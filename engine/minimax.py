@@ -1,63 +1,738 @@
-from engine.evaluation_engine import evaluate_board
+import time
+from collections import namedtuple
 
+import chess
 
-def alphabeta(board, depth, alpha, beta, maximizing_player, ai_color):
+from engine.eval_cache import EvalCache
+from engine.evaluation.incremental import IncrementalEval
+from engine.evaluation.pawn_hash import PAWN_TABLE
+from engine.evaluation_engine import evaluate_board, non_pawn_material, set_profiler
+from engine.evaluation.material import PIECE_VALUES_EG
+from engine.move_ordering import MAX_PLY, MoveOrdering
+from engine.see import see_ge
+from engine.transposition import (
+    EXACT,
+    LOWER,
+    UPPER,
+    TranspositionTable,
+    position_key,
+)
+
+# Bảng chuyển vị mặc định, dùng chung giữa các lần gọi get_best_move
+TT = TranspositionTable(size_mb=16)
+# Cache điểm đánh giá mặc định, cũng dùng chung giữa các lần gọi
+EVAL_CACHE = EvalCache(size_mb=16)
+# Sách khai cuộc mặc định cho get_best_move (engine.book.PolyglotBook), None = không dùng
+BOOK = None
+
+MAX_DEPTH = 64
+
+# Điểm chiếu hết: MATE_SCORE - ply, luôn lớn hơn mọi điểm đánh giá tĩnh
+INFINITE = 1_000_000
+MATE_SCORE = 100_000
+MATE_BOUND = MATE_SCORE - MAX_PLY
+
+# Quiescence: giới hạn số ply ăn quân liên tiếp và biên delta pruning
+QS_MAX_PLY = 16
+DELTA_MARGIN = 200
+
+# Aspiration window quanh điểm của vòng trước
+ASPIRATION_WINDOW = 50
+ASPIRATION_MIN_DEPTH = 3
+
+# Các kiểu cắt tỉa, bật/tắt riêng qua SearchState(pruning=...)
+PRUNING = ("null_move", "lmr", "futility", "reverse_futility")
+# Null move: bỏ lượt, tìm nông hơn R ply; đủ >= beta thì cắt luôn
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+# Late move reductions: nước yên lặng xếp sau được tìm nông hơn 1-2 ply
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+# Futility gần lá: điểm tĩnh + biên vẫn <= alpha thì bỏ nước yên lặng
+FUTILITY_MARGINS = (0, 150, 300)
+# Reverse futility: điểm tĩnh - biên * depth vẫn >= beta thì trả về luôn
+REVERSE_FUTILITY_MARGIN = 120
+REVERSE_FUTILITY_DEPTH = 3
+
+# Thống kê cutoff theo thứ tự nước: 0..6, ô cuối gộp các nước từ thứ 7 trở đi
+CUTOFF_INDEX_BUCKETS = 8
+
+SearchResult = namedtuple("SearchResult", "best_move score depth pv nodes")
+
+
+class SearchTimeout(Exception):
+    """Hết thời gian cho phép, dừng tìm kiếm ngay lập tức."""
+
+
+class SearchState:
+    """
+    Trạng thái dùng chung cho một lần tìm kiếm:
+    - tt: bảng chuyển vị
+    - deadline: mốc time.monotonic() phải dừng (None = không giới hạn)
+    - nodes, qnodes: số nút đã duyệt trong negamax / quiescence
+    - ordering: killer/history để sắp xếp nước đi (use_ordering=False → thứ tự sinh)
+    - cutoffs, first_move_cutoffs: số lần beta cutoff, và số lần cắt ngay nước đầu
+    - researches: số lần PVS / aspiration phải tìm lại với cửa sổ rộng hơn
+    - pv: bảng PV tam giác, pv[ply] là biến chính tính từ ply đó
+    - inc: IncrementalEval cập nhật theo push/pop (material, psqt, phase, khoá O(1))
+    - keys: khoá Zobrist của lịch sử ván (từ nước không hoàn tác được gần nhất)
+      + đường đi hiện tại, keys[-1] là khoá nút đang xét (để bắt lặp lại thế cờ);
+      keys[root_index] là gốc, null_moves: vị trí trong keys sau mỗi null move
+    - eval_cache: EvalCache cho điểm tĩnh
+    - stop: bộ đệm dùng chung giữa các tiến trình (Lazy SMP), stop[0] != 0 → dừng
+    - pruning: các kiểu cắt tỉa được bật (tập con của PRUNING, hoặc True / False)
+    - null_cutoffs, reductions, futility_prunes: đếm số lần mỗi kiểu cắt tỉa có tác dụng
+    - cutoffs_by_index: số beta cutoff theo thứ tự nước gây cắt (ô cuối gộp mọi nước sau)
+    - iterations: (depth, nodes, giây) của từng vòng sâu dần đã xong
+    - info: hàm info(SearchResult, giây) gọi sau mỗi vòng sâu dần (UCI in "info ...")
     """
-    Thuần Alpha-Beta Pruning:
+
+    def __init__(
+        self,
+        tt=None,
+        deadline=None,
+        use_ordering=True,
+        eval_cache=None,
+        stop=None,
+        pruning=PRUNING,
+        info=None,
+    ):
+        self.tt = TT if tt is None else tt
+        self.info = info
+        # pruning=True / False: bật / tắt mọi kiểu cắt tỉa
+        pruning = PRUNING if pruning is True else pruning or ()
+        self.null_move = "null_move" in pruning
+        self.lmr = "lmr" in pruning
+        self.futility = "futility" in pruning
+        self.reverse_futility = "reverse_futility" in pruning
+        self.stop = stop
+        self.eval_cache = EVAL_CACHE if eval_cache is None else eval_cache
+        self.deadline = deadline
+        self.use_ordering = use_ordering
+        self.ordering = MoveOrdering()
+        self.pv = [[] for _ in range(MAX_PLY + 1)]
+        self.inc = IncrementalEval()
+        self.keys = []
+        self.root_key = None
+        self.root_index = 0
+        self.history = []
+        self.null_moves = []
+        self.nodes = 0
+        self.qnodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.researches = 0
+        self.null_cutoffs = 0
+        self.reductions = 0
+        self.futility_prunes = 0
+        self.cutoffs_by_index = [0] * CUTOFF_INDEX_BUCKETS
+        self.iterations = []
+        self.start_time = time.monotonic()
+        self.tt_start = (self.tt.hits, self.tt.misses + self.tt.collisions)
+
+    def check_time(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SearchTimeout
+        if self.stop is not None and self.stop[0]:
+            raise SearchTimeout
+
+    def reset(self, board):
+        """Bắt đầu từ gốc: đặt lại inc và ngăn xếp khoá (kèm lịch sử ván)."""
+        self.inc.reset(board)
+        key = self.inc.key(board)
+        if key != self.root_key:
+            # Chỉ các thế cờ từ nước ăn quân / đi tốt gần nhất mới có thể lặp lại
+            past = board.copy(stack=min(board.halfmove_clock, len(board.move_stack)))
+            history = []
+            while past.move_stack:
+                past.pop()
+                history.append(position_key(past))
+            history.reverse()
+            self.root_key, self.history = key, history
+        self.keys = self.history + [key]
+        self.root_index = len(self.history)
+        self.null_moves = []
+
+    def push(self, board, move):
+        self.inc.push(board, move)
+        if not move:
+            self.null_moves.append(len(self.keys))
+        self.keys.append(self.inc.key(board))
+
+    def pop(self, board):
+        self.inc.pop(board)
+        self.keys.pop()
+        if self.null_moves and self.null_moves[-1] == len(self.keys):
+            self.null_moves.pop()
+
+    def evaluate(self, board):
+        # Chiếu hết / hết nước đi do negamax / quiescence tự xử lý
+        return static_eval(
+            board, self.inc, self.eval_cache, self.keys[-1], terminal=False
+        )
+
+    def is_repetition(self, board) -> bool:
+        """
+        Thế cờ lặp lại, tính là hòa khi:
+        - lặp lại 1 lần với một thế cờ từ gốc trở đi (trong cây tìm kiếm
+          đối phương luôn có thể lặp tiếp, nên cắt luôn nhánh này)
+        - hoặc đã xuất hiện 2 lần trong lịch sử ván (lặp lại lần thứ 3)
+        Chỉ duyệt ngược các thế cờ cùng bên đi, tới nước không hoàn tác được
+        (ăn quân / đi tốt) hoặc null move gần nhất: O(halfmove_clock).
+        """
+        keys = self.keys
+        last = len(keys) - 1
+        stop = last - board.halfmove_clock
+        if self.null_moves:
+            stop = max(stop, self.null_moves[-1])
+        key = keys[last]
+        seen = 0
+        for index in range(last - 4, max(stop, 0) - 1, -2):
+            if keys[index] == key:
+                if index >= self.root_index:
+                    return True
+                seen += 1
+                if seen >= 2:
+                    return True
+        return False
+
+    def is_draw(self, board) -> bool:
+        """
+        Hòa không cần sinh nước đi: luật 50 nước, không đủ quân chiếu hết,
+        hoặc lặp lại (is_repetition, tra ngăn xếp khoá thay vì chạy lại move_stack).
+        """
+        if board.halfmove_clock >= 100:
+            # Nước thứ 100 mà chiếu hết thì vẫn là chiếu hết
+            return not board.is_check() or any(board.generate_legal_moves())
+        if board.is_insufficient_material():
+            return True
+        return board.halfmove_clock >= 4 and self.is_repetition(board)
+
+    def moves(self, board, ply=0, hash_move=None):
+        """Nước đi của nút hiện tại, đã sắp xếp nếu bật use_ordering."""
+        if not self.use_ordering:
+            return board.legal_moves
+        return self.ordering.ordered_moves(board, ply, hash_move)
+
+    def on_cutoff(self, board, move, ply, depth, move_index):
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        self.cutoffs_by_index[min(move_index, CUTOFF_INDEX_BUCKETS - 1)] += 1
+        if self.use_ordering:
+            self.ordering.on_cutoff(board, move, ply, depth)
+
+    def update_pv(self, ply, move):
+        if ply < MAX_PLY:
+            self.pv[ply] = [move] + self.pv[ply + 1]
+
+    def branching_factor(self) -> float:
+        """Branching factor hiệu dụng: số nút vòng cuối / số nút vòng trước."""
+        if len(self.iterations) < 2 or not self.iterations[-2][1]:
+            return 0.0
+        return self.iterations[-1][1] / self.iterations[-2][1]
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.start_time
+        total = self.nodes + self.qnodes
+        tt_hits = self.tt.hits - self.tt_start[0]
+        tt_probes = tt_hits + self.tt.misses + self.tt.collisions - self.tt_start[1]
+        return {
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "time": elapsed,
+            "nps": total / elapsed if elapsed > 0 else 0.0,
+            "tt_hits": tt_hits,
+            "tt_hit_rate": tt_hits / tt_probes if tt_probes else 0.0,
+            "cutoffs": self.cutoffs,
+            "cutoffs_by_index": list(self.cutoffs_by_index),
+            "branching_factor": self.branching_factor(),
+            "iterations": [
+                {"depth": depth, "nodes": nodes, "time": seconds}
+                for depth, nodes, seconds in self.iterations
+            ],
+            "first_move_cutoff_rate": (
+                self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+            ),
+            "researches": self.researches,
+            "null_cutoffs": self.null_cutoffs,
+            "reductions": self.reductions,
+            "futility_prunes": self.futility_prunes,
+            "pawn_hash_hit_rate": PAWN_TABLE.stats()["hit_rate"],
+            "eval_cache_hit_rate": self.eval_cache.stats()["hit_rate"],
+        }
+
+
+def allocate_time(time_left, increment=0.0, moves_to_go=None):
+    """
+    Chia thời gian cho một nước đi từ đồng hồ còn lại (giây) + increment.
+    Mặc định coi như còn 30 nước, không bao giờ dùng quá nửa đồng hồ.
+    """
+    moves = moves_to_go or 30
+    budget = time_left / moves + increment * 0.75
+    return max(0.01, min(budget, time_left * 0.5))
+
+
+def static_eval(board, inc=None, cache=None, key=None, terminal=True):
+    """
+    Điểm tĩnh theo góc nhìn bên đang đi (evaluate_board luôn dương cho trắng).
+    cache: EvalCache, tra theo khoá Zobrist (key, mặc định tự tính) trước khi
+    gọi evaluate_board. terminal: chuyển cho evaluate_board.
+    """
+    if cache is None:
+        score = evaluate_board(board, inc, terminal)
+    else:
+        if key is None:
+            key = inc.key(board) if inc is not None else position_key(board)
+        score = cache.get(key)
+        if score is None:
+            score = evaluate_board(board, inc, terminal)
+            cache.put(key, score)
+    return score if board.turn == chess.WHITE else -score
+
+
+def score_to_tt(score, ply):
+    """Điểm chiếu hết lưu vào TT tính từ nút hiện tại, không phụ thuộc ply."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def _capture_gain(board, move):
+    """Giá trị vật chất tối đa một nước ăn/phong cấp có thể mang lại."""
+    if board.is_en_passant(move):
+        gain = PIECE_VALUES_EG[chess.PAWN]
+    else:
+        victim = board.piece_type_at(move.to_square)
+        gain = PIECE_VALUES_EG[victim] if victim else 0
+    if move.promotion:
+        gain += PIECE_VALUES_EG[move.promotion] - PIECE_VALUES_EG[chess.PAWN]
+    return gain
+
+
+def quiescence(board, alpha, beta, state, ply, qply=0):
+    """
+    Tìm kiếm tĩnh ở nút lá: chỉ xét nước ăn quân và phong hậu
+    cho tới khi thế cờ "yên" để tránh hiệu ứng chân trời.
+    - stand pat: bên đang đi có thể dừng lại với điểm tĩnh
+    - delta pruning: bỏ nước ăn không thể kéo điểm lên tới alpha
+    - bỏ nước ăn lỗ (SEE < 0)
+    - đang bị chiếu: xét mọi nước thoát chiếu, không stand pat
+    - qply >= QS_MAX_PLY: trả về điểm tĩnh để chặn đệ quy quá sâu
+    Điểm theo góc nhìn bên đang đi.
+    """
+    state.qnodes += 1
+    state.check_time()
+
+    in_check = board.is_check()
+    if qply >= QS_MAX_PLY or ply >= MAX_PLY:
+        return state.evaluate(board)
+
+    if in_check:
+        moves = list(state.moves(board, ply))
+        if not moves:
+            return -MATE_SCORE + ply  # chiếu hết
+        best = -INFINITE
+    else:
+        stand_pat = state.evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best = stand_pat
+        moves = state.ordering.tactical_moves(board)
+
+    for move in moves:
+        if not in_check:
+            if stand_pat + _capture_gain(board, move) + DELTA_MARGIN <= alpha:
+                continue
+            if not see_ge(board, move):
+                continue
+
+        state.push(board, move)
+        score = -quiescence(board, -beta, -alpha, state, ply + 1, qply + 1)
+        state.pop(board)
+
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    return best
+
+
+def negamax(board, depth, alpha, beta, state, ply=0):
+    """
+    Negamax + Principal Variation Search:
     - board: trạng thái bàn cờ hiện tại
     - depth: độ sâu tìm kiếm còn lại
-    - alpha: điểm lớn nhất Max đã tìm thấy
-    - beta: điểm nhỏ nhất Min đã tìm thấy
-    - maximizing_player: True nếu lượt AI (Max), False nếu đối thủ (Min)
-    - ai_color: màu quân AI (chess.WHITE hoặc chess.BLACK)
-    """
-    # Nếu đạt độ sâu cuối hoặc game kết thúc
-    if depth == 0 or board.is_game_over():
-        score = evaluate_board(board)
-        return score if board.turn == ai_color else -score
-
-    if maximizing_player:
-        max_eval = -float("inf")
-        for move in board.legal_moves:
-            board.push(move)
-            eval = alphabeta(board, depth - 1, alpha, beta, False, ai_color)
-            board.pop()
-            max_eval = max(max_eval, eval)
-            alpha = max(alpha, eval)
-            if beta <= alpha:
-                break  # Cắt tỉa
-        return max_eval
+    - alpha, beta: cửa sổ tìm kiếm theo góc nhìn bên đang đi
+    - state: SearchState (bảng chuyển vị, giới hạn thời gian, đếm nút, PV)
+    - ply: khoảng cách tới gốc
+    Nước đầu tiên được tìm với cửa sổ đầy đủ, các nước sau với cửa sổ rỗng
+    (alpha, alpha + 1) và chỉ tìm lại khi điểm rơi vào trong (alpha, beta).
+    Ở nút không phải PV và không bị chiếu còn có (xem PRUNING):
+    reverse futility, null move, futility cho nước yên lặng gần lá, và LMR.
+    Trả về điểm theo góc nhìn bên đang đi.
+    """
+    state.nodes += 1
+    state.check_time()
+    state.pv[ply] = []
+    if ply > 0 and state.is_draw(board):
+        return 0
+    pv_node = beta - alpha > 1
+    tt = state.tt
+    key = state.keys[-1]
+
+    # Tra bảng chuyển vị trước khi sinh nước đi
+    entry = tt.probe(key)
+    hash_move = None
+    if entry is not None:
+        tt_depth, tt_score, tt_flag, hash_move = entry
+        # Ở nút PV chỉ lấy hash move, để giữ nguyên biến chính đầy đủ
+        if tt_depth >= depth and not pv_node:
+            score = score_from_tt(tt_score, ply)
+            if (
+                tt_flag == EXACT
+                or (tt_flag == LOWER and score >= beta)
+                or (tt_flag == UPPER and score <= alpha)
+            ):
+                return score
+
+    if depth <= 0 or ply >= MAX_PLY:
+        # Nút lá: chuyển sang quiescence thay vì đánh giá tĩnh ngay
+        value = quiescence(board, alpha, beta, state, ply)
+        flag = UPPER if value <= alpha else LOWER if value >= beta else EXACT
+        tt.store(key, 0, score_to_tt(value, ply), flag)
+        return value
+
+    in_check = board.is_check()
+    futile = False
+    if not pv_node and not in_check and abs(beta) < MATE_BOUND:
+        static = state.evaluate(board)
+
+        # Reverse futility: điểm tĩnh vượt beta quá xa, khó mà tụt lại được
+        if (
+            state.reverse_futility
+            and depth <= REVERSE_FUTILITY_DEPTH
+            and static - REVERSE_FUTILITY_MARGIN * depth >= beta
+        ):
+            state.futility_prunes += 1
+            return static
+
+        # Null move: bỏ lượt mà vẫn >= beta thì nước thật còn tốt hơn.
+        # Không dùng khi chỉ còn vua + tốt (dễ zugzwang) hay ngay sau null move khác
+        if (
+            state.null_move
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and static >= beta
+            and board.move_stack
+            and board.move_stack[-1]
+            and non_pawn_material(board, board.turn) > 0
+        ):
+            reduction = NULL_MOVE_REDUCTION + (depth >= 6)
+            state.push(board, chess.Move.null())
+            score = -negamax(
+                board, depth - 1 - reduction, -beta, -beta + 1, state, ply + 1
+            )
+            state.pop(board)
+            if score >= beta:
+                state.null_cutoffs += 1
+                score = beta if score >= MATE_BOUND else score
+                tt.store(key, depth, score_to_tt(score, ply), LOWER)
+                return score
+
+        # Futility: gần lá mà điểm tĩnh + biên vẫn không tới alpha
+        # → chỉ còn nước ăn quân / phong cấp / chiếu mới đáng xét
+        futile = (
+            state.futility
+            and depth < len(FUTILITY_MARGINS)
+            and static + FUTILITY_MARGINS[depth] <= alpha
+        )
+
+    alpha_orig = alpha
+    best_value = -INFINITE
+    best_move = None
+    index = -1
+    for index, move in enumerate(state.moves(board, ply, hash_move)):
+        quiet = not (move.promotion or board.is_capture(move))
+        if quiet and index > 0 and (futile or state.lmr):
+            quiet = not board.gives_check(move)
+            if futile and quiet:
+                state.futility_prunes += 1
+                continue
+
+        state.push(board, move)
+        if index == 0:
+            score = -negamax(board, depth - 1, -beta, -alpha, state, ply + 1)
+        else:
+            # LMR: nước yên lặng xếp muộn tìm nông hơn, vượt alpha thì tìm lại
+            reduction = 0
+            if (
+                state.lmr
+                and quiet
+                and not in_check
+                and depth >= LMR_MIN_DEPTH
+                and index >= LMR_MIN_MOVES
+            ):
+                reduction = 1 if index < 6 or depth < 5 else 2
+                state.reductions += 1
+            score = -negamax(
+                board, depth - 1 - reduction, -alpha - 1, -alpha, state, ply + 1
+            )
+            if reduction and score > alpha:
+                state.researches += 1
+                score = -negamax(board, depth - 1, -alpha - 1, -alpha, state, ply + 1)
+            if alpha < score < beta:
+                state.researches += 1
+                score = -negamax(board, depth - 1, -beta, -alpha, state, ply + 1)
+        state.pop(board)
+
+        if score > best_value:
+            best_value = score
+            best_move = move
+            if score > alpha:
+                alpha = score
+                state.update_pv(ply, move)
+                if alpha >= beta:
+                    state.on_cutoff(board, move, ply, depth, index)
+                    break  # Cắt tỉa
+
+    if index < 0:
+        # Không có nước hợp lệ nào: chiếu hết hoặc hết nước đi (hòa)
+        value = -MATE_SCORE + ply if in_check else 0
+        tt.store(key, depth, score_to_tt(value, ply), EXACT)
+        return value
+
+    # Lưu kết quả: so với cửa sổ ban đầu để biết là cận hay điểm chính xác
+    if best_value <= alpha_orig:
+        flag = UPPER
+    elif best_value >= beta:
+        flag = LOWER
     else:
-        min_eval = float("inf")
-        for move in board.legal_moves:
-            board.push(move)
-            eval = alphabeta(board, depth - 1, alpha, beta, True, ai_color)
-            board.pop()
-            min_eval = min(min_eval, eval)
-            beta = min(beta, eval)
-            if beta <= alpha:
-                break  # Cắt tỉa
-        return min_eval
+        flag = EXACT
+    tt.store(key, depth, score_to_tt(best_value, ply), flag, best_move)
+    return best_value
 
 
-def get_best_move(board, depth):
+def search_root(board, depth, state, alpha=-INFINITE, beta=INFINITE, first_move=None):
     """
-    Tìm nước đi tốt nhất cho AI tại trạng thái hiện tại
+    Duyệt các nước đi ở gốc với độ sâu cố định, cửa sổ (alpha, beta).
+    first_move (nước tốt nhất của vòng trước) được thử đầu tiên,
+    các nước còn lại theo thứ tự của MoveOrdering với cửa sổ rỗng.
+    Trả về (best_move, best_eval); biến chính nằm ở state.pv[0].
     """
-    ai_color = board.turn
+    state.pv[0] = []
+    state.reset(board)
     best_move = None
-    best_eval = -float("inf")
-    alpha = -float("inf")
-    beta = float("inf")
+    best_eval = -INFINITE
+    alpha_orig = alpha
 
-    for move in board.legal_moves:
-        board.push(move)
-        eval = alphabeta(board, depth - 1, alpha, beta, False, ai_color)
-        board.pop()
+    for index, move in enumerate(state.moves(board, 0, first_move)):
+        state.push(board, move)
+        if index == 0:
+            eval = -negamax(board, depth - 1, -beta, -alpha, state, 1)
+        else:
+            eval = -negamax(board, depth - 1, -alpha - 1, -alpha, state, 1)
+            if alpha < eval < beta:
+                state.researches += 1
+                eval = -negamax(board, depth - 1, -beta, -alpha, state, 1)
+        state.pop(board)
 
         if eval > best_eval:
             best_eval = eval
             best_move = move
-            alpha = max(alpha, eval)
+            if eval > alpha:
+                alpha = eval
+                state.update_pv(0, move)
+                if alpha >= beta:
+                    break
+
+    if best_move is not None and alpha_orig < best_eval < beta:
+        state.tt.store(position_key(board), depth, best_eval, EXACT, best_move)
+    return best_move, best_eval
+
+
+def aspiration_search(board, depth, state, prev_score, first_move=None):
+    """
+    Tìm ở gốc với cửa sổ hẹp quanh điểm vòng trước.
+    Rơi ra ngoài cửa sổ thì nới rộng gấp đôi phía bị trượt rồi tìm lại.
+    """
+    if prev_score is None or depth < ASPIRATION_MIN_DEPTH:
+        return search_root(board, depth, state, first_move=first_move)
+
+    delta = ASPIRATION_WINDOW
+    alpha = max(prev_score - delta, -INFINITE)
+    beta = min(prev_score + delta, INFINITE)
+    while True:
+        move, score = search_root(board, depth, state, alpha, beta, first_move)
+        if score <= alpha and alpha > -INFINITE:
+            alpha = max(score - delta, -INFINITE)
+        elif score >= beta and beta < INFINITE:
+            beta = min(score + delta, INFINITE)
+            first_move = move
+        else:
+            return move, score
+        state.researches += 1
+        delta *= 2
+
+
+def iterative_deepening(board, max_depth, state, soft_limit=None):
+    """
+    Tìm kiếm sâu dần 1, 2, ..., max_depth.
+    - Mỗi vòng thử trước nước tốt nhất của vòng trước, cửa sổ aspiration
+      quanh điểm của vòng trước.
+    - Hết giờ giữa chừng → bỏ vòng dở, dùng kết quả vòng hoàn thành gần nhất.
+    - soft_limit: nếu đã dùng quá số giây này thì không bắt đầu vòng mới.
+    Trả về SearchResult(best_move, score, depth, pv, nodes).
+    """
+    start = time.monotonic()
+    root_ply = len(board.move_stack)
+    best_move, best_eval, completed, pv = None, None, 0, []
+
+    for depth in range(1, max_depth + 1):
+        nodes_before = state.nodes + state.qnodes
+        iteration_start = time.monotonic()
+        try:
+            move, score = aspiration_search(board, depth, state, best_eval, best_move)
+        except SearchTimeout:
+            # Trả bàn cờ về đúng thế cờ gốc
+            while len(board.move_stack) > root_ply:
+                state.pop(board)
+            break
+        if move is None:
+            break  # hết nước đi (chiếu bí / hoà)
+        best_move, best_eval, completed = move, score, depth
+        pv = list(state.pv[0]) or [move]
+        state.iterations.append(
+            (
+                depth,
+                state.nodes + state.qnodes - nodes_before,
+                time.monotonic() - iteration_start,
+            )
+        )
+        if state.info is not None:
+            nodes = state.nodes + state.qnodes
+            state.info(
+                SearchResult(move, score, depth, pv, nodes), time.monotonic() - start
+            )
+        if abs(score) >= MATE_BOUND:
+            break  # đã thấy chiếu hết, tìm sâu hơn không đổi kết quả
+        if soft_limit is not None and time.monotonic() - start >= soft_limit:
+            break
+
+    if best_move is None:
+        # Chưa xong vòng nào: lấy tạm nước hợp lệ đầu tiên
+        best_move = next(iter(board.legal_moves), None)
+        pv = [best_move] if best_move else []
+    return SearchResult(best_move, best_eval, completed, pv, state.nodes + state.qnodes)
+
+
+def search(
+    board,
+    depth=None,
+    tt=None,
+    movetime=None,
+    time_left=None,
+    increment=0.0,
+    moves_to_go=None,
+    eval_cache=None,
+    pruning=PRUNING,
+    profile=None,
+    stop=None,
+    info=None,
+    use_ordering=True,
+):
+    """
+    Tìm kiếm đầy đủ, trả về SearchResult (nước tốt nhất, điểm, độ sâu, PV, số nút).
+    - depth: độ sâu tối đa (mặc định MAX_DEPTH nếu có giới hạn thời gian)
+    - movetime: số giây cố định cho nước này
+    - time_left, increment, moves_to_go: đồng hồ còn lại (giây) để tự chia thời gian
+    - eval_cache: EvalCache giữ lại giữa các nước của một ván (mặc định EVAL_CACHE)
+    - pruning: các kiểu cắt tỉa được bật (mặc định tất cả, xem PRUNING)
+    - profile: SearchProfile để ghi số liệu tìm kiếm và thời gian từng thành phần
+      đánh giá (None = không đo)
+    - stop: bộ đệm 1 byte, đặt stop[0] = 1 từ luồng khác để dừng ngay (UCI "stop")
+    - info: hàm gọi sau mỗi vòng sâu dần, xem SearchState
+    - use_ordering: False → duyệt theo thứ tự sinh nước (để so số nút khi có/không
+      sắp xếp nước đi)
+    """
+    tt = TT if tt is None else tt
+    tt.new_search()
+    depth, deadline, soft_limit = search_limits(
+        depth, movetime, time_left, increment, moves_to_go
+    )
+    state = SearchState(
+        tt,
+        deadline,
+        use_ordering=use_ordering,
+        eval_cache=eval_cache,
+        stop=stop,
+        pruning=pruning,
+        info=info,
+    )
+    if profile is None:
+        return iterative_deepening(board, depth, state, soft_limit)
+
+    set_profiler(profile)
+    try:
+        return iterative_deepening(board, depth, state, soft_limit)
+    finally:
+        set_profiler(None)
+        profile.search = state.stats()
+
+
+def search_limits(
+    depth=None, movetime=None, time_left=None, increment=0.0, moves_to_go=None
+):
+    """
+    Đổi các giới hạn của search() thành (depth, deadline, soft_limit).
+    Không có giới hạn thời gian → deadline, soft_limit là None, depth mặc định 3.
+    """
+    budget = movetime
+    if budget is None and time_left is not None:
+        budget = allocate_time(time_left, increment, moves_to_go)
+    if depth is None:
+        depth = MAX_DEPTH if budget is not None else 3
+
+    deadline = time.monotonic() + budget if budget is not None else None
+    # Vòng sau thường tốn gấp nhiều lần vòng trước → quá nửa ngân sách thì dừng
+    soft_limit = budget * 0.5 if budget is not None else None
+    return depth, deadline, soft_limit
+
+
+def get_best_move(board, depth=None, tt=None, workers=1, book=None, smp=None, **limits):
+    """
+    Tìm nước đi tốt nhất cho AI tại trạng thái hiện tại
+    (xem search() cho các tham số giới hạn thời gian).
+    workers != 1: chia các nước ở gốc cho nhiều tiến trình
+    (None = số CPU, xem parallel.root_parallel_search).
+    book: PolyglotBook tra trước khi tìm (mặc định BOOK); có nước trong sách
+    thì trả về luôn, không tìm kiếm.
+    smp: LazySMP (parallel) tìm thay search(), dùng TT riêng của nó (bỏ qua tt).
+    limits: các tham số còn lại của search() (eval_cache, pruning, stop, info,
+    use_ordering, ...), chuyển nguyên cho search() hoặc root_parallel_search().
+    """
+    book = BOOK if book is None else book
+    if book is not None:
+        move = book.choose(board)
+        if move is not None:
+            return move
+    if smp is not None:
+        return smp.search(board, depth, **limits).best_move
+    if workers != 1:
+        # Import tại chỗ: engine.parallel import ngược lại module này
+        from engine.parallel import root_parallel_search
 
-    return best_move
+        return root_parallel_search(board, depth, workers, tt, **limits).best_move
+    return search(board, depth, tt, **limits).best_move
@@ -0,0 +1,158 @@
+import chess
+
+from engine.see import see_ge
+
+MAX_PLY = 128
+
+# Giá trị quân dùng cho MVV-LVA (chỉ để sắp xếp, không phải để đánh giá)
+ORDER_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 2000,
+}
+
+HISTORY_MAX = 1 << 20
+
+
+def mvv_lva(board, move) -> int:
+    """
+    Most Valuable Victim - Least Valuable Attacker:
+    ăn quân càng giá trị bằng quân càng rẻ thì điểm càng cao.
+    """
+    if board.is_en_passant(move):
+        victim = chess.PAWN
+    else:
+        victim = board.piece_type_at(move.to_square)
+    attacker = board.piece_type_at(move.from_square)
+    score = 10 * ORDER_VALUES.get(victim, 0) - ORDER_VALUES[attacker] // 10
+    if move.promotion:
+        score += ORDER_VALUES[move.promotion]
+    return score
+
+
+class MoveOrdering:
+    """
+    Các bảng heuristic dùng để sắp xếp nước đi trong một lần tìm kiếm:
+    - killers: 2 nước yên (không ăn quân) gây cắt tỉa gần nhất ở mỗi ply
+    - history: bảng butterfly [màu][from][to], cộng depth² mỗi lần cắt tỉa
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[[0] * 64 for _ in range(64)] for _ in range(2)]
+
+    def add_killer(self, ply, move):
+        if ply >= MAX_PLY:
+            return
+        slots = self.killers[ply]
+        if slots[0] != move:
+            slots[1] = slots[0]
+            slots[0] = move
+
+    def add_history(self, color, move, depth):
+        table = self.history[color]
+        table[move.from_square][move.to_square] += depth * depth
+        if table[move.from_square][move.to_square] > HISTORY_MAX:
+            # Chia đôi toàn bảng để giá trị cũ dần mất tác dụng
+            for row in table:
+                for to_square in range(64):
+                    row[to_square] //= 2
+
+    def on_cutoff(self, board, move, ply, depth):
+        """Cập nhật killer/history khi một nước yên gây beta cutoff."""
+        if board.is_capture(move) or move.promotion:
+            return
+        self.add_killer(ply, move)
+        self.add_history(board.turn, move, depth)
+
+    def ordered_moves(self, board, ply=0, hash_move=None):
+        """
+        Sinh nước đi hợp lệ theo thứ tự, lười từng giai đoạn:
+        1. hash move (từ bảng chuyển vị)
+        2. nước ăn quân (MVV-LVA, kể cả phong cấp có ăn)
+        3. phong cấp không ăn quân
+        4. 2 killer move của ply này
+        5. các nước yên còn lại theo điểm history
+        Mỗi giai đoạn chỉ được sinh khi giai đoạn trước không gây cắt tỉa.
+        """
+        if hash_move is not None and board.is_legal(hash_move):
+            yield hash_move
+        else:
+            hash_move = None
+
+        captures = [
+            (mvv_lva(board, move), move)
+            for move in board.generate_legal_captures()
+            if move != hash_move
+        ]
+        captures.sort(key=lambda item: item[0], reverse=True)
+        # Nước ăn lỗ (SEE < 0) để dành tới sau các nước yên
+        bad_captures = []
+        for _, move in captures:
+            if see_ge(board, move):
+                yield move
+            else:
+                bad_captures.append(move)
+
+        us = board.occupied_co[board.turn]
+        not_them = ~board.occupied_co[not board.turn]
+        seventh = chess.BB_RANK_7 if board.turn == chess.WHITE else chess.BB_RANK_2
+        promoting = board.pawns & us & seventh
+
+        # Phong cấp không ăn quân: chỉ sinh nước của tốt ở hàng 7
+        promotions = []
+        if promoting:
+            for move in board.generate_legal_moves(promoting, not_them):
+                if move != hash_move:
+                    promotions.append(move)
+            promotions.sort(key=lambda m: ORDER_VALUES[m.promotion], reverse=True)
+            yield from promotions
+
+        killers = []
+        if ply < MAX_PLY:
+            for k in self.killers[ply]:
+                if (
+                    k is not None
+                    and k != hash_move
+                    and not k.promotion
+                    and board.is_legal(k)
+                    and not board.is_capture(k)
+                ):
+                    killers.append(k)
+                    yield k
+
+        history = self.history[board.turn]
+        quiets = []
+        for move in board.generate_legal_moves(chess.BB_ALL & ~promoting, not_them):
+            if move == hash_move or move in killers or board.is_en_passant(move):
+                continue
+            quiets.append((history[move.from_square][move.to_square], move))
+        quiets.sort(key=lambda item: item[0], reverse=True)
+        for _, move in quiets:
+            yield move
+        yield from bad_captures
+
+    def tactical_moves(self, board):
+        """
+        Nước đi cho quiescence: ăn quân theo MVV-LVA, sau đó phong hậu không ăn quân.
+        """
+        captures = [
+            (mvv_lva(board, move), move) for move in board.generate_legal_captures()
+        ]
+        captures.sort(key=lambda item: item[0], reverse=True)
+        for _, move in captures:
+            yield move
+
+        seventh = chess.BB_RANK_7 if board.turn == chess.WHITE else chess.BB_RANK_2
+        promoting = board.pawns & board.occupied_co[board.turn] & seventh
+        if promoting:
+            not_them = ~board.occupied_co[not board.turn]
+            for move in board.generate_legal_moves(promoting, not_them):
+                if move.promotion == chess.QUEEN:
+                    yield move
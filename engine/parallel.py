@@ -0,0 +1,451 @@
+import atexit
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import chess
+
+from engine.eval_cache import EvalCache
+from engine.minimax import (
+    INFINITE,
+    MATE_BOUND,
+    MAX_DEPTH,
+    PRUNING,
+    SearchResult,
+    SearchState,
+    SearchTimeout,
+    aspiration_search,
+    iterative_deepening,
+    negamax,
+    search,
+    search_limits,
+)
+from engine.transposition import TranspositionTable, open_shared_memory
+
+# Trạng thái của mỗi tiến trình phụ, gán một lần trong _init_worker
+_WORKER = {}
+# Pool cho root_parallel_search theo số tiến trình, giữ lại giữa các nước đi:
+# workers → (pool, shared memory 1 byte của cờ stop dùng chung với các tiến trình)
+_ROOT_POOLS = {}
+# TT của mỗi tiến trình phụ root_parallel_search theo kích thước (MB), cấp 1 lần
+_ROOT_TABLES = {}
+# Kích thước TT cho một nước ở gốc với độ sâu còn lại 1; x4 mỗi ply thêm
+ROOT_TT_BASE_MB = 1 / 16
+
+
+def _init_worker(tt_name, tt_size_mb, stop_name):
+    _WORKER["tt"] = TranspositionTable.attach(tt_name, tt_size_mb)
+    _WORKER["stop_shm"] = open_shared_memory(stop_name)
+    _WORKER["stop"] = _WORKER["stop_shm"].buf
+
+
+def _worker_eval_cache(max_entries):
+    """EvalCache riêng của tiến trình phụ (None = không cache), giữ giữa các nước."""
+    if max_entries is None:
+        return None
+    cache = _WORKER.get("eval_cache")
+    if cache is None:
+        cache = _WORKER["eval_cache"] = EvalCache(max_entries)
+    elif cache.max_entries != max_entries:
+        cache.resize(max_entries)
+    return cache
+
+
+def _helper_search(board, index, age, deadline, pruning, cache_entries):
+    """
+    Tiến trình phụ của Lazy SMP: tìm cùng thế cờ, ghi vào TT dùng chung
+    rồi bỏ kết quả. Helper lẻ bắt đầu sâu hơn 1 ply để các tiến trình
+    không đi cùng một nhịp. Chạy tới khi tiến trình chính bật cờ stop.
+    cache_entries: cỡ EvalCache của tiến trình phụ (None = không cache).
+    Trả về số nút đã duyệt.
+    """
+    tt = _WORKER["tt"]
+    tt.age = age
+    state = SearchState(
+        tt,
+        deadline,
+        eval_cache=_worker_eval_cache(cache_entries),
+        stop=_WORKER["stop"],
+        pruning=pruning,
+    )
+    best_move, best_eval = None, None
+    try:
+        for depth in range(1 + index % 2, MAX_DEPTH + 1):
+            best_move, best_eval = aspiration_search(
+                board, depth, state, best_eval, best_move
+            )
+            if best_move is None:
+                break  # hết nước đi
+    except SearchTimeout:
+        pass
+    return state.nodes + state.qnodes
+
+
+class LazySMP:
+    """
+    Lazy SMP: tiến trình chính + (workers - 1) tiến trình phụ cùng tìm một
+    thế cờ, chia sẻ bảng chuyển vị qua shared memory. Kết quả lấy từ
+    tiến trình chính; tiến trình phụ chỉ làm đầy TT để nó đi sâu nhanh hơn.
+    - workers: số tiến trình (mặc định = số CPU), 1 → tìm tuần tự như search()
+    - giữ pool và TT giữa các nước đi; close() (hoặc with) khi xong
+    """
+
+    def __init__(self, workers=None, tt_size_mb=16):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.tt = TranspositionTable(tt_size_mb, shared=True)
+        self.stop = shared_memory.SharedMemory(create=True, size=1)
+        self.pool = None
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(
+                self.workers - 1,
+                initializer=_init_worker,
+                initargs=(self.tt.shm.name, tt_size_mb, self.stop.name),
+            )
+        self.last_stats = {}
+
+    def search(
+        self,
+        board,
+        depth=None,
+        movetime=None,
+        time_left=None,
+        increment=0.0,
+        moves_to_go=None,
+        eval_cache=None,
+        info=None,
+        pruning=PRUNING,
+    ):
+        """
+        Cùng tham số và kết quả như minimax.search(); nodes là tổng mọi tiến trình.
+        Tiến trình phụ dùng cùng pruning và EvalCache riêng cùng cỡ với eval_cache.
+        """
+        self.tt.new_search()
+        depth, deadline, soft_limit = search_limits(
+            depth, movetime, time_left, increment, moves_to_go
+        )
+        start = time.monotonic()
+        futures = []
+        if self.pool is not None:
+            cache_entries = eval_cache.max_entries if eval_cache is not None else None
+            futures = [
+                self.pool.submit(
+                    _helper_search,
+                    board,
+                    index,
+                    self.tt.age,
+                    deadline,
+                    pruning,
+                    cache_entries,
+                )
+                for index in range(1, self.workers)
+            ]
+
+        state = SearchState(
+            self.tt,
+            deadline,
+            eval_cache=eval_cache,
+            stop=self.stop.buf,
+            info=info,
+            pruning=pruning,
+        )
+        try:
+            result = iterative_deepening(board, depth, state, soft_limit)
+        finally:
+            self.stop.buf[0] = 1
+            helper_nodes = sum(future.result() for future in futures)
+            # Cờ stop chỉ xoá khi mọi tiến trình đã dừng; "stop" gửi trước khi
+            # search() bắt đầu vẫn được giữ (xem clear_stop)
+            self.stop.buf[0] = 0
+
+        elapsed = time.monotonic() - start
+        nodes = result.nodes + helper_nodes
+        self.last_stats = {
+            "workers": self.workers,
+            "depth": result.depth,
+            "nodes": nodes,
+            "main_nodes": result.nodes,
+            "time": elapsed,
+            "nps": nodes / elapsed if elapsed > 0 else 0.0,
+        }
+        return result._replace(nodes=nodes)
+
+    def request_stop(self):
+        """Dừng lần tìm kiếm đang chạy hoặc sắp chạy (gọi từ luồng khác)."""
+        self.stop.buf[0] = 1
+
+    def clear_stop(self):
+        """Xoá cờ stop trước khi bắt đầu lần tìm kiếm mới (gọi trước khi chạy luồng)."""
+        self.stop.buf[0] = 0
+
+    def close(self):
+        if self.pool is not None:
+            self.stop.buf[0] = 1
+            self.pool.shutdown()
+            self.pool = None
+        self.tt.close()
+        if self.stop is not None:
+            self.stop.close()
+            self.stop.unlink()
+            self.stop = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _root_table(depth, tt_size_mb):
+    """
+    TT của tiến trình phụ cho một nước ở gốc, cỡ theo độ sâu còn lại
+    (tối đa tt_size_mb). Mỗi cỡ chỉ cấp phát 1 lần cho mỗi tiến trình rồi dùng lại;
+    clear() mỗi nước để kết quả không phụ thuộc tiến trình nào nhận việc.
+    """
+    size_mb = min(tt_size_mb, ROOT_TT_BASE_MB * 4 ** (depth - 1))
+    tt = _ROOT_TABLES.get(size_mb)
+    if tt is None:
+        tt = _ROOT_TABLES[size_mb] = TranspositionTable(size_mb)
+    else:
+        tt.clear()
+    return tt
+
+
+def _init_root_worker(stop_name):
+    _WORKER["stop_shm"] = open_shared_memory(stop_name)
+    _WORKER["stop"] = _WORKER["stop_shm"].buf
+
+
+def _search_root_move(
+    board, move, depth, alpha, deadline, tt_size_mb, use_ordering, pruning
+):
+    """
+    Tiến trình phụ: điểm của 1 nước ở gốc so với cận alpha.
+    Như PVS: thử cửa sổ rỗng trước, chỉ tìm lại với (alpha, +∞) khi vượt alpha.
+    Trả về (score, nodes, pv); score = None nếu hết giờ / bị dừng.
+    """
+    state = SearchState(
+        _root_table(depth, tt_size_mb),
+        deadline,
+        use_ordering=use_ordering,
+        stop=_WORKER["stop"],
+        pruning=pruning,
+    )
+    state.reset(board)
+    state.push(board, move)
+    try:
+        score = -negamax(board, depth - 1, -alpha - 1, -alpha, state, 1)
+        if score > alpha:
+            score = -negamax(board, depth - 1, -INFINITE, -alpha, state, 1)
+    except SearchTimeout:
+        return None, state.nodes + state.qnodes, []
+    return score, state.nodes + state.qnodes, [move] + state.pv[1]
+
+
+def _collect(futures, stop, shared_stop):
+    """
+    Đợi kết quả các nước ở gốc; trong lúc đợi chuyển cờ `stop` (bộ đệm của
+    luồng gọi, ví dụ UCI "stop") sang shared memory cho các tiến trình phụ.
+    """
+    if stop is not None:
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.01)
+            if stop[0]:
+                shared_stop[0] = 1
+    return [future.result() for future in futures]
+
+
+def _root_pool(workers):
+    """(pool, cờ stop dùng chung) cho `workers` tiến trình, tạo lần đầu cần tới."""
+    if workers not in _ROOT_POOLS:
+        stop = shared_memory.SharedMemory(create=True, size=1)
+        pool = ProcessPoolExecutor(
+            workers, initializer=_init_root_worker, initargs=(stop.name,)
+        )
+        _ROOT_POOLS[workers] = (pool, stop)
+    pool, stop = _ROOT_POOLS[workers]
+    stop.buf[0] = 0
+    return pool, stop.buf
+
+
+def shutdown_pools():
+    """Đóng các pool của root_parallel_search (tự gọi khi thoát chương trình)."""
+    while _ROOT_POOLS:
+        _, (pool, stop) = _ROOT_POOLS.popitem()
+        stop.buf[0] = 1
+        pool.shutdown()
+        stop.close()
+        stop.unlink()
+
+
+atexit.register(shutdown_pools)
+
+
+def root_parallel_search(
+    board,
+    depth=None,
+    workers=None,
+    tt=None,
+    movetime=None,
+    time_left=None,
+    increment=0.0,
+    moves_to_go=None,
+    eval_cache=None,
+    tt_size_mb=4,
+    use_ordering=True,
+    pruning=PRUNING,
+    profile=None,
+    stop=None,
+    info=None,
+):
+    """
+    Chia các nước ở gốc cho nhiều tiến trình, sâu dần 1..depth:
+    - nước tốt nhất của vòng trước được tìm trước (tuần tự) để lấy cận alpha
+    - các nước còn lại chạy song song, so với cùng cận alpha: alpha nâng lên
+      giữa chừng không được chuyển cho các nước khác (đổi lấy kết quả tất định)
+    - gộp theo thứ tự nước (không theo thứ tự xong) → kết quả tất định
+    - hết giờ giữa vòng → dùng kết quả vòng hoàn thành gần nhất
+    workers mặc định = số CPU; chỉ có 1 CPU (hoặc 1 nước đi) → search() tuần tự.
+    tt_size_mb: kích thước TT tối đa của mỗi nước ở tiến trình phụ.
+    use_ordering, pruning, stop, info: như search(), áp dụng cho mọi tiến trình.
+    profile: chỉ dùng được khi rơi về search() tuần tự (thời gian đánh giá ở
+    tiến trình phụ không đo được) → ValueError nếu thật sự chạy song song.
+    Trả về SearchResult như search().
+    """
+    cpus = os.cpu_count() or 1
+    workers = min(workers or cpus, cpus)
+    moves = list(board.legal_moves)
+    if workers <= 1 or len(moves) <= 1:
+        return search(
+            board,
+            depth,
+            tt,
+            movetime,
+            time_left,
+            increment,
+            moves_to_go,
+            eval_cache,
+            pruning=pruning,
+            profile=profile,
+            stop=stop,
+            info=info,
+            use_ordering=use_ordering,
+        )
+    if profile is not None:
+        raise ValueError("root_parallel_search: profile chỉ dùng với search() tuần tự")
+
+    depth, deadline, soft_limit = search_limits(
+        depth, movetime, time_left, increment, moves_to_go
+    )
+    pool, shared_stop = _root_pool(workers)
+    state = SearchState(
+        tt,
+        deadline,
+        use_ordering=use_ordering,
+        eval_cache=eval_cache,
+        stop=stop,
+        pruning=pruning,
+    )
+    state.tt.new_search()
+    start = time.monotonic()
+    nodes = 0
+    best_move, best_eval, completed, pv = None, None, 0, []
+
+    root_ply = len(board.move_stack)
+    for current in range(1, depth + 1):
+        first, rest = moves[0], moves[1:]
+        # 1. Nước đầu: tìm tuần tự với cửa sổ đầy đủ để có cận alpha
+        state.reset(board)
+        state.push(board, first)
+        try:
+            alpha = -negamax(board, current - 1, -INFINITE, INFINITE, state, 1)
+        except SearchTimeout:
+            while len(board.move_stack) > root_ply:
+                state.pop(board)
+            break
+        state.pop(board)
+        first_pv = [first] + state.pv[1]
+
+        # 2. Các nước còn lại: song song, cùng cận alpha
+        futures = [
+            pool.submit(
+                _search_root_move,
+                board,
+                move,
+                current,
+                alpha,
+                deadline,
+                tt_size_mb,
+                use_ordering,
+                pruning,
+            )
+            for move in rest
+        ]
+        results = _collect(futures, stop, shared_stop)
+        nodes += sum(result[1] for result in results)
+        if any(score is None for score, _, _ in results):
+            break  # hết giờ giữa vòng
+
+        # 3. Gộp theo thứ tự nước: điểm cao hơn hẳn mới thay nước tốt nhất
+        scores = [alpha] + [score for score, _, _ in results]
+        lines = [first_pv] + [line for _, _, line in results]
+        best_index = 0
+        for index, score in enumerate(scores):
+            if score > scores[best_index]:
+                best_index = index
+        best_move, best_eval, completed = moves[best_index], scores[best_index], current
+        pv = lines[best_index]
+        # Vòng sau: nước tốt nhất trước, còn lại theo điểm giảm dần (sort ổn định)
+        order = sorted(range(len(moves)), key=lambda i: (i != best_index, -scores[i]))
+        moves = [moves[i] for i in order]
+        if info is not None:
+            total = nodes + state.nodes + state.qnodes
+            info(
+                SearchResult(best_move, best_eval, completed, pv, total),
+                time.monotonic() - start,
+            )
+
+        if abs(best_eval) >= MATE_BOUND:
+            break
+        if soft_limit is not None and time.monotonic() - start >= soft_limit:
+            break
+
+    if best_move is None:
+        best_move = moves[0]
+        pv = [best_move]
+    return SearchResult(
+        best_move, best_eval, completed, pv, nodes + state.nodes + state.qnodes
+    )
+
+
+def measure_scaling(board, max_workers=None, movetime=1.0, tt_size_mb=16):
+    """
+    Đo NPS khi tăng số tiến trình từ 1 tới max_workers (cùng thế cờ,
+    cùng thời gian). Trả về danh sách last_stats kèm speedup so với 1 tiến trình.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    rows = []
+    for workers in range(1, max_workers + 1):
+        with LazySMP(workers, tt_size_mb) as smp:
+            smp.search(board.copy(), depth=1)  # khởi động các tiến trình phụ
+            smp.search(board.copy(), movetime=movetime)
+            stats = dict(smp.last_stats)
+        base = rows[0]["nps"] if rows else stats["nps"]
+        stats["speedup"] = stats["nps"] / base if base else 0.0
+        rows.append(stats)
+    return rows
+
+
+if __name__ == "__main__":
+    # python -m engine.parallel [max_workers] [movetime] [fen]
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    movetime = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    board = chess.Board(sys.argv[3]) if len(sys.argv) > 3 else chess.Board()
+    for row in measure_scaling(board, max_workers, movetime):
+        print(
+            f"workers {row['workers']:>3}  depth {row['depth']:>2}  "
+            f"nodes {row['nodes']:>8}  nps {row['nps']:>9.0f}  "
+            f"speedup {row['speedup']:.2f}x"
+        )
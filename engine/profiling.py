@@ -0,0 +1,47 @@
+import json
+import time
+
+
+class SearchProfile:
+    """
+    Số liệu của một lần tìm kiếm, bật bằng search(board, ..., profile=SearchProfile()):
+    - search: SearchState.stats() lúc kết thúc (nodes, qnodes, nps, TT hits,
+      cutoff theo thứ tự nước, branching factor, từng vòng sâu dần)
+    - eval_terms: số lần gọi và tổng thời gian của từng thành phần evaluate_board
+      (chỉ các lần thật sự tính, không kể trúng EvalCache)
+    Không truyền profile thì không có gì bị đo.
+    """
+
+    def __init__(self):
+        self.search = {}
+        self.eval_terms = {}
+
+    def time_term(self, name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        entry = self.eval_terms.get(name)
+        if entry is None:
+            self.eval_terms[name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        return result
+
+    def to_dict(self) -> dict:
+        terms = {}
+        for name, (calls, seconds) in self.eval_terms.items():
+            terms[name] = {
+                "calls": calls,
+                "total_ms": seconds * 1000,
+                "avg_us": seconds / calls * 1e6,
+            }
+        return {"search": self.search, "eval_terms": terms}
+
+    def to_json(self, path=None, indent=2) -> str:
+        """Chuỗi JSON của to_dict(); có path thì ghi luôn ra file."""
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,154 @@
+import chess
+
+from engine.evaluation.material import PIECE_VALUES_MG
+
+# Giá trị quân cho SEE, cùng thang với điểm đánh giá (middle game);
+# vua không bao giờ bị ăn nên chỉ cần lớn hơn mọi quân khác
+SEE_VALUES = [0] + [PIECE_VALUES_MG[piece_type] for piece_type in chess.PIECE_TYPES]
+SEE_VALUES[chess.KING] = 20000
+
+# Thứ tự thử quân ăn: rẻ nhất trước
+_ATTACKER_ORDER = (
+    chess.PAWN,
+    chess.KNIGHT,
+    chess.BISHOP,
+    chess.ROOK,
+    chess.QUEEN,
+    chess.KING,
+)
+
+
+def attackers(board, square, occupied):
+    """
+    Quân của cả hai bên tấn công `square` khi chỉ còn các quân trong `occupied`.
+    Quân trượt được tính lại theo occupied nên tự lộ ra các tấn công xuyên (x-ray)
+    khi quân phía trước đã rời khỏi đường.
+    """
+    queens_and_rooks = board.queens | board.rooks
+    queens_and_bishops = board.queens | board.bishops
+    return occupied & (
+        (chess.BB_KING_ATTACKS[square] & board.kings)
+        | (chess.BB_KNIGHT_ATTACKS[square] & board.knights)
+        | (
+            chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+            & queens_and_rooks
+        )
+        | (
+            chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]
+            & queens_and_rooks
+        )
+        | (
+            chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+            & queens_and_bishops
+        )
+        | (
+            chess.BB_PAWN_ATTACKS[chess.WHITE][square]
+            & board.pawns
+            & board.occupied_co[chess.BLACK]
+        )
+        | (
+            chess.BB_PAWN_ATTACKS[chess.BLACK][square]
+            & board.pawns
+            & board.occupied_co[chess.WHITE]
+        )
+    )
+
+
+def least_valuable_attacker(board, mask):
+    """(piece_type, square) của quân rẻ nhất trong mask, hoặc (None, None)."""
+    for piece_type in _ATTACKER_ORDER:
+        pieces = mask & board.pieces_mask(piece_type, chess.WHITE)
+        pieces |= mask & board.pieces_mask(piece_type, chess.BLACK)
+        if pieces:
+            return piece_type, chess.lsb(pieces)
+    return None, None
+
+
+def _setup(board, move):
+    """(giá trị quân bị ăn, giá trị quân đứng trên ô đích sau nước đi, occupied)."""
+    occupied = board.occupied & ~chess.BB_SQUARES[move.from_square]
+    if board.is_en_passant(move):
+        captured = SEE_VALUES[chess.PAWN]
+        down = -8 if board.turn == chess.WHITE else 8
+        occupied &= ~chess.BB_SQUARES[move.to_square + down]
+    else:
+        captured = SEE_VALUES[board.piece_type_at(move.to_square) or 0]
+    piece_type = board.piece_type_at(move.from_square)
+    if move.promotion:
+        captured += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        piece_type = move.promotion
+    return captured, SEE_VALUES[piece_type], occupied
+
+
+def see(board, move) -> int:
+    """
+    Static exchange evaluation: kết quả vật chất (theo bên đi `move`) của
+    chuỗi ăn qua lại trên ô đích, mỗi bên luôn ăn bằng quân rẻ nhất và có thể
+    dừng bất cứ lúc nào. Không xét quân bị ghim; vua chỉ ăn khi ô đó không còn
+    bị tấn công. Nhập thành → 0.
+    """
+    if board.is_castling(move):
+        return 0
+    to_square = move.to_square
+    captured, on_square, occupied = _setup(board, move)
+    gains = [captured]
+    side = not board.turn
+    while True:
+        side_attackers = attackers(board, to_square, occupied) & board.occupied_co[side]
+        if not side_attackers:
+            break
+        piece_type, square = least_valuable_attacker(board, side_attackers)
+        if piece_type == chess.KING and (
+            attackers(board, to_square, occupied) & board.occupied_co[not side]
+        ):
+            break  # vua không thể ăn vào ô còn bị tấn công
+        gains.append(on_square - gains[-1])
+        on_square = SEE_VALUES[piece_type]
+        occupied &= ~chess.BB_SQUARES[square]
+        side = not side
+
+    # Mỗi bên chọn giữa dừng lại và ăn tiếp, tính ngược từ cuối chuỗi
+    for index in range(len(gains) - 1, 0, -1):
+        gains[index - 1] = -max(-gains[index - 1], gains[index])
+    return gains[0]
+
+
+def see_ge(board, move, threshold=0) -> bool:
+    """
+    see(board, move) >= threshold nhưng dừng ngay khi biết kết quả
+    (không cần dựng cả chuỗi ăn), dùng cho sắp xếp nước đi và cắt tỉa.
+    """
+    if board.is_castling(move):
+        return threshold <= 0
+    to_square = move.to_square
+    captured, on_square, occupied = _setup(board, move)
+
+    # swap: bên đi còn dư bao nhiêu so với ngưỡng nếu đối phương dừng / ăn lại
+    swap = captured - threshold
+    if swap < 0:
+        return False
+    swap = on_square - swap
+    if swap <= 0:
+        return True
+
+    side = board.turn
+    result = True
+    while True:
+        side = not side
+        all_attackers = attackers(board, to_square, occupied)
+        side_attackers = all_attackers & board.occupied_co[side]
+        if not side_attackers:
+            break
+        piece_type, square = least_valuable_attacker(board, side_attackers)
+        if piece_type == chess.KING:
+            # Vua chỉ ăn được khi đối phương không còn quân tấn công ô này
+            if all_attackers & board.occupied_co[not side]:
+                break
+            result = not result
+            break
+        result = not result
+        swap = SEE_VALUES[piece_type] - swap
+        if swap < result:
+            break
+        occupied &= ~chess.BB_SQUARES[square]
+    return result
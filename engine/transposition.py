@@ -0,0 +1,210 @@
+import struct
+from multiprocessing import shared_memory
+
+import chess
+import chess.polyglot
+
+# === Loại giá trị lưu trong bảng ===
+EXACT = 0  # điểm chính xác
+LOWER = 1  # cận dưới (fail-high, score >= beta)
+UPPER = 2  # cận trên (fail-low, score <= alpha)
+
+# Mỗi entry 16 byte: key (8) | score (4) | move (2) | depth (1) | flag + age (1)
+# Ô key lưu key XOR 8 byte dữ liệu phía sau: nhiều tiến trình cùng ghi
+# (Lazy SMP) mà bị xé entry thì kiểm tra key sẽ trượt thay vì trả dữ liệu hỏng
+_ENTRY = struct.Struct("<QiHbB")
+ENTRY_SIZE = _ENTRY.size
+
+
+def _payload(score, move, depth, flag_age) -> int:
+    """8 byte dữ liệu của entry dưới dạng số nguyên (little-endian như _ENTRY)."""
+    return (
+        (score & 0xFFFFFFFF) | (move << 32) | ((depth & 0xFF) << 48) | (flag_age << 56)
+    )
+
+
+def position_key(board: chess.Board) -> int:
+    """
+    Khoá Zobrist (chuẩn Polyglot) của thế cờ hiện tại.
+    """
+    return chess.polyglot.zobrist_hash(board)
+
+
+def encode_move(move) -> int:
+    """
+    Nén nước đi vào 16 bit: from (6) | to (6) | promotion (3).
+    0 nghĩa là không có nước đi (a1a1 không bao giờ hợp lệ).
+    """
+    if not move:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int):
+    if not code:
+        return None
+    return chess.Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+
+def open_shared_memory(name):
+    """Mở shared memory do tiến trình khác tạo; tiến trình đó chịu trách nhiệm xoá."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 chưa có track
+        return shared_memory.SharedMemory(name=name)
+
+
+def _num_entries(size_mb) -> int:
+    entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE)
+    # Làm tròn xuống luỹ thừa của 2 để lấy index bằng phép AND
+    return 1 << (entries.bit_length() - 1)
+
+
+class TranspositionTable:
+    """
+    Bảng chuyển vị kích thước cố định, lưu trong một bytearray liên tục.
+    - Số entry là luỹ thừa của 2, suy ra từ ngân sách bộ nhớ (MB).
+    - Thay thế ưu tiên độ sâu: entry cũ chỉ bị ghi đè nếu cùng thế cờ,
+      thuộc lượt tìm kiếm trước, hoặc độ sâu mới >= độ sâu cũ.
+    - Điểm lưu theo góc nhìn bên đang đi (side to move).
+    - shared=True: dữ liệu nằm trong shared memory, các tiến trình khác
+      mở lại bằng TranspositionTable.attach(tt.shm.name, size_mb).
+    """
+
+    def __init__(self, size_mb=16, shared=False):
+        self.shm = None
+        self.owner = shared
+        self.resize(size_mb)
+
+    @classmethod
+    def attach(cls, name, size_mb):
+        """Mở bảng dùng chung đã được tiến trình khác tạo (không xoá khi đóng)."""
+        tt = cls.__new__(cls)
+        tt.owner = False
+        tt.shm = open_shared_memory(name)
+        tt.num_entries = _num_entries(size_mb)
+        tt.mask = tt.num_entries - 1
+        tt.size_mb = size_mb
+        tt.data = tt.shm.buf[: tt.num_entries * ENTRY_SIZE]
+        tt.age = 0
+        tt.reset_stats()
+        return tt
+
+    def resize(self, size_mb):
+        self.close()
+        self.num_entries = _num_entries(size_mb)
+        self.mask = self.num_entries - 1
+        self.size_mb = size_mb
+        size = self.num_entries * ENTRY_SIZE
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.data = self.shm.buf[:size]
+            self.data[:] = bytes(size)
+        else:
+            self.data = bytearray(size)
+        self.age = 0
+        self.reset_stats()
+
+    def close(self):
+        """Đóng shared memory (bảng tạo ra thì xoá luôn). Bảng thường: không làm gì."""
+        if self.shm is None:
+            return
+        self.data.release()
+        self.data = bytearray()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+    def clear(self):
+        """Xoá toàn bộ entry (dùng khi bắt đầu ván mới)."""
+        self.data[:] = bytes(len(self.data))
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """Tăng tuổi bảng để entry của lượt tìm kiếm trước dễ bị thay thế."""
+        self.age = (self.age + 1) & 63
+
+    def probe(self, key):
+        """
+        Tra bảng theo key.
+        Trả về (depth, score, flag, move) hoặc None nếu không có.
+        """
+        offset = (key & self.mask) * ENTRY_SIZE
+        stored_key, score, move, depth, flag_age = _ENTRY.unpack_from(
+            self.data, offset
+        )
+        if stored_key ^ _payload(score, move, depth, flag_age) == key:
+            self.hits += 1
+            return depth, score, flag_age & 3, decode_move(move)
+        if stored_key:
+            self.collisions += 1  # ô đang giữ thế cờ khác
+        else:
+            self.misses += 1
+        return None
+
+    def store(self, key, depth, score, flag, move=None):
+        offset = (key & self.mask) * ENTRY_SIZE
+        stored_key, stored_score, stored_move, stored_depth, flag_age = (
+            _ENTRY.unpack_from(self.data, offset)
+        )
+        if stored_key:
+            payload = _payload(stored_score, stored_move, stored_depth, flag_age)
+            same = stored_key ^ payload == key
+            old = (flag_age >> 2) != self.age
+            if not same and not old and depth < stored_depth:
+                return
+            if same and move is None:
+                # Giữ lại nước đi tốt nhất đã biết của thế cờ này
+                move = decode_move(stored_move)
+            if not same:
+                self.overwrites += 1
+        self.stores += 1
+        score = int(score)
+        move = encode_move(move)
+        depth = max(-128, min(127, depth))
+        flag_age = flag | (self.age << 2)
+        _ENTRY.pack_into(
+            self.data,
+            offset,
+            key ^ _payload(score, move, depth, flag_age),
+            score,
+            move,
+            depth,
+            flag_age,
+        )
+
+    def hashfull(self) -> int:
+        """Tỉ lệ lấp đầy (phần nghìn) ước lượng trên 1000 entry đầu, như UCI."""
+        sample = min(1000, self.num_entries)
+        used = 0
+        for i in range(sample):
+            stored_key, _, _, _, flag_age = _ENTRY.unpack_from(
+                self.data, i * ENTRY_SIZE
+            )
+            if stored_key and (flag_age >> 2) == self.age:
+                used += 1
+        return used * 1000 // sample
+
+    def stats(self) -> dict:
+        probes = self.hits + self.misses + self.collisions
+        return {
+            "entries": self.num_entries,
+            "size_mb": self.size_mb,
+            "probes": probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "hashfull": self.hashfull(),
+        }
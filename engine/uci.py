@@ -0,0 +1,298 @@
+import sys
+import threading
+
+import chess
+
+from engine.bench import BENCH_DEPTH, bench
+from engine.book import BOOK_MAX_PLY, PolyglotBook
+from engine.eval_cache import EvalCache
+from engine.evaluation.pawn_hash import PAWN_TABLE
+from engine.minimax import MATE_BOUND, MATE_SCORE, MAX_DEPTH, search
+from engine.parallel import LazySMP
+from engine.transposition import TranspositionTable
+
+ENGINE_NAME = "chess_ai"
+ENGINE_AUTHOR = "Tuấn Lê 2kar4"
+
+# Tuỳ chọn UCI: tên → (giá trị mặc định, nhỏ nhất, lớn nhất)
+OPTIONS = {
+    "Hash": (16, 1, 4096),  # MB cho bảng chuyển vị
+    "Threads": (1, 1, 64),  # > 1 → Lazy SMP
+    "MoveTime": (0, 0, 3_600_000),  # ms mỗi nước khi "go" không kèm giới hạn
+    "BookDepth": (BOOK_MAX_PLY, 0, 200),  # số ply đầu ván còn tra sách
+}
+# Tuỳ chọn dạng chuỗi: tên → giá trị mặc định
+STRING_OPTIONS = {
+    "BookFile": "",  # đường dẫn sách Polyglot .bin, rỗng = không dùng sách
+}
+
+
+def format_score(score) -> str:
+    """Điểm nội bộ → "cp N" hoặc "mate N" (số nước, âm nếu bị chiếu hết)."""
+    if score >= MATE_BOUND:
+        return f"mate {(MATE_SCORE - score + 1) // 2}"
+    if score <= -MATE_BOUND:
+        return f"mate {-((MATE_SCORE + score) // 2)}"
+    return f"cp {score}"
+
+
+class UCIEngine:
+    """
+    Giao thức UCI trên stdin/stdout để chạy engine không cần giao diện.
+    Tìm kiếm chạy trên luồng nền nên "stop" / "isready" được trả lời ngay;
+    mỗi vòng sâu dần in một dòng "info depth ... score ... nodes ... nps ... pv ...".
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.lock = threading.Lock()
+        self.options = {name: default for name, (default, _, _) in OPTIONS.items()}
+        self.board = chess.Board()
+        self.tt = TranspositionTable(size_mb=self.options["Hash"])
+        self.eval_cache = EvalCache(size_mb=16)
+        self.smp = None
+        self.stop_flag = bytearray(1)
+        # Đặt khi được phép in bestmove; "go infinite" / "go ponder" giữ lại tới "stop"
+        self.release = threading.Event()
+        self.thread = None
+        self.book = None
+
+    def send(self, line):
+        with self.lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    # === Vòng đọc lệnh ===
+
+    def run(self, stream=None):
+        for line in stream or sys.stdin:
+            if not self.handle(line):
+                break
+        self.stop()
+        if self.smp is not None:
+            self.smp.close()
+        if self.book is not None:
+            self.book.close()
+
+    def handle(self, line) -> bool:
+        """Xử lý 1 dòng lệnh; trả về False khi gặp "quit"."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            for name, (default, low, high) in OPTIONS.items():
+                self.send(
+                    f"option name {name} type spin default {default} min {low} max {high}"
+                )
+            for name, default in STRING_OPTIONS.items():
+                self.send(f"option name {name} type string default {default or '<empty>'}")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.wait()
+            self.tt.clear()
+            self.eval_cache.clear()
+            PAWN_TABLE.clear()
+            if self.smp is not None:
+                self.smp.tt.clear()
+        elif command == "position":
+            self.wait()
+            self.set_position(args)
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self.release.set()
+        elif command == "bench":
+            self.wait()
+            stats = bench(int(args[0]) if args else BENCH_DEPTH)
+            self.send(
+                f"info string bench depth {stats['depth']} nodes {stats['nodes']} "
+                f"time {int(stats['time'] * 1000)} nps {int(stats['nps'])}"
+            )
+        elif command == "quit":
+            return False
+        return True
+
+    def set_option(self, args):
+        # setoption name <tên> value <giá trị>
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1 : args.index("value")])
+        if name in STRING_OPTIONS:
+            self.wait()
+            self.set_book(" ".join(args[args.index("value") + 1 :]))
+            return
+        if name not in OPTIONS:
+            return
+        _, low, high = OPTIONS[name]
+        try:
+            value = max(low, min(high, int(args[args.index("value") + 1])))
+        except (ValueError, IndexError):
+            return
+        self.wait()
+        self.options[name] = value
+        if name == "Hash":
+            self.tt.resize(value)
+        if name == "BookDepth" and self.book is not None:
+            self.book.max_ply = value
+        if name in ("Hash", "Threads") and self.smp is not None:
+            self.smp.close()
+            self.smp = None
+
+    def set_book(self, path):
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if path and path != "<empty>":
+            try:
+                self.book = PolyglotBook(path, self.options["BookDepth"])
+            except OSError as error:
+                self.send(f"info string cannot open book {path}: {error}")
+
+    def set_position(self, args):
+        # position startpos|fen <fen> [moves <m1> <m2> ...]
+        if not args:
+            return
+        moves = []
+        if "moves" in args:
+            index = args.index("moves")
+            args, moves = args[:index], args[index + 1 :]
+        try:
+            if args[0] == "startpos":
+                board = chess.Board()
+            elif args[0] == "fen":
+                board = chess.Board(" ".join(args[1:]))
+            else:
+                return
+            for uci in moves:
+                board.push_uci(uci)
+        except ValueError as error:
+            # Giữ nguyên thế cờ cũ, không để lỗi làm dừng vòng đọc lệnh
+            self.send(f"info string invalid position: {error}")
+            return
+        self.board = board
+
+    # === Tìm kiếm ===
+
+    def go(self, args):
+        self.wait()
+        limits = self.parse_go(args)
+        self.stop_flag[0] = 0
+        if "infinite" in args or "ponder" in args:
+            self.release.clear()
+        else:
+            self.release.set()
+        if self.options["Threads"] > 1:
+            # Tạo trước khi chạy luồng để "stop" gửi ngay sau "go" vẫn tới được
+            if self.smp is None:
+                self.smp = LazySMP(self.options["Threads"], self.options["Hash"])
+            self.smp.clear_stop()
+        self.thread = threading.Thread(
+            target=self.search, args=(self.board.copy(), limits), daemon=True
+        )
+        self.thread.start()
+
+    def parse_go(self, args) -> dict:
+        values = {}
+        for i, token in enumerate(args[:-1]):
+            if token in (
+                "depth",
+                "movetime",
+                "wtime",
+                "btime",
+                "winc",
+                "binc",
+                "movestogo",
+            ):
+                try:
+                    values[token] = int(args[i + 1])
+                except ValueError:
+                    self.send(f"info string invalid go {token}: {args[i + 1]}")
+
+        # infinite: không giới hạn thời gian (bỏ qua movetime / đồng hồ) nhưng
+        # depth nếu có vẫn là giới hạn; bestmove luôn chờ "stop" (xem go)
+        if "infinite" in args:
+            return {"depth": values.get("depth", MAX_DEPTH)}
+
+        limits = {}
+        white = self.board.turn == chess.WHITE
+        clock = values.get("wtime" if white else "btime")
+        if "depth" in values:
+            limits["depth"] = values["depth"]
+        if "movetime" in values:
+            limits["movetime"] = values["movetime"] / 1000
+        elif clock is not None:
+            limits["time_left"] = clock / 1000
+            limits["increment"] = values.get("winc" if white else "binc", 0) / 1000
+            limits["moves_to_go"] = values.get("movestogo")
+        elif "depth" not in values and self.options["MoveTime"]:
+            limits["movetime"] = self.options["MoveTime"] / 1000
+        return limits
+
+    def search(self, board, limits):
+        move = self.book.choose(board) if self.book is not None else None
+        if move is not None:
+            self.send_bestmove(move)
+            return
+        if self.smp is not None and self.options["Threads"] > 1:
+            result = self.smp.search(
+                board, eval_cache=self.eval_cache, info=self.info, **limits
+            )
+        else:
+            result = search(
+                board,
+                tt=self.tt,
+                eval_cache=self.eval_cache,
+                stop=self.stop_flag,
+                info=self.info,
+                **limits,
+            )
+        self.send_bestmove(result.best_move)
+
+    def send_bestmove(self, move):
+        # UCI: không in bestmove của "go infinite" / "go ponder" trước "stop"
+        self.release.wait()
+        self.send(f"bestmove {move.uci() if move else '0000'}")
+
+    def info(self, result, elapsed):
+        nps = int(result.nodes / elapsed) if elapsed > 0 else 0
+        pv = " ".join(move.uci() for move in result.pv)
+        self.send(
+            f"info depth {result.depth} score {format_score(result.score)} "
+            f"nodes {result.nodes} nps {nps} time {int(elapsed * 1000)} pv {pv}"
+        )
+
+    def wait(self):
+        """
+        Đợi lần tìm kiếm đang chạy tự kết thúc (GUI chỉ gửi position/go
+        tiếp sau khi nhận bestmove; "go infinite" phải được "stop" trước).
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def stop(self):
+        """Dừng tìm kiếm đang chạy và đợi luồng nền in xong bestmove."""
+        if self.thread is None:
+            return
+        self.stop_flag[0] = 1
+        if self.smp is not None:
+            self.smp.request_stop()
+        self.release.set()
+        self.wait()
+
+
+def main():
+    UCIEngine().run()
+
+
+if __name__ == "__main__":
+    main()
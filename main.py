@@ -58,6 +58,7 @@ def start_game():
 
         clock.tick(60)  # Giới hạn 60 FPS
 
+    controller.close()
     pygame.quit()
 
 
@@ -1,7 +1,14 @@
 import chess
+import os
 import pygame.mixer
 import threading
+from engine.book import PolyglotBook
+from engine.eval_cache import EvalCache
 from engine.minimax import get_best_move
+from engine.parallel import LazySMP
+from engine.transposition import TranspositionTable
+
+BOOK_PATH = "assets/book.bin"
 
 class GameController:
     def __init__(self, board, gui, player_is_white):
@@ -23,6 +30,17 @@ class GameController:
         self.ai_thread = None
         self.ai_move_ready = False
         self.ai_move_result = None
+        # Bảng chuyển vị riêng cho ván này, giữ lại giữa các nước của AI
+        self.tt = TranspositionTable(size_mb=16)
+        # Cache điểm đánh giá của ván này (thế cờ lặp lại giữa các nước)
+        self.eval_cache = EvalCache(size_mb=16)
+        # Giới hạn thời gian suy nghĩ mỗi nước (giây) để AI không bị treo lâu
+        self.ai_movetime = 5.0
+        # Số tiến trình tìm kiếm; > 1 → Lazy SMP với TT trong shared memory
+        self.ai_workers = 1
+        self.smp = LazySMP(self.ai_workers) if self.ai_workers > 1 else None
+        # Sách khai cuộc Polyglot: có file thì AI đi theo sách, không cần tìm kiếm
+        self.book = PolyglotBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
 
         pygame.mixer.init()
         self.move_sound = pygame.mixer.Sound("assets/sounds/move-self.mp3")
@@ -213,6 +231,25 @@ class GameController:
             self.ai_move_ready = False
 
     def calculate_ai_move(self):
-        move = get_best_move(self.board.get_board(), depth=3)
+        move = get_best_move(
+            self.board.get_board(),
+            depth=3,
+            tt=self.tt,
+            book=self.book,
+            smp=self.smp,
+            movetime=self.ai_movetime,
+            eval_cache=self.eval_cache,
+        )
         self.ai_move_result = move
         self.ai_move_ready = True
+
+    def close(self):
+        """Dừng luồng AI và giải phóng tiến trình / shared memory của Lazy SMP."""
+        if self.smp is not None:
+            self.smp.request_stop()
+        if self.ai_thread is not None:
+            self.ai_thread.join()
+            self.ai_thread = None
+        if self.smp is not None:
+            self.smp.close()
+            self.smp = None
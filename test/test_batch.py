@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+import chess
+
+from engine.batch import evaluate_batch, evaluate_one, read_epd
+from engine.bench import BENCH_FENS
+from engine.evaluation_engine import EVAL_TERMS, evaluate_board
+
+
+class TestBatch(unittest.TestCase):
+    def test_matches_evaluate_board(self):
+        fens = BENCH_FENS[:12]
+        expected = [evaluate_board(chess.Board(fen)) for fen in fens]
+        boards = (chess.Board(fen) for fen in fens)
+        self.assertEqual(list(evaluate_batch(boards, workers=1, chunk_size=5)), expected)
+        self.assertEqual(list(evaluate_batch(fens, workers=2, chunk_size=5)), expected)
+
+    def test_terms_breakdown(self):
+        (row,) = evaluate_batch(BENCH_FENS[:1], workers=1, terms=True)
+        self.assertEqual(row["score"], evaluate_board(chess.Board(BENCH_FENS[0])))
+        self.assertEqual([name for name, _ in EVAL_TERMS], list(row["terms"]))
+
+    def test_evaluate_one_terms(self):
+        # Có cả thế chiếu hết: điểm lấy từ terminal_score như evaluate_board
+        mate = "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+        for fen in BENCH_FENS[:4] + [mate]:
+            row = evaluate_one(fen, terms=True)
+            self.assertEqual(row["score"], evaluate_board(chess.Board(fen)), fen)
+            self.assertEqual(row["score"], evaluate_one(fen))
+
+    def test_read_epd(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".epd", delete=False) as f:
+            f.write("# comment\n\n")
+            f.write(BENCH_FENS[1] + "\n")
+            f.write("4k3/8/8/8/8/8/4P3/4K3 w - - bm e4; id \"pawn\";\n")
+        try:
+            fens = list(read_epd(f.name))
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(fens, [BENCH_FENS[1], "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
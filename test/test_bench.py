@@ -0,0 +1,23 @@
+import unittest
+
+from engine.bench import BENCH_FENS, bench, eval_bench
+from engine.evaluation_engine import EVAL_TERMS
+
+
+class TestBench(unittest.TestCase):
+    def test_signature_is_deterministic(self):
+        fens = BENCH_FENS[:3]
+        first = bench(depth=2, fens=fens, tt_size_mb=1)
+        second = bench(depth=2, fens=fens, tt_size_mb=1)
+        self.assertEqual(first["nodes"], second["nodes"])
+        self.assertEqual(first["positions"], 3)
+
+    def test_eval_bench_terms(self):
+        stats = eval_bench(fens=BENCH_FENS[:5], repeat=1)
+        for name, _ in EVAL_TERMS:
+            self.assertIn(name, stats["terms"])
+        self.assertGreater(stats["evaluate_us"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import chess
+
+from engine.evaluation.bitboards import (
+    BOARD_HALF,
+    KING_FLANK,
+    KING_RING,
+    PASSED_PAWN_SPAN,
+    PAWN_ATTACK_SPAN,
+    SQUARE_COLOR,
+)
+
+
+class TestBitboards(unittest.TestCase):
+    def test_tables(self):
+        for square in chess.SQUARES:
+            file = chess.square_file(square)
+            rank = chess.square_rank(square)
+            for other in chess.SQUARES:
+                bit = chess.BB_SQUARES[other]
+                dx = chess.square_file(other) - file
+                dy = chess.square_rank(other) - rank
+                self.assertEqual(bool(KING_RING[square] & bit), max(abs(dx), abs(dy)) <= 1)
+                self.assertEqual(bool(KING_FLANK[square] & bit), abs(dx) <= 1)
+                self.assertEqual(
+                    bool(BOARD_HALF[square] & bit), (file < 4) == (file + dx < 4)
+                )
+                self.assertEqual(bool(SQUARE_COLOR[square] & bit), (dx + dy) % 2 == 0)
+                for color, ahead in ((chess.WHITE, dy > 0), (chess.BLACK, dy < 0)):
+                    self.assertEqual(
+                        bool(PAWN_ATTACK_SPAN[color][square] & bit), ahead and abs(dx) == 1
+                    )
+                    self.assertEqual(
+                        bool(PASSED_PAWN_SPAN[color][square] & bit), ahead and abs(dx) <= 1
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
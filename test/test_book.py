@@ -0,0 +1,55 @@
+import os
+import random
+import tempfile
+import unittest
+
+import chess
+import chess.polyglot
+
+from engine.book import ENTRY, PolyglotBook
+from engine.minimax import get_best_move
+
+
+def _raw(move):
+    # Polyglot: đích ở 6 bit thấp, nguồn ở 6 bit kế tiếp
+    return move.to_square | move.from_square << 6
+
+
+class TestPolyglotBook(unittest.TestCase):
+    def setUp(self):
+        castle = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        rows = [
+            (chess.polyglot.zobrist_hash(chess.Board()), _raw(chess.Move.from_uci("e2e4")), 3),
+            (chess.polyglot.zobrist_hash(chess.Board()), _raw(chess.Move.from_uci("d2d4")), 1),
+            (chess.polyglot.zobrist_hash(chess.Board()), _raw(chess.Move.from_uci("a2a3")), 0),
+            (chess.polyglot.zobrist_hash(castle), _raw(chess.Move.from_uci("e1h1")), 5),
+        ]
+        rows += [(key, 0, 1) for key in (1, 2, 2**64 - 1)]  # khoá khác để tìm nhị phân
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as f:
+            for key, move, weight in sorted(rows):
+                f.write(ENTRY.pack(key, move, weight, 0))
+        self.path = f.name
+        self.castle = castle
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_entries_and_choice(self):
+        with PolyglotBook(self.path, rng=random.Random(1)) as book:
+            moves = {move.uci(): weight for move, weight in book.entries(chess.Board())}
+            self.assertEqual(moves, {"e2e4": 3, "d2d4": 1, "a2a3": 0})
+            for _ in range(20):
+                self.assertIn(book.choose(chess.Board()).uci(), ("e2e4", "d2d4"))
+            self.assertEqual(book.choose(self.castle), chess.Move.from_uci("e1g1"))
+            self.assertIsNone(book.choose(chess.Board("4k3/8/8/8/8/8/8/4K2R w K - 0 1")))
+
+    def test_max_ply_and_get_best_move(self):
+        board = chess.Board()
+        with PolyglotBook(self.path, max_ply=0) as book:
+            self.assertIsNone(book.choose(board))
+        with PolyglotBook(self.path, rng=random.Random(2)) as book:
+            self.assertIn(get_best_move(board, depth=1, book=book).uci(), ("e2e4", "d2d4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+import chess
+
+from engine.eval_cache import EvalCache
+from engine.minimax import static_eval
+from engine.transposition import position_key
+
+
+class TestEvalCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = EvalCache(max_entries=2)
+        cache.put(1, 10)
+        cache.put(2, 20)
+        self.assertEqual(cache.get(1), 10)  # 1 vừa được dùng → 2 bị bỏ trước
+        cache.put(3, 30)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), 10)
+        self.assertEqual(cache.get(3), 30)
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_size_in_mb(self):
+        cache = EvalCache(size_mb=1)
+        self.assertGreater(cache.max_entries, 1000)
+        cache.put(1, 0)
+        self.assertLessEqual(cache.memory_bytes(), 1024 * 1024)
+
+    def test_static_eval_uses_cache(self):
+        board = chess.Board()
+        board.push_san("e4")
+        cache = EvalCache(max_entries=16)
+        score = static_eval(board, cache=cache)
+        self.assertEqual(cache.get(position_key(board)), -score)
+        self.assertEqual(static_eval(board, cache=cache), score)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import chess
+import chess.polyglot
+
+from engine.evaluation.imbalance import eval_imbalance
+from engine.evaluation.incremental import IncrementalEval
+from engine.evaluation.material import eval_material
+from engine.evaluation.psqt import PSQT, _pack_tables, eval_psqt
+from engine.evaluation_engine import evaluate_board, find_phase
+
+
+def full_terms(board):
+    return (
+        eval_material(board, "mg"),
+        eval_material(board, "eg"),
+        eval_psqt(board, "mg"),
+        eval_psqt(board, "eg"),
+        eval_imbalance(board),
+        find_phase(board),
+    )
+
+
+def inc_terms(inc):
+    return (
+        inc.material("mg"),
+        inc.material("eg"),
+        inc.psqt("mg"),
+        inc.psqt("eg"),
+        inc.imbalance(),
+        inc.phase(),
+    )
+
+
+class TestIncrementalEval(unittest.TestCase):
+    def check_line(self, fen, ucis):
+        board = chess.Board(fen)
+        inc = IncrementalEval(board)
+        start = inc_terms(inc)
+        for uci in ucis:
+            inc.push(board, chess.Move.from_uci(uci))
+            self.assertEqual(inc_terms(inc), full_terms(board), uci)
+        while board.move_stack:
+            inc.pop(board)
+        self.assertEqual(inc_terms(inc), start)
+
+    def test_castling_and_captures(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.check_line(fen, ["e1g1", "e8c8", "e5f7", "h3g2", "f3f6"])
+
+    def test_en_passant_and_promotion(self):
+        fen = "8/P1k5/8/3pP3/8/8/5K2/8 w - d6 0 1"
+        self.check_line(fen, ["e5d6", "c7b7", "a7a8n", "b7a8", "d6d7"])
+
+    def test_null_move(self):
+        self.check_line(chess.STARTING_FEN, ["e2e4", "0000", "d2d4"])
+
+    def test_zobrist_key(self):
+        # Nhập thành, en passant (chỉ tính khi có tốt bắt được), phong cấp
+        board = chess.Board(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        )
+        inc = IncrementalEval(board)
+        for uci in ["a2a4", "b4a3", "e1g1", "h3g2", "d5d6", "g2f1q"]:
+            inc.push(board, chess.Move.from_uci(uci))
+            self.assertEqual(inc.key(board), chess.polyglot.zobrist_hash(board), uci)
+
+    def test_evaluate_board_with_inc(self):
+        board = chess.Board()
+        inc = IncrementalEval(board)
+        for uci in ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3"]:
+            inc.push(board, chess.Move.from_uci(uci))
+        self.assertEqual(evaluate_board(board, inc), evaluate_board(board))
+
+    def test_psqt_data_matches_tables(self):
+        # psqt_data.py phải được sinh lại sau khi sửa evaluation_tables
+        self.assertEqual(PSQT, _pack_tables())
+
+
+if __name__ == "__main__":
+    unittest.main()
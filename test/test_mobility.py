@@ -0,0 +1,49 @@
+import unittest
+
+import chess
+
+from engine.evaluation.mobility import _mobility_count
+
+
+def legal_count(board, square):
+    """Cách đếm cũ: sinh nước hợp lệ khi đến lượt quân đó, bỏ nước ăn hậu."""
+    pseudo = board.copy()
+    piece = board.piece_at(square)
+    pseudo.turn = piece.color
+    count = 0
+    for move in pseudo.legal_moves:
+        if move.from_square != square:
+            continue
+        dest = board.piece_at(move.to_square)
+        if dest and dest.piece_type == chess.QUEEN and dest.color != piece.color:
+            continue
+        count += 1
+    return count
+
+
+class TestMobility(unittest.TestCase):
+    def check(self, fen):
+        board = chess.Board(fen)
+        for square, piece in board.piece_map().items():
+            if piece.piece_type in (chess.PAWN, chess.KING):
+                continue
+            self.assertEqual(
+                _mobility_count(board, square), legal_count(board, square), square
+            )
+
+    def test_pins(self):
+        # Mã d2 bị ghim (không đi được), xe e2 bị ghim dọc cột e
+        self.check("4r2k/8/8/8/b7/8/3NR3/4K3 w - - 0 1")
+
+    def test_check_and_double_check(self):
+        # Trắng bị chiếu: chỉ được chặn hoặc ăn quân chiếu
+        self.check("4k3/8/8/8/1b6/8/2N1R3/4K3 w - - 0 1")
+        self.check("4k3/8/8/8/1b6/8/2N1RN2/r3K3 w - - 0 1")
+
+    def test_queen_captures_and_opponent_in_check(self):
+        # Vua trắng bị xe h1 chiếu dù đến lượt đen; đen không được tính ăn hậu d2
+        self.check("3qk3/8/8/8/8/2n5/3Q4/R3K2r b - - 0 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import chess
+
+from engine.move_ordering import MoveOrdering
+from engine.see import see_ge
+
+
+class TestMoveOrdering(unittest.TestCase):
+    FENS = [
+        chess.STARTING_FEN,
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/P1k5/8/3pP3/8/8/5K2/8 w - d6 0 1",
+    ]
+
+    def test_yields_every_legal_move_once(self):
+        ordering = MoveOrdering()
+        for fen in self.FENS:
+            board = chess.Board(fen)
+            moves = list(ordering.ordered_moves(board))
+            self.assertEqual(len(moves), len(set(moves)))
+            self.assertEqual(set(moves), set(board.legal_moves))
+
+    def test_stage_order(self):
+        board = chess.Board(self.FENS[1])
+        ordering = MoveOrdering()
+        killer = chess.Move.from_uci("a2a3")
+        hash_move = chess.Move.from_uci("e1g1")
+        ordering.add_killer(0, killer)
+        moves = list(ordering.ordered_moves(board, 0, hash_move))
+
+        self.assertEqual(moves[0], hash_move)
+        captures = [m for m in moves[1:] if board.is_capture(m) and see_ge(board, m)]
+        self.assertEqual(moves[1 : 1 + len(captures)], captures)
+        # Cùng ăn tốt h3: quân ăn rẻ hơn (tốt) được thử trước hậu
+        self.assertLess(
+            moves.index(chess.Move.from_uci("g2h3")),
+            moves.index(chess.Move.from_uci("f3h3")),
+        )
+        self.assertEqual(moves[1 + len(captures)], killer)
+        # Nước ăn lỗ (SEE < 0) xếp sau mọi nước yên
+        bad = [m for m in moves if board.is_capture(m) and not see_ge(board, m)]
+        self.assertTrue(bad)
+        self.assertEqual(moves[-len(bad) :], bad)
+
+    def test_quiet_promotions_before_killers(self):
+        board = chess.Board(self.FENS[2])
+        moves = list(MoveOrdering().ordered_moves(board))
+        self.assertEqual(moves[0], chess.Move.from_uci("e5d6"))  # en passant
+        self.assertEqual(moves[1], chess.Move.from_uci("a7a8q"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+
+import chess
+
+from engine.eval_cache import EvalCache
+from engine.minimax import get_best_move, search
+from engine import parallel
+from engine.parallel import LazySMP, root_parallel_search, shutdown_pools
+from engine.transposition import EXACT, TranspositionTable, position_key
+
+
+class TestLazySMP(unittest.TestCase):
+    def test_shared_table(self):
+        tt = TranspositionTable(size_mb=1, shared=True)
+        try:
+            other = TranspositionTable.attach(tt.shm.name, 1)
+            key = position_key(chess.Board())
+            move = chess.Move.from_uci("e2e4")
+            tt.store(key, 4, 17, EXACT, move)
+            self.assertEqual(other.probe(key), (4, 17, EXACT, move))
+            other.close()
+        finally:
+            tt.close()
+
+    def test_two_workers_find_mate(self):
+        fen = "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"
+        with LazySMP(workers=2, tt_size_mb=1) as smp:
+            result = smp.search(chess.Board(fen), depth=3)
+            self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+            self.assertEqual(smp.last_stats["workers"], 2)
+            self.assertGreaterEqual(result.nodes, smp.last_stats["main_nodes"])
+
+    def test_helpers_take_pruning_and_eval_cache(self):
+        fen = "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"
+        cache = EvalCache(max_entries=1000)
+        with LazySMP(workers=2, tt_size_mb=1) as smp:
+            result = smp.search(chess.Board(fen), depth=3, eval_cache=cache, pruning=())
+        self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+        self.assertGreater(cache.misses, 0)
+
+    def test_get_best_move_with_smp(self):
+        # Sách được tra trước, rồi mới tới LazySMP
+        board = chess.Board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+        book = mock.Mock()
+        book.choose.return_value = chess.Move.from_uci("g1f1")
+        with LazySMP(workers=1, tt_size_mb=1) as smp:
+            move = get_best_move(board, depth=3, smp=smp)
+            self.assertEqual(move, chess.Move.from_uci("a1a8"))
+            move = get_best_move(board, depth=3, book=book, smp=smp)
+            self.assertEqual(move, chess.Move.from_uci("g1f1"))
+
+
+class TestRootParallel(unittest.TestCase):
+    FEN = "r1bqk2r/pppp1ppp/2n2n2/2b1p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 2 4"
+
+    def test_matches_serial_and_is_deterministic(self):
+        board = chess.Board(self.FEN)
+        serial = search(board, depth=2, tt=TranspositionTable(size_mb=1))
+        with mock.patch("engine.parallel.os.cpu_count", return_value=2):
+            first = root_parallel_search(
+                board, 2, workers=2, tt=TranspositionTable(size_mb=1), tt_size_mb=1
+            )
+            second = root_parallel_search(
+                board, 2, workers=2, tt=TranspositionTable(size_mb=1), tt_size_mb=1
+            )
+        self.assertEqual(board.fen(), self.FEN)
+        self.assertEqual((first.best_move, first.score), (serial.best_move, serial.score))
+        self.assertEqual(first, second)
+
+    def test_get_best_move_search_keywords(self):
+        # Tham số chỉ có ở search() phải tới được các tiến trình phụ
+        board = chess.Board(self.FEN)
+        depths = []
+        with mock.patch("engine.parallel.os.cpu_count", return_value=2):
+            move = get_best_move(
+                board,
+                depth=2,
+                tt=TranspositionTable(size_mb=1),
+                workers=2,
+                pruning=(),
+                stop=bytearray(1),
+                info=lambda result, elapsed: depths.append(result.depth),
+            )
+        self.assertIn(move, board.legal_moves)
+        self.assertEqual(depths, [1, 2])
+
+    def test_shutdown_pools(self):
+        board = chess.Board(self.FEN)
+        with mock.patch("engine.parallel.os.cpu_count", return_value=2):
+            first = root_parallel_search(board, 1, workers=2)
+            shutdown_pools()
+            self.assertEqual(parallel._ROOT_POOLS, {})
+            # Lần tìm sau tạo lại pool
+            second = root_parallel_search(board, 1, workers=2)
+        self.assertEqual(first.best_move, second.best_move)
+
+    def test_single_core_falls_back_to_serial(self):
+        board = chess.Board(self.FEN)
+        with mock.patch("engine.parallel.os.cpu_count", return_value=1):
+            result = root_parallel_search(
+                board, 2, workers=8, tt=TranspositionTable(size_mb=1)
+            )
+        serial = search(board, depth=2, tt=TranspositionTable(size_mb=1))
+        self.assertEqual(result, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
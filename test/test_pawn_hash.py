@@ -0,0 +1,46 @@
+import unittest
+
+import chess
+
+from engine.evaluation.context import EvalContext
+from engine.evaluation.incremental import IncrementalEval
+from engine.evaluation.pawn_hash import PawnHashTable, pawn_key
+from engine.evaluation.pieces import outpost_square, rook_on_file
+
+
+class TestPawnHash(unittest.TestCase):
+    def test_incremental_pawn_key(self):
+        board = chess.Board("8/P1k5/8/3pP3/8/8/5K2/8 w - d6 0 1")
+        inc = IncrementalEval(board)
+        for uci in ["e5d6", "c7b7", "a7a8q", "b7a8"]:
+            inc.push(board, chess.Move.from_uci(uci))
+            self.assertEqual(inc.pawn_key, pawn_key(board))
+
+    def test_hit_and_derived_data(self):
+        board = chess.Board(
+            "r1bqk2r/pp3ppp/2n1pn2/2pp4/3P4/2PBPN2/PP3PPP/RN1QK2R w KQkq - 0 8"
+        )
+        table = PawnHashTable(entries=64)
+        entry = table.probe(board)
+        self.assertIs(table.probe(board), entry)
+        self.assertEqual(table.stats()["hits"], 1)
+
+        ctx = EvalContext(board, entry)
+        for color in (chess.WHITE, chess.BLACK):
+            sign = 1 if color == chess.WHITE else -1
+            for square in chess.SQUARES:
+                file, rank = chess.square_file(square), chess.square_rank(square)
+                self.assertEqual(
+                    outpost_square(board, color, sign, file, rank, ctx),
+                    outpost_square(board, color, sign, file, rank),
+                )
+            rook = chess.Piece(chess.ROOK, color)
+            for file in range(8):
+                self.assertEqual(
+                    rook_on_file(board, rook, color, file, ctx),
+                    rook_on_file(board, rook, color, file),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
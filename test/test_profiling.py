@@ -0,0 +1,40 @@
+import json
+import unittest
+
+import chess
+
+from engine.eval_cache import EvalCache
+from engine import evaluation_engine
+from engine.evaluation_engine import EVAL_TERMS
+from engine.minimax import search
+from engine.profiling import SearchProfile
+from engine.transposition import TranspositionTable
+
+
+class TestSearchProfile(unittest.TestCase):
+    def test_profile_export(self):
+        fen = "r1bqk2r/pppp1ppp/2n2n2/2b1p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 2 4"
+        profile = SearchProfile()
+        result = search(
+            chess.Board(fen),
+            depth=2,
+            tt=TranspositionTable(size_mb=1),
+            eval_cache=EvalCache(max_entries=1000),
+            profile=profile,
+        )
+        data = json.loads(profile.to_json())
+        stats = data["search"]
+        self.assertEqual(stats["nodes"] + stats["qnodes"], result.nodes)
+        self.assertEqual(sum(stats["cutoffs_by_index"]), stats["cutoffs"])
+        self.assertEqual([it["depth"] for it in stats["iterations"]], [1, 2])
+        for name, _ in EVAL_TERMS:
+            self.assertGreater(data["eval_terms"][name]["calls"], 0)
+
+    def test_disabled_after_search(self):
+        tt = TranspositionTable(size_mb=1)
+        search(chess.Board(), depth=1, tt=tt, profile=SearchProfile())
+        self.assertIsNone(evaluation_engine._profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
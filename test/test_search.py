@@ -0,0 +1,110 @@
+import unittest
+
+import chess
+
+from engine.minimax import MATE_BOUND, PRUNING, SearchState, get_best_move, search
+from engine.transposition import TranspositionTable
+
+
+class TestSearch(unittest.TestCase):
+    def best(self, fen, **kwargs):
+        board = chess.Board(fen)
+        move = get_best_move(board, tt=TranspositionTable(size_mb=1), **kwargs)
+        self.assertEqual(board.fen(), fen)  # bàn cờ được trả về nguyên trạng
+        return move.uci()
+
+    def test_mate_in_one(self):
+        fen = "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"
+        self.assertEqual(self.best(fen, depth=1), "a1a8")
+        # Đen cũng phải thấy chiếu hết
+        fen = "r5k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1"
+        self.assertEqual(self.best(fen, depth=1), "a8a1")
+
+    def test_wins_hanging_queen(self):
+        fen = "rnb1kbnr/pppp1ppp/8/4p1q1/4P3/3P4/PPP2PPP/RNBQKBNR w KQkq - 1 3"
+        self.assertEqual(self.best(fen, depth=1), "c1g5")
+
+    def test_mate_score_and_pv(self):
+        board = chess.Board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+        result = search(board, depth=3, tt=TranspositionTable(size_mb=1))
+        self.assertGreaterEqual(result.score, MATE_BOUND)
+        self.assertEqual(result.pv, [chess.Move.from_uci("a1a8")])
+
+    def test_pv_is_legal_line(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        board = chess.Board(fen)
+        result = search(board, depth=2, tt=TranspositionTable(size_mb=1))
+        self.assertEqual(result.pv[0], result.best_move)
+        self.assertEqual(len(result.pv), 2)
+        for move in result.pv:
+            self.assertIn(move, board.legal_moves)
+            board.push(move)
+
+    def test_movetime_returns_legal_move(self):
+        fen = "r1bqk2r/pppp1ppp/2n2n2/2b1p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 2 4"
+        move = chess.Move.from_uci(self.best(fen, movetime=0.05))
+        self.assertIn(move, chess.Board(fen).legal_moves)
+
+    def test_pruning_toggles(self):
+        fen = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+        nodes = {}
+        for pruning in [(), ("null_move",), ("lmr",), ("futility",), PRUNING]:
+            result = search(
+                chess.Board(fen),
+                depth=4,
+                tt=TranspositionTable(size_mb=1),
+                pruning=pruning,
+            )
+            self.assertIn(result.best_move, chess.Board(fen).legal_moves)
+            nodes[pruning] = result.nodes
+        self.assertLess(nodes[PRUNING], nodes[()])
+        # Cắt tỉa không được làm mất chiếu hết
+        fen = "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"
+        self.assertEqual(self.best(fen, depth=4), "a1a8")
+
+    def test_ordering_reduces_nodes(self):
+        fen = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+        nodes = {}
+        for use_ordering in (True, False):
+            result = search(
+                chess.Board(fen),
+                depth=3,
+                tt=TranspositionTable(size_mb=1),
+                use_ordering=use_ordering,
+            )
+            nodes[use_ordering] = result.nodes
+        self.assertLess(nodes[True], nodes[False])
+
+    def test_draw_detection(self):
+        board = chess.Board()
+        for uci in ["g1f3", "g8f6", "f3g1", "f6g8", "g1f3", "g8f6", "f3g1"]:
+            board.push_uci(uci)
+        state = SearchState(TranspositionTable(size_mb=1))
+        state.reset(board)
+        self.assertFalse(state.is_draw(board))
+        state.push(board, chess.Move.from_uci("f6g8"))  # thế cờ ban đầu lần thứ 3
+        self.assertTrue(state.is_draw(board))
+        state.pop(board)
+        # Trong cây tìm kiếm: lặp lại 1 lần là đủ; qua null move thì không tính
+        board = chess.Board()
+        state.reset(board)
+        for uci in ["g1f3", "g8f6", "f3g1", "f6g8"]:
+            state.push(board, chess.Move.from_uci(uci))
+        self.assertTrue(state.is_draw(board))
+        board = chess.Board()
+        state.reset(board)
+        for move in ["g1f3", None, "f3g1", None]:
+            state.push(board, chess.Move.from_uci(move) if move else chess.Move.null())
+        self.assertEqual(state.keys[-1], state.keys[0])
+        self.assertFalse(state.is_draw(board))
+        # Luật 50 nước: mọi nước của xe đều chạm mốc 100 nửa nước
+        result = search(
+            chess.Board("8/8/8/4k3/8/8/8/R3K3 w - - 99 80"),
+            depth=2,
+            tt=TranspositionTable(size_mb=1),
+        )
+        self.assertEqual(result.score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
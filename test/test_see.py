@@ -0,0 +1,35 @@
+import unittest
+
+import chess
+
+from engine.bench import BENCH_FENS
+from engine.see import SEE_VALUES, see, see_ge
+
+
+class TestSEE(unittest.TestCase):
+    def test_exchanges(self):
+        # Xe ăn tốt không được bảo vệ
+        board = chess.Board("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1")
+        self.assertEqual(see(board, chess.Move.from_uci("e1e5")), SEE_VALUES[chess.PAWN])
+        # Mã ăn tốt, chuỗi ăn xuyên (x-ray) sau cùng làm mất mã
+        board = chess.Board("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1")
+        move = chess.Move.from_uci("d3e5")
+        self.assertEqual(see(board, move), SEE_VALUES[chess.PAWN] - SEE_VALUES[chess.KNIGHT])
+        self.assertFalse(see_ge(board, move))
+        # Vua không được ăn vào ô còn bị tấn công
+        board = chess.Board("4k3/8/8/8/8/5r2/4q3/4K3 w - - 0 1")
+        self.assertEqual(see(board, chess.Move.from_uci("e1e2")), SEE_VALUES[chess.QUEEN])
+        board = chess.Board("4k3/4r3/8/8/8/8/4q3/4K3 w - - 0 1")
+        self.assertNotIn(chess.Move.from_uci("e1e2"), board.legal_moves)
+
+    def test_see_ge_matches_see(self):
+        for fen in BENCH_FENS:
+            board = chess.Board(fen)
+            for move in board.legal_moves:
+                value = see(board, move)
+                for threshold in (-500, -1, 0, 1, 100, 500):
+                    self.assertEqual(see_ge(board, move, threshold), value >= threshold)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+import chess
+
+from engine.evaluation import threat
+from engine.evaluation.context import EvalContext
+
+
+class TestThreat(unittest.TestCase):
+    def test_knight_attacks_hanging_queen(self):
+        board = chess.Board("4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1")
+        ctx = EvalContext(board)
+        queen = chess.BB_SQUARES[chess.D5]
+        self.assertTrue(threat.weak_enemies(ctx, chess.WHITE) & queen)
+        self.assertTrue(threat.hanging(ctx, chess.WHITE) & queen)
+        mg, eg = threat.eval_threats_pair(board, ctx)
+        self.assertGreater(mg, 0)
+        self.assertGreater(eg, 0)
+
+    def test_mirror(self):
+        # Thế cờ đối xứng → 0; lật màu → đổi dấu
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 4 4")
+        self.assertEqual(threat.eval_threats_pair(board), (0, 0))
+        board = chess.Board("4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1")
+        mg, eg = threat.eval_threats_pair(board)
+        self.assertEqual(threat.eval_threats_pair(board.mirror()), (-mg, -eg))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import chess
+
+from engine.transposition import (
+    EXACT,
+    LOWER,
+    TranspositionTable,
+    decode_move,
+    encode_move,
+    position_key,
+)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_size_from_budget(self):
+        tt = TranspositionTable(size_mb=1)
+        self.assertEqual(tt.num_entries, 65536)
+        self.assertEqual(len(tt.data), 1024 * 1024)
+
+    def test_store_and_probe(self):
+        tt = TranspositionTable(size_mb=1)
+        key = position_key(chess.Board())
+        move = chess.Move.from_uci("e2e4")
+        self.assertIsNone(tt.probe(key))
+        tt.store(key, 3, -42, LOWER, move)
+        self.assertEqual(tt.probe(key), (3, -42, LOWER, move))
+        self.assertEqual((tt.hits, tt.misses), (1, 1))
+
+    def test_depth_preferred_replacement(self):
+        tt = TranspositionTable(size_mb=1)
+        key = 12345
+        other = key + tt.num_entries  # cùng ô, khác thế cờ
+        tt.store(key, 5, 10, EXACT)
+        tt.store(other, 2, 20, EXACT)
+        self.assertEqual(tt.probe(key)[0], 5)
+        self.assertIsNone(tt.probe(other))
+        self.assertEqual(tt.collisions, 1)
+
+        # Entry của lượt tìm kiếm cũ luôn có thể bị thay
+        tt.new_search()
+        tt.store(other, 2, 20, EXACT)
+        self.assertEqual(tt.probe(other)[1], 20)
+
+    def test_move_encoding(self):
+        for uci in ("e2e4", "a7a8q", "h2h1n"):
+            move = chess.Move.from_uci(uci)
+            self.assertEqual(decode_move(encode_move(move)), move)
+        self.assertIsNone(decode_move(encode_move(None)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import io
+import threading
+import unittest
+
+import chess
+
+from engine.minimax import MATE_SCORE, MAX_DEPTH
+from engine.uci import UCIEngine, format_score
+
+
+class TestUCI(unittest.TestCase):
+    def run_engine(self, commands):
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        for command in commands:
+            engine.handle(command)
+        # Đợi "go" tự kết thúc; "quit" ngay sau "go" sẽ dừng tìm kiếm
+        engine.wait()
+        engine.run(io.StringIO("quit\n"))
+        return out.getvalue().splitlines()
+
+    def test_handshake(self):
+        lines = self.run_engine(["uci", "setoption name Hash value 2", "isready"])
+        self.assertEqual(lines[0], "id name chess_ai")
+        self.assertIn("option name Threads type spin default 1 min 1 max 64", lines)
+        self.assertEqual(lines[-2:], ["uciok", "readyok"])
+
+    def test_go_depth_mate(self):
+        lines = self.run_engine(
+            ["position fen 6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", "go depth 3"]
+        )
+        self.assertTrue(lines[0].startswith("info depth 1 score mate 1 nodes "))
+        self.assertTrue(lines[0].endswith(" pv a1a8"))
+        self.assertEqual(lines[-1], "bestmove a1a8")
+
+    def test_position_moves(self):
+        engine = UCIEngine(io.StringIO())
+        engine.handle("position startpos moves e2e4 e7e5 g1f3")
+        self.assertEqual(
+            engine.board.fen(),
+            "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2",
+        )
+
+    def test_stop_infinite(self):
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        engine.handle("position startpos")
+        engine.handle("go infinite")
+        threading.Event().wait(0.3)
+        engine.handle("stop")
+        self.assertTrue(out.getvalue().splitlines()[-1].startswith("bestmove "))
+
+    def test_stop_infinite_threads(self):
+        # "stop" ngay sau "go" với Lazy SMP vẫn phải dừng và in bestmove
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        engine.handle("setoption name Threads value 2")
+        engine.handle("position startpos")
+        engine.handle("go infinite")
+        engine.handle("stop")
+        engine.run(io.StringIO("quit\n"))
+        self.assertTrue(out.getvalue().splitlines()[-1].startswith("bestmove "))
+
+    def test_infinite_holds_bestmove(self):
+        # Thấy chiếu hết vẫn không được in bestmove trước "stop"
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        engine.handle("position fen 6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+        engine.handle("go infinite")
+        while "score mate 1" not in out.getvalue():
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.1)
+        self.assertNotIn("bestmove", out.getvalue())
+        engine.handle("stop")
+        self.assertEqual(out.getvalue().splitlines()[-1], "bestmove a1a8")
+
+    def test_infinite_with_depth(self):
+        # depth vẫn giới hạn "go infinite", nhưng bestmove chờ "stop"
+        engine = UCIEngine(io.StringIO())
+        self.assertEqual(engine.parse_go(["infinite", "depth", "5"]), {"depth": 5})
+        self.assertEqual(
+            engine.parse_go(["infinite", "movetime", "100"]), {"depth": MAX_DEPTH}
+        )
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        engine.handle("position startpos")
+        engine.handle("go infinite depth 1")
+        while "info depth 1 " not in out.getvalue():
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.2)
+        self.assertNotIn("bestmove", out.getvalue())
+        engine.handle("stop")
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[-1].startswith("bestmove "))
+
+    def test_bad_go_value(self):
+        lines = self.run_engine(["go depth x", "isready"])
+        self.assertEqual(lines[0], "info string invalid go depth: x")
+        self.assertIn("readyok", lines)
+
+    def test_illegal_position_move(self):
+        out = io.StringIO()
+        engine = UCIEngine(out)
+        engine.handle("position startpos moves e2e4")
+        self.assertTrue(engine.handle("position startpos moves e2e4 e2e4"))
+        self.assertTrue(out.getvalue().startswith("info string invalid position"))
+        self.assertEqual(engine.board.move_stack, [chess.Move.from_uci("e2e4")])
+
+    def test_format_score(self):
+        self.assertEqual(format_score(35), "cp 35")
+        self.assertEqual(format_score(MATE_SCORE - 3), "mate 2")
+        self.assertEqual(format_score(-(MATE_SCORE - 2)), "mate -1")
+
+
+if __name__ == "__main__":
+    unittest.main()
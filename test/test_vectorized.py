@@ -0,0 +1,48 @@
+import unittest
+
+import chess
+
+from engine.bench import BENCH_FENS
+from engine.evaluation import vectorized
+from engine.evaluation.imbalance import eval_imbalance
+from engine.evaluation.material import eval_material
+from engine.evaluation.psqt import eval_psqt
+from engine.evaluation_engine import find_phase
+
+
+@unittest.skipIf(vectorized.np is None, "numpy chưa được cài")
+class TestVectorized(unittest.TestCase):
+    def test_matches_scalar_terms(self):
+        boards = [chess.Board(fen) for fen in BENCH_FENS]
+        boards.append(chess.Board().mirror())
+        phases, terms = vectorized.evaluate_terms(boards)
+        for index, board in enumerate(boards):
+            self.assertEqual(phases[index], find_phase(board))
+            self.assertEqual(
+                (terms["material"][0][index], terms["material"][1][index]),
+                (eval_material(board, "mg"), eval_material(board, "eg")),
+            )
+            self.assertEqual(
+                (terms["psqt"][0][index], terms["psqt"][1][index]),
+                (eval_psqt(board, "mg"), eval_psqt(board, "eg")),
+            )
+            self.assertEqual(terms["imbalance"][0][index], eval_imbalance(board))
+
+    def test_encoding(self):
+        planes = vectorized.encode_planes([chess.Board()])
+        self.assertEqual(planes.shape, (1, 12, 64))
+        pieces = vectorized.encode_boards([chess.Board()])
+        self.assertEqual(pieces[0, chess.E1], chess.KING)
+        self.assertEqual(pieces[0, chess.D8], chess.QUEEN + 6)
+        self.assertEqual(pieces[0, chess.E4], 0)
+
+    def test_blend_floors_like_python(self):
+        mg = vectorized.np.array([-7, 7])
+        eg = vectorized.np.array([-300, 5])
+        phase = vectorized.np.array([50, 50])
+        expected = [(m * 50 + e * 78) // 128 for m, e in ((-7, -300), (7, 5))]
+        self.assertEqual(list(vectorized.blend(mg, eg, phase)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()